@@ -23,7 +23,7 @@ INSTALLED_APPS = [
     'django.contrib.contenttypes',
     'django.contrib.sessions',
     'django.contrib.messages',
-    'django.contrib.staticfiles',
+    'portfolio.apps.PortfolioStaticFilesConfig',
     'crispy_forms',
     'crispy_bootstrap5',
     'django_extensions',
@@ -32,12 +32,18 @@ INSTALLED_APPS = [
 
 MIDDLEWARE = [
     'django.middleware.security.SecurityMiddleware',
-    'django.contrib.sessions.middleware.SessionMiddleware',
+    'portfolio.middleware.HtmlCompressionMiddleware',
+    'portfolio.middleware.StaticAssetsMiddleware',
+    'portfolio.middleware.NotFoundFastPathMiddleware',
+    'portfolio.middleware.LoadSheddingMiddleware',
+    'portfolio.middleware.PreloadHintsMiddleware',
+    'portfolio.middleware.AnonymousSessionMiddleware',
     'django.middleware.common.CommonMiddleware',
-    'django.middleware.csrf.CsrfViewMiddleware',
+    'portfolio.middleware.ScopedCsrfViewMiddleware',
     'django.contrib.auth.middleware.AuthenticationMiddleware',
     'django.contrib.messages.middleware.MessageMiddleware',
     'django.middleware.clickjacking.XFrameOptionsMiddleware',
+    'portfolio.middleware.DegradedModeMiddleware',
 ]
 
 ROOT_URLCONF = 'ctrin.urls'
@@ -68,6 +74,80 @@ DATABASES = {
     }
 }
 
+# Cache. The process-local default only suits a single development server:
+# invalidations and warmed pages must reach every gunicorn worker and cron
+# command, so production requires a shared backend (see settings_production)
+CACHES = {
+    'default': {
+        'BACKEND': config('CACHE_BACKEND', default='django.core.cache.backends.locmem.LocMemCache'),
+        'LOCATION': config('CACHE_LOCATION', default='ctrin'),
+    }
+}
+
+# Public page cache
+PAGE_CACHE_TIMEOUT = config('PAGE_CACHE_TIMEOUT', default=600, cast=int)
+CACHE_WARM_ON_SAVE = config('CACHE_WARM_ON_SAVE', default=True, cast=bool)
+API_CACHE_TIMEOUT = config('API_CACHE_TIMEOUT', default=300, cast=int)
+# Browser/shared-cache lifetime of anonymous public pages; kept short because
+# only the server-side page cache is invalidated when content changes
+PUBLIC_PAGE_MAX_AGE = config('PUBLIC_PAGE_MAX_AGE', default=60, cast=int)
+# HTML responses are minified and compressed (gzip, plus brotli/zstd when
+# installed); cached pages keep their encoded bodies. Turn HTML_COMPRESS
+# off when a front proxy compresses responses itself
+HTML_MINIFY = config('HTML_MINIFY', default=True, cast=bool)
+HTML_COMPRESS = config('HTML_COMPRESS', default=True, cast=bool)
+
+# Service worker: core pages precached on install, detail pages served
+# stale-while-revalidate; both runtime caches are capped, least recently
+# used entries evicted first
+SERVICE_WORKER_ROUTES = ('portfolio:home', 'portfolio:projects', 'portfolio:services', 'portfolio:team', 'portfolio:blog')
+SERVICE_WORKER_PAGE_ROUTES = ('portfolio:project_detail', 'portfolio:blog_detail')
+SERVICE_WORKER_PAGE_LIMIT = config('SERVICE_WORKER_PAGE_LIMIT', default=30, cast=int)
+SERVICE_WORKER_IMAGE_LIMIT = config('SERVICE_WORKER_IMAGE_LIMIT', default=60, cast=int)
+WEB_MANIFEST_THEME_COLOR = config('WEB_MANIFEST_THEME_COLOR', default='#212529')
+WEB_MANIFEST_BACKGROUND_COLOR = config('WEB_MANIFEST_BACKGROUND_COLOR', default='#ffffff')
+
+# Degraded mode: serve the last good copy of a page when queries fail or
+# take longer than QUERY_TIME_BUDGET seconds (0 disables the budget)
+STALE_PAGE_TIMEOUT = config('STALE_PAGE_TIMEOUT', default=60 * 60 * 24 * 7, cast=int)
+QUERY_TIME_BUDGET = config('QUERY_TIME_BUDGET', default=2.0, cast=float)
+REVALIDATE_INTERVAL = config('REVALIDATE_INTERVAL', default=5, cast=int)
+
+# Load shedding: adaptive per-route-class concurrency limits per worker
+# (effective with threaded workers, GUNICORN_THREADS > 1). Requests that
+# queued in the proxy longer than LOADSHED_QUEUE_THRESHOLD seconds, per its
+# X-Request-Start header, or waited LOADSHED_QUEUE_TIMEOUT for a slot get a 503
+LOADSHED_ENABLED = config('LOADSHED_ENABLED', default=True, cast=bool)
+LOADSHED_INITIAL_LIMIT = config('LOADSHED_INITIAL_LIMIT', default=4, cast=int)
+LOADSHED_MAX_LIMIT = config('LOADSHED_MAX_LIMIT', default=32, cast=int)
+LOADSHED_TARGET_LATENCY = config('LOADSHED_TARGET_LATENCY', default=0.5, cast=float)
+LOADSHED_QUEUE_TIMEOUT = config('LOADSHED_QUEUE_TIMEOUT', default=1.0, cast=float)
+LOADSHED_QUEUE_THRESHOLD = config('LOADSHED_QUEUE_THRESHOLD', default=2.0, cast=float)
+LOADSHED_RETRY_AFTER = config('LOADSHED_RETRY_AFTER', default=5, cast=int)
+
+# View counters are buffered per worker and flushed to DailyViewStat in batches
+ANALYTICS_FLUSH_INTERVAL = config('ANALYTICS_FLUSH_INTERVAL', default=30, cast=int)
+POPULARITY_HALF_LIFE_DAYS = config('POPULARITY_HALF_LIFE_DAYS', default=7, cast=int)
+POPULARITY_WINDOW_DAYS = config('POPULARITY_WINDOW_DAYS', default=90, cast=int)
+# 404 stats: each worker buffers at most NOT_FOUND_MAX_PATHS distinct paths
+# per flush, and paths unseen for NOT_FOUND_RETENTION_DAYS are pruned
+NOT_FOUND_MAX_PATHS = config('NOT_FOUND_MAX_PATHS', default=500, cast=int)
+NOT_FOUND_RETENTION_DAYS = config('NOT_FOUND_RETENTION_DAYS', default=30, cast=int)
+
+# Number of precomputed related items shown on detail pages
+RELATED_ITEMS_COUNT = config('RELATED_ITEMS_COUNT', default=3, cast=int)
+
+# Contact form throttling (sliding windows shared through the cache)
+CONTACT_RATE_LIMIT_PER_IP = config('CONTACT_RATE_LIMIT_PER_IP', default=5, cast=int)
+CONTACT_RATE_LIMIT_PER_EMAIL = config('CONTACT_RATE_LIMIT_PER_EMAIL', default=3, cast=int)
+CONTACT_RATE_LIMIT_WINDOW = config('CONTACT_RATE_LIMIT_WINDOW', default=3600, cast=int)
+CONTACT_DUPLICATE_WINDOW = config('CONTACT_DUPLICATE_WINDOW', default=86400, cast=int)
+# META key holding the client address when behind a proxy, e.g. HTTP_X_FORWARDED_FOR
+RATELIMIT_IP_HEADER = config('RATELIMIT_IP_HEADER', default='')
+
+# Messages travel in a signed cookie, so anonymous requests never need a session
+MESSAGE_STORAGE = 'django.contrib.messages.storage.cookie.CookieStorage'
+
 # Password validation
 AUTH_PASSWORD_VALIDATORS = [
     {
@@ -94,11 +174,41 @@ USE_TZ = True
 STATIC_URL = '/static/'
 STATIC_ROOT = BASE_DIR / 'staticfiles'
 STATICFILES_DIRS = [BASE_DIR / 'portfolio' / 'static']
+# collectstatic minifies CSS/JS, writes content-hashed names and .gz/.br siblings
+STORAGES = {
+    'default': {
+        'BACKEND': 'portfolio.storage.ContentAddressedStorage',
+    },
+    'staticfiles': {
+        'BACKEND': 'portfolio.storage.OptimizedManifestStaticFilesStorage',
+    },
+}
+
+# Critical CSS (build with `manage.py build_critical_css`)
+CRITICAL_CSS_DIR = BASE_DIR / 'critical_css'
+CRITICAL_CSS_FOLD_ELEMENTS = 120
+CRITICAL_CSS_STYLESHEETS = [
+    'https://cdn.jsdelivr.net/npm/bootstrap@5.3.0/dist/css/bootstrap.min.css',
+    'https://cdnjs.cloudflare.com/ajax/libs/font-awesome/6.4.0/css/all.min.css',
+    'css/style.css',
+]
+STATIC_COMPRESS_WORKERS = config('STATIC_COMPRESS_WORKERS', default=0, cast=int)  # 0 = one per CPU
 
 # Media files (User uploads)
 MEDIA_URL = '/media/'
 MEDIA_ROOT = BASE_DIR / 'media'
 
+# Gallery ZIP downloads; the most popular projects get a prebuilt archive
+# (`manage.py build_project_archives`), the rest are streamed on the fly
+PROJECT_ARCHIVE_DIR = BASE_DIR / 'archives'
+PROJECT_ARCHIVE_COUNT = config('PROJECT_ARCHIVE_COUNT', default=10, cast=int)
+
+# Resumable admin uploads of gallery images, assembled here chunk by chunk
+CHUNKED_UPLOAD_DIR = BASE_DIR / 'uploads'
+CHUNKED_UPLOAD_CHUNK_SIZE = config('CHUNKED_UPLOAD_CHUNK_SIZE', default=4 * 1024 * 1024, cast=int)
+CHUNKED_UPLOAD_MAX_SIZE = config('CHUNKED_UPLOAD_MAX_SIZE', default=50 * 1024 * 1024, cast=int)
+CHUNKED_UPLOAD_EXPIRY = config('CHUNKED_UPLOAD_EXPIRY', default=60 * 60 * 24, cast=int)
+
 # Default primary key field type
 DEFAULT_AUTO_FIELD = 'django.db.models.BigAutoField'
 
@@ -0,0 +1,44 @@
+"""
+Production profile for Ctrin_interiors: ``DJANGO_SETTINGS_MODULE=ctrin.settings_production``
+
+Every gunicorn worker, and every management command run from cron
+(``publish_scheduled``, ``update_popularity``, ...), is a separate process.
+Page cache invalidation, warming and the API and slug generations only
+reach other processes through a shared cache, so a process-local backend
+is refused here. The default is the database cache; create its table once
+per database with ``python manage.py createcachetable``, or point
+CACHE_BACKEND/CACHE_LOCATION at Redis or Memcached.
+"""
+
+import os
+
+# Read before the base settings so the DEBUG-dependent security block applies
+os.environ.setdefault('DEBUG', 'False')
+
+from django.core.exceptions import ImproperlyConfigured  # noqa: E402
+
+from .settings import *  # noqa: E402,F401,F403
+
+# Installed for development only; the public templates and the admin never use them
+DEV_ONLY_APPS = ['crispy_forms', 'crispy_bootstrap5', 'django_extensions']
+INSTALLED_APPS = [app for app in INSTALLED_APPS if app not in DEV_ONLY_APPS]
+
+TEMPLATES[0]['OPTIONS']['context_processors'] = [
+    processor for processor in TEMPLATES[0]['OPTIONS']['context_processors']
+    if processor != 'django.template.context_processors.debug'
+]
+
+# Keep database connections open between requests in long-lived workers
+CONN_MAX_AGE = config('CONN_MAX_AGE', default=60, cast=int)
+CONN_HEALTH_CHECKS = True
+
+CACHES['default'].update(
+    BACKEND=config('CACHE_BACKEND', default='django.core.cache.backends.db.DatabaseCache'),
+    LOCATION=config('CACHE_LOCATION', default='ctrin_cache'),
+)
+PROCESS_LOCAL_CACHES = ('django.core.cache.backends.locmem.LocMemCache',)
+if CACHES['default']['BACKEND'] in PROCESS_LOCAL_CACHES:
+    raise ImproperlyConfigured(
+        'CACHE_BACKEND must be shared between processes in production '
+        '(database, Redis or Memcached): invalidations would not reach other workers'
+    )
@@ -16,5 +16,6 @@ if settings.DEBUG:
     urlpatterns += static(settings.MEDIA_URL, document_root=settings.MEDIA_ROOT)
     urlpatterns += static(settings.STATIC_URL, document_root=settings.STATIC_ROOT)
 
-# 404 Handler
+# Error handlers
 handler404 = 'portfolio.views.page_not_found'
+handler500 = 'portfolio.views.server_error'
@@ -0,0 +1,36 @@
+"""
+gunicorn configuration: ``gunicorn -c gunicorn.conf.py``
+
+The application is loaded and warmed once in the master, so each forked
+worker starts with settings, apps, URL resolvers and compiled templates
+already in memory and can answer its first request straight away.
+"""
+
+import multiprocessing
+import os
+
+os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'ctrin.settings_production')
+
+wsgi_app = 'ctrin.wsgi:application'
+bind = os.environ.get('GUNICORN_BIND', f"0.0.0.0:{os.environ.get('PORT', '8000')}")
+workers = int(os.environ.get('WEB_CONCURRENCY', multiprocessing.cpu_count() * 2 + 1))
+# More than one thread switches to the gthread worker, where the load
+# shedding middleware's per-route limits keep slow routes from taking them all
+threads = int(os.environ.get('GUNICORN_THREADS', 1))
+timeout = int(os.environ.get('GUNICORN_TIMEOUT', 30))
+max_requests = int(os.environ.get('GUNICORN_MAX_REQUESTS', 1000))
+max_requests_jitter = max_requests // 10
+preload_app = True
+
+
+def when_ready(server):
+    from portfolio.startup import warm_process
+
+    server.log.info("Warmed %d templates before forking workers", warm_process())
+
+
+def post_fork(server, worker):
+    # Never share a database socket inherited from the master
+    from django.db import connections
+
+    connections.close_all()
@@ -0,0 +1,115 @@
+/**
+ * Ctrin Interiors service worker (generated by portfolio.views.ServiceWorkerView)
+ *
+ * - precaches this deployment's static assets and the core pages
+ * - serves project and blog pages stale-while-revalidate, keeping the
+ *   most recently viewed ones
+ * - keeps a capped, least-recently-used cache of images
+ */
+const CONFIG = {{ config|safe }};
+const PRECACHE = `precache-${CONFIG.version}`;
+// Pages reference this deployment's asset names, so they are dropped with it
+const PAGES = `pages-${CONFIG.version}`;
+const IMAGES = 'images-v1';
+const PAGE_PATTERNS = CONFIG.pagePatterns.map(source => new RegExp(source));
+
+self.addEventListener('install', event => {
+    event.waitUntil((async () => {
+        const cache = await caches.open(PRECACHE);
+        await cache.addAll(CONFIG.precache);
+        // Core pages are fetched without cookies so the cached copy is the public one
+        await Promise.all(CONFIG.routes.map(async url => {
+            const response = await fetch(new Request(url, {credentials: 'omit'}));
+            if (isShareable(response)) {
+                await (await caches.open(PAGES)).put(url, response);
+            }
+        }));
+        await self.skipWaiting();
+    })());
+});
+
+self.addEventListener('activate', event => {
+    event.waitUntil((async () => {
+        const keep = [PRECACHE, PAGES, IMAGES];
+        for (const name of await caches.keys()) {
+            if (!keep.includes(name)) {
+                await caches.delete(name);
+            }
+        }
+        await self.clients.claim();
+    })());
+});
+
+// Only pages the server marked public are kept: never personal or form pages
+function isShareable(response) {
+    return response.ok && /\bpublic\b/.test(response.headers.get('Cache-Control') || '');
+}
+
+async function trim(cacheName, limit) {
+    const cache = await caches.open(cacheName);
+    const keys = await cache.keys();
+    // Keys come back in insertion order; reads re-insert, so the oldest are least recently used
+    for (const request of keys.slice(0, Math.max(0, keys.length - limit))) {
+        await cache.delete(request);
+    }
+}
+
+async function touch(cacheName, request, response) {
+    const cache = await caches.open(cacheName);
+    await cache.delete(request);
+    await cache.put(request, response);
+}
+
+async function staleWhileRevalidate(event, request) {
+    const cache = await caches.open(PAGES);
+    const cached = await cache.match(request, {ignoreVary: true});
+    const network = fetch(request).then(async response => {
+        if (isShareable(response)) {
+            await touch(PAGES, request, response.clone());
+            await trim(PAGES, CONFIG.pageLimit);
+        }
+        return response;
+    });
+    if (cached) {
+        event.waitUntil(network.catch(() => null));
+        event.waitUntil(touch(PAGES, request, cached.clone()));
+        return cached;
+    }
+    try {
+        return await network;
+    } catch (error) {
+        return (await cache.match(CONFIG.routes[0])) || Response.error();
+    }
+}
+
+async function cachedImage(event, request) {
+    const cached = await caches.match(request, {cacheName: IMAGES});
+    if (cached) {
+        event.waitUntil(touch(IMAGES, request, cached.clone()));
+        return cached;
+    }
+    const response = await fetch(request);
+    if (response.ok) {
+        event.waitUntil(touch(IMAGES, request, response.clone()).then(() => trim(IMAGES, CONFIG.imageLimit)));
+    }
+    return response;
+}
+
+self.addEventListener('fetch', event => {
+    const request = event.request;
+    if (request.method !== 'GET') {
+        return;
+    }
+    const url = new URL(request.url);
+    const sameOrigin = url.origin === self.location.origin;
+
+    if (CONFIG.precache.includes(sameOrigin ? url.pathname : url.href)) {
+        event.respondWith(caches.match(request, {cacheName: PRECACHE}).then(cached => cached || fetch(request)));
+    } else if (sameOrigin && request.mode === 'navigate' && !url.search &&
+               (CONFIG.routes.includes(url.pathname) || PAGE_PATTERNS.some(pattern => pattern.test(url.pathname)))) {
+        event.respondWith(staleWhileRevalidate(event, request));
+    } else if (request.destination === 'image' && (!sameOrigin || url.pathname.startsWith(CONFIG.mediaUrl) ||
+               url.pathname.startsWith(CONFIG.staticUrl))) {
+        event.respondWith(cachedImage(event, request));
+    }
+});
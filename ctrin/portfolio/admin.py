@@ -1,30 +1,86 @@
+import json
+
+from django.conf import settings
 from django.contrib import admin
+from django.contrib.admin.utils import unquote
+from django.core.exceptions import PermissionDenied, ValidationError
+from django.http import HttpResponse, HttpResponseNotAllowed, JsonResponse
+from django.urls import path, reverse
 from django.utils.html import format_html
 from .models import (
     Category, Project, ProjectImage, Service, TeamMember,
-    Testimonial, BlogPost, ContactMessage, SiteSettings
+    Testimonial, BlogPost, ContactMessage, SiteSettings, DailyViewStat,
+    MediaBlob, NotFoundStat
 )
+from .ordering import ORDER_GAP, apply_ordering, move_item, next_order
+from .signals import refresh_cached_pages
+from .uploads import ChunkedUpload, UploadError
+
+
+def reorder(request, queryset):
+    """Apply a POSTed reordering of ``queryset`` and refresh the pages showing it
+
+    The JSON body is either ``{"order": [pk, ...]}`` with the full new
+    ordering, or ``{"move": pk, "after": pk}`` / ``{"move": pk, "before": pk}``
+    to move one item. The changed ``{pk: order}`` values are returned.
+    """
+    if request.method != 'POST':
+        return HttpResponseNotAllowed(['POST'])
+    try:
+        payload = json.loads(request.body)
+        if 'order' in payload:
+            changed = apply_ordering(queryset, payload['order'])
+        else:
+            changed = move_item(queryset, payload['move'], payload.get('after'), payload.get('before'))
+    except (ValueError, TypeError, KeyError, AttributeError, ValidationError):
+        return JsonResponse({'error': 'Invalid ordering'}, status=400)
+
+    # bulk_update sends no save signals; one refresh covers the whole list
+    if changed:
+        refresh_cached_pages(queryset.model, queryset.get(pk=next(iter(changed))))
+    return JsonResponse({'changed': {str(pk): order for pk, order in changed.items()}})
+
+
+class OrderableAdminMixin:
+    """Drag-and-drop reordering of the changelist through a ``reorder/`` endpoint"""
+
+    class Media:
+        js = ('js/admin/reorder.js',)
+
+    def get_urls(self):
+        info = self.model._meta.app_label, self.model._meta.model_name
+        urls = [
+            path('reorder/', self.admin_site.admin_view(self.reorder_view), name='%s_%s_reorder' % info),
+        ]
+        return urls + super().get_urls()
+
+    def reorder_view(self, request):
+        if not self.has_change_permission(request):
+            raise PermissionDenied
+        return reorder(request, self.model.objects.all())
+
+    def get_changeform_initial_data(self, request):
+        # New items go to the end of the list
+        return dict(super().get_changeform_initial_data(request), order=next_order(self.model.objects.all()))
+
 
 @admin.register(Category)
 class CategoryAdmin(admin.ModelAdmin):
-    list_display = ('name', 'project_count')
+    list_display = ('name', 'project_count', 'featured_count')
     prepopulated_fields = {'slug': ('name',)}
-    
-    def project_count(self, obj):
-        return obj.projects.count()
-    project_count.short_description = 'Projects'
 
 
 class ProjectImageInline(admin.TabularInline):
     model = ProjectImage
     extra = 1
     fields = ('image', 'caption', 'order')
+    readonly_fields = ('order',)
 
 
 @admin.register(Project)
 class ProjectAdmin(admin.ModelAdmin):
-    list_display = ('title', 'category', 'project_date', 'is_featured', 'image_preview')
-    list_filter = ('category', 'is_featured', 'project_date')
+    list_display = ('title', 'category', 'project_date', 'is_featured', 'is_published', 'publish_at', 'popularity', 'image_preview')
+    list_filter = ('category', 'is_featured', 'is_published', 'project_date')
     search_fields = ('title', 'description', 'client_name')
     prepopulated_fields = {'slug': ('title',)}
     inlines = [ProjectImageInline]
@@ -41,6 +97,9 @@ class ProjectAdmin(admin.ModelAdmin):
         ('Settings', {
             'fields': ('is_featured',)
         }),
+        ('Publishing', {
+            'fields': ('is_published', 'publish_at', 'unpublish_at')
+        }),
     )
     
     def image_preview(self, obj):
@@ -49,11 +108,100 @@ class ProjectAdmin(admin.ModelAdmin):
         return "No Image"
     image_preview.short_description = 'Preview'
 
+    class Media:
+        js = ('js/admin/chunked_upload.js', 'js/admin/reorder.js')
+
+    def get_urls(self):
+        urls = [
+            path('<path:object_id>/uploads/', self.admin_site.admin_view(self.start_upload_view),
+                 name='portfolio_project_upload_start'),
+            path('<path:object_id>/uploads/<uuid:upload_id>/', self.admin_site.admin_view(self.upload_view),
+                 name='portfolio_project_upload'),
+            path('<path:object_id>/images/reorder/', self.admin_site.admin_view(self.reorder_images_view),
+                 name='portfolio_project_images_reorder'),
+        ]
+        return urls + super().get_urls()
+
+    def changeable_project(self, request, object_id):
+        project = self.get_object(request, unquote(object_id))
+        if project is None or not self.has_change_permission(request, project):
+            raise PermissionDenied
+        return project
+
+    def save_formset(self, request, form, formset, change):
+        # Gallery order is managed by drag and drop; new images go to the end
+        if formset.model is ProjectImage:
+            order = next_order(form.instance.images.all()) if form.instance.pk else ORDER_GAP
+            for image_form in formset.extra_forms:
+                if image_form.has_changed() and not image_form.cleaned_data.get('DELETE'):
+                    image_form.instance.order = order
+                    order += ORDER_GAP
+        super().save_formset(request, form, formset, change)
+
+    def reorder_images_view(self, request, object_id):
+        return reorder(request, self.changeable_project(request, object_id).images.all())
+
+    def upload_error(self, error):
+        payload = {'error': str(error)}
+        if error.offset is not None:
+            payload['offset'] = error.offset
+        response = JsonResponse(payload, status=error.status)
+        if error.offset is not None:
+            response['Upload-Offset'] = str(error.offset)
+        return response
+
+    def start_upload_view(self, request, object_id):
+        """Open a resumable upload session for one gallery image"""
+        if request.method != 'POST':
+            return HttpResponseNotAllowed(['POST'])
+        project = self.changeable_project(request, object_id)
+        try:
+            payload = json.loads(request.body)
+            upload = ChunkedUpload.create(project, request.user, str(payload.get('filename', '')), int(payload.get('size', 0)))
+        except (ValueError, TypeError, AttributeError):
+            return JsonResponse({'error': 'Expected a JSON body with filename and size'}, status=400)
+        except UploadError as e:
+            return self.upload_error(e)
+        return JsonResponse({
+            'url': reverse('admin:portfolio_project_upload', args=[object_id, upload.id]),
+            'offset': 0,
+            'chunk_size': settings.CHUNKED_UPLOAD_CHUNK_SIZE,
+        }, status=201)
+
+    def upload_view(self, request, object_id, upload_id):
+        """GET the resume offset, PATCH a chunk at ``Upload-Offset``, or DELETE the session
+
+        The request that completes the file gets the new ProjectImage back.
+        """
+        if request.method not in ('GET', 'HEAD', 'PATCH', 'DELETE'):
+            return HttpResponseNotAllowed(['GET', 'HEAD', 'PATCH', 'DELETE'])
+        project = self.changeable_project(request, object_id)
+        try:
+            upload = ChunkedUpload.load(str(upload_id), project, request.user)
+            if request.method == 'DELETE':
+                upload.discard()
+                return HttpResponse(status=204)
+            if request.method == 'PATCH' and not upload.is_complete:
+                try:
+                    offset = int(request.headers.get('Upload-Offset', ''))
+                    length = int(request.headers.get('Content-Length', ''))
+                except ValueError:
+                    raise UploadError('Upload-Offset and Content-Length are required', 400, upload.offset)
+                upload.write_chunk(offset, request, length)
+            if request.method == 'PATCH' and upload.is_complete:
+                image = upload.finish(project)
+                return JsonResponse({
+                    'offset': upload.meta['size'],
+                    'image': {'id': image.pk, 'url': image.image.url, 'order': image.order},
+                }, status=201)
+        except UploadError as e:
+            return self.upload_error(e)
+        return JsonResponse({'offset': upload.offset, 'size': upload.meta['size']})
+
 
 @admin.register(Service)
-class ServiceAdmin(admin.ModelAdmin):
+class ServiceAdmin(OrderableAdminMixin, admin.ModelAdmin):
     list_display = ('name', 'order', 'icon')
-    list_editable = ('order',)
     prepopulated_fields = {'slug': ('name',)}
     fieldsets = (
         ('Basic Information', {
@@ -69,11 +217,10 @@ class ServiceAdmin(admin.ModelAdmin):
 
 
 @admin.register(TeamMember)
-class TeamMemberAdmin(admin.ModelAdmin):
+class TeamMemberAdmin(OrderableAdminMixin, admin.ModelAdmin):
     list_display = ('name', 'position', 'experience_years', 'image_preview', 'order')
     list_filter = ('position', 'experience_years')
     search_fields = ('name', 'position')
-    list_editable = ('order',)
     fieldsets = (
         ('Basic Information', {
             'fields': ('name', 'position', 'experience_years', 'specialization')
@@ -104,11 +251,11 @@ class TeamMemberAdmin(admin.ModelAdmin):
 
 
 @admin.register(Testimonial)
-class TestimonialAdmin(admin.ModelAdmin):
+class TestimonialAdmin(OrderableAdminMixin, admin.ModelAdmin):
     list_display = ('client_name', 'client_company', 'rating_stars', 'is_featured', 'order')
     list_filter = ('rating', 'is_featured')
     search_fields = ('client_name', 'client_company', 'content')
-    list_editable = ('is_featured', 'order')
+    list_editable = ('is_featured',)
     fieldsets = (
         ('Client Information', {
             'fields': ('client_name', 'client_position', 'client_company', 'client_image')
@@ -128,8 +275,8 @@ class TestimonialAdmin(admin.ModelAdmin):
 
 @admin.register(BlogPost)
 class BlogPostAdmin(admin.ModelAdmin):
-    list_display = ('title', 'author', 'is_published', 'created_at')
-    list_filter = ('is_published', 'created_at')
+    list_display = ('title', 'author', 'is_published', 'publish_at', 'reading_time', 'popularity', 'created_at')
+    list_filter = ('is_published', 'markup', 'created_at')
     search_fields = ('title', 'content', 'tags')
     prepopulated_fields = {'slug': ('title',)}
     fieldsets = (
@@ -137,10 +284,13 @@ class BlogPostAdmin(admin.ModelAdmin):
             'fields': ('title', 'slug', 'author', 'featured_image')
         }),
         ('Content', {
-            'fields': ('excerpt', 'content')
+            'fields': ('excerpt', 'markup', 'content')
         }),
         ('Meta', {
-            'fields': ('tags', 'is_published')
+            'fields': ('tags',)
+        }),
+        ('Publishing', {
+            'fields': ('is_published', 'publish_at', 'unpublish_at')
         }),
     )
     
@@ -164,6 +314,38 @@ class ContactMessageAdmin(admin.ModelAdmin):
         return False
 
 
+@admin.register(DailyViewStat)
+class DailyViewStatAdmin(admin.ModelAdmin):
+    list_display = ('kind', 'object_id', 'date', 'views')
+    list_filter = ('kind', 'date')
+    date_hierarchy = 'date'
+    readonly_fields = ('kind', 'object_id', 'date', 'views')
+
+    def has_add_permission(self, request):
+        return False
+
+
+@admin.register(NotFoundStat)
+class NotFoundStatAdmin(admin.ModelAdmin):
+    list_display = ('path', 'hits', 'last_seen')
+    search_fields = ('path',)
+    readonly_fields = ('path', 'hits', 'last_seen')
+
+    def has_add_permission(self, request):
+        return False
+
+
+@admin.register(MediaBlob)
+class MediaBlobAdmin(admin.ModelAdmin):
+    list_display = ('name', 'size', 'ref_count', 'created_at')
+    list_filter = ('ref_count',)
+    search_fields = ('name',)
+    readonly_fields = ('name', 'size', 'ref_count', 'created_at')
+
+    def has_add_permission(self, request):
+        return False
+
+
 @admin.register(SiteSettings)
 class SiteSettingsAdmin(admin.ModelAdmin):
     fieldsets = (
@@ -0,0 +1,175 @@
+import atexit
+import logging
+import math
+import threading
+import time
+from collections import Counter, defaultdict
+from datetime import timedelta
+
+from django.conf import settings
+from django.db import DatabaseError, connection, transaction
+from django.utils import timezone
+
+from .models import Project, BlogPost, DailyViewStat, NotFoundStat
+
+logger = logging.getLogger(__name__)
+
+# Sent by the site's own fetches (cache warming, pre-rendering, checks and
+# benchmarks) so they are not counted as visits
+INTERNAL_USER_AGENT = 'ctrin-internal'
+
+# Rows per INSERT, well under SQLite's bound-parameter limit
+FLUSH_BATCH_SIZE = 200
+
+KIND_MODELS = {
+    'project': Project,
+    'blog': BlogPost,
+}
+
+
+class BufferedCounter:
+    """Thread-safe in-memory counter, handed to ``flush_func`` in one batch per interval
+
+    Each worker process keeps its own buffer, so a page hit costs a dict
+    update instead of a row write. Counts that fail to flush are kept for
+    the next attempt. With ``max_keys``, keys beyond that many distinct ones
+    are dropped until the next flush.
+    """
+
+    def __init__(self, flush_func, interval, max_keys=None):
+        self.flush_func = flush_func
+        self.interval = interval
+        self.max_keys = max_keys
+        self._counts = Counter()
+        self._lock = threading.Lock()
+        self._last_flush = time.monotonic()
+        atexit.register(self.flush)
+
+    def add(self, key, amount=1):
+        with self._lock:
+            if self.max_keys is None or key in self._counts or len(self._counts) < self.max_keys:
+                self._counts[key] += amount
+            due = time.monotonic() - self._last_flush >= self.interval
+        if due:
+            self.flush()
+
+    def flush(self):
+        with self._lock:
+            counts, self._counts = self._counts, Counter()
+            self._last_flush = time.monotonic()
+        if not counts:
+            return
+        try:
+            self.flush_func(counts)
+        except DatabaseError:
+            logger.exception("Could not flush %d buffered counters", len(counts))
+            with self._lock:
+                self._counts.update(counts)
+
+
+def batches(items, size=FLUSH_BATCH_SIZE):
+    items = list(items)
+    for start in range(0, len(items), size):
+        yield items[start:start + size]
+
+
+def flush_view_counts(counts):
+    """Add buffered ``(kind, slug, date) -> views`` deltas to the daily stats table"""
+    rows = []
+    for kind, model in KIND_MODELS.items():
+        slugs = {slug for k, slug, _ in counts if k == kind}
+        if not slugs:
+            continue
+        ids = dict(model.objects.filter(slug__in=slugs).values_list('slug', 'id'))
+        for (k, slug, date), views in counts.items():
+            if k == kind and slug in ids:
+                rows.append((kind, ids[slug], date, views))
+    if rows:
+        upsert_view_stats(rows)
+
+
+def upsert_view_stats(rows):
+    """Insert or increment ``(kind, object_id, date, views)`` rows, one statement per batch"""
+    table = connection.ops.quote_name(DailyViewStat._meta.db_table)
+    with transaction.atomic(), connection.cursor() as cursor:
+        for batch in batches(rows):
+            placeholders = ', '.join(['(%s, %s, %s, %s)'] * len(batch))
+            sql = (
+                f"INSERT INTO {table} (kind, object_id, date, views) VALUES {placeholders} "
+                f"ON CONFLICT (kind, object_id, date) DO UPDATE SET views = {table}.views + excluded.views"
+            )
+            cursor.execute(sql, [value for row in batch for value in row])
+
+
+view_counter = BufferedCounter(flush_view_counts, settings.ANALYTICS_FLUSH_INTERVAL)
+
+
+def is_internal_request(request):
+    return request.headers.get('User-Agent') == INTERNAL_USER_AGENT
+
+
+def record_view(kind, slug):
+    view_counter.add((kind, slug, timezone.localdate()))
+
+
+def flush_not_found_counts(counts):
+    """Add buffered ``path -> hits`` deltas to the 404 stats table and prune stale paths"""
+    table = connection.ops.quote_name(NotFoundStat._meta.db_table)
+    now = timezone.now()
+    with transaction.atomic(), connection.cursor() as cursor:
+        for batch in batches(counts.items()):
+            placeholders = ', '.join(['(%s, %s, %s)'] * len(batch))
+            sql = (
+                f"INSERT INTO {table} (path, hits, last_seen) VALUES {placeholders} "
+                f"ON CONFLICT (path) DO UPDATE SET hits = {table}.hits + excluded.hits, "
+                f"last_seen = excluded.last_seen"
+            )
+            cursor.execute(sql, [value for path, hits in batch for value in (path, hits, now)])
+    NotFoundStat.objects.filter(last_seen__lt=now - timedelta(days=settings.NOT_FOUND_RETENTION_DAYS)).delete()
+
+
+not_found_counter = BufferedCounter(
+    flush_not_found_counts, settings.ANALYTICS_FLUSH_INTERVAL, max_keys=settings.NOT_FOUND_MAX_PATHS
+)
+
+
+def record_not_found(path):
+    not_found_counter.add(path[:NotFoundStat._meta.get_field('path').max_length])
+
+
+def update_popularity(half_life_days=None, window_days=None):
+    """Recompute the time-decayed popularity score of every project and blog post
+
+    Returns the number of rows whose score changed.
+    """
+    half_life_days = half_life_days or settings.POPULARITY_HALF_LIFE_DAYS
+    window_days = window_days or settings.POPULARITY_WINDOW_DAYS
+    today = timezone.localdate()
+    decay = math.log(2) / half_life_days
+
+    scores = defaultdict(float)
+    stats = DailyViewStat.objects.filter(date__gte=today - timedelta(days=window_days))
+    for kind, object_id, date, views in stats.values_list('kind', 'object_id', 'date', 'views'):
+        scores[kind, object_id] += views * math.exp(-decay * (today - date).days)
+
+    changed = 0
+    for kind, model in KIND_MODELS.items():
+        updated = []
+        for obj in model.objects.only('id', 'popularity'):
+            score = round(scores.get((kind, obj.id), 0.0), 4)
+            if score != obj.popularity:
+                obj.popularity = score
+                updated.append(obj)
+        model.objects.bulk_update(updated, ['popularity'], batch_size=500)
+        changed += len(updated)
+    return changed
+
+
+class ViewCountMixin:
+    """Count visitors' detail page views, including page cache hits, without a write per request"""
+    view_kind = None
+
+    def dispatch(self, request, *args, **kwargs):
+        if request.method == 'GET' and not is_internal_request(request):
+            record_view(self.view_kind, kwargs.get(self.slug_url_kwarg))
+        return super().dispatch(request, *args, **kwargs)
@@ -0,0 +1,287 @@
+import base64
+import hashlib
+import json
+from datetime import date, datetime
+
+from django.conf import settings
+from django.core.cache import cache
+from django.core.files.storage import default_storage
+from django.core.serializers.json import DjangoJSONEncoder
+from django.db.models import Q
+from django.http import Http404, HttpResponse, HttpResponseNotModified, JsonResponse
+from django.utils.cache import patch_cache_control
+from django.utils.dateparse import parse_date, parse_datetime
+from django.views import View
+
+from .cache import request_cache_key
+from .models import Project, ProjectImage, Service, TeamMember, BlogPost
+
+API_GENERATION_KEY = 'portfolio:api:generation'
+DEFAULT_LIMIT = 12
+MAX_LIMIT = 50
+IMAGE_FIELDS = {'featured_image', 'image'}
+
+
+class ApiError(Exception):
+    pass
+
+
+def bump_api_generation():
+    """Invalidate every cached API response at once"""
+    try:
+        cache.incr(API_GENERATION_KEY)
+    except ValueError:
+        cache.set(API_GENERATION_KEY, 1, None)
+
+
+def encode_cursor(*values):
+    raw = '|'.join(v.isoformat() if isinstance(v, (date, datetime)) else str(v) for v in values)
+    return base64.urlsafe_b64encode(raw.encode()).decode().rstrip('=')
+
+
+def decode_cursor(cursor):
+    try:
+        raw = base64.urlsafe_b64decode(cursor + '=' * (-len(cursor) % 4)).decode()
+        value, pk = raw.rsplit('|', 1)
+        return value, int(pk)
+    except (ValueError, UnicodeDecodeError):
+        raise ApiError('Invalid cursor')
+
+
+class ApiView(View):
+    """Read-only JSON endpoint serializing ``values()`` rows, cached with an ETag"""
+    http_method_names = ['get', 'head', 'options']
+    fields = {}
+    default_fields = ()
+    use_cache = True
+
+    def get(self, request, **kwargs):
+        if not self.use_cache:
+            body = self.render_body(request, **kwargs)
+            return self.build_response(request, body, self.make_etag(body))
+
+        key = f"portfolio:api:{cache.get_or_set(API_GENERATION_KEY, 1, None)}:{request_cache_key(request)}"
+        cached = cache.get(key)
+        if cached is None:
+            body = self.render_body(request, **kwargs)
+            cached = (body, self.make_etag(body))
+            if isinstance(body, bytes):
+                cache.set(key, cached, settings.API_CACHE_TIMEOUT)
+        return self.build_response(request, *cached)
+
+    def render_body(self, request, **kwargs):
+        try:
+            payload = self.get_payload(request, **kwargs)
+        except ApiError as e:
+            return JsonResponse({'error': str(e)}, status=400)
+        except Http404:
+            return JsonResponse({'error': 'Not found'}, status=404)
+        return json.dumps(payload, cls=DjangoJSONEncoder, separators=(',', ':')).encode()
+
+    def make_etag(self, body):
+        return f'"{hashlib.md5(body).hexdigest()}"' if isinstance(body, bytes) else None
+
+    def build_response(self, request, body, etag):
+        if not isinstance(body, bytes):
+            return body
+        if etag in [tag.strip() for tag in request.headers.get('If-None-Match', '').split(',')]:
+            response = HttpResponseNotModified()
+        else:
+            response = HttpResponse(body, content_type='application/json')
+        response['ETag'] = etag
+        patch_cache_control(response, public=True, max_age=settings.API_CACHE_TIMEOUT)
+        return response
+
+    def get_payload(self, request, **kwargs):
+        raise NotImplementedError
+
+    def selected_fields(self, request):
+        requested = request.GET.get('fields')
+        if not requested:
+            return list(self.default_fields)
+        names = [name.strip() for name in requested.split(',') if name.strip()]
+        unknown = [name for name in names if name not in self.fields]
+        if unknown:
+            raise ApiError(f"Unknown fields: {', '.join(unknown)}")
+        return names
+
+    def serialize(self, queryset, names, fields=None):
+        """Rows as dicts keyed by API field name, with image names turned into URLs"""
+        fields = fields or self.fields
+        lookups = [fields[name] for name in names]
+        rows = []
+        for values in queryset.values_list(*lookups):
+            row = dict(zip(names, values))
+            for name in IMAGE_FIELDS.intersection(row):
+                row[name] = default_storage.url(row[name]) if row[name] else None
+            rows.append(row)
+        return rows
+
+
+class KeysetListView(ApiView):
+    """List endpoint paginated by ``(order_field, id)`` descending keyset cursors"""
+    order_field = None
+
+    def get_queryset(self, request):
+        raise NotImplementedError
+
+    def parse_order_value(self, value):
+        return value
+
+    def get_payload(self, request, **kwargs):
+        names = self.selected_fields(request)
+        try:
+            limit = int(request.GET.get('limit', DEFAULT_LIMIT))
+        except ValueError:
+            raise ApiError('limit must be an integer')
+        if limit < 1:
+            raise ApiError('limit must be at least 1')
+        limit = min(limit, MAX_LIMIT)
+
+        queryset = self.get_queryset(request).order_by(f'-{self.order_field}', '-id')
+        cursor = request.GET.get('after')
+        if cursor:
+            value, pk = decode_cursor(cursor)
+            value = self.parse_order_value(value)
+            if value is None:
+                raise ApiError('Invalid cursor')
+            queryset = queryset.filter(
+                Q(**{f'{self.order_field}__lt': value}) | Q(**{self.order_field: value, 'id__lt': pk})
+            )
+
+        # Fetch the keyset columns alongside the selected ones, then drop them
+        keyset_fields = dict(self.fields, id='id', **{self.order_field: self.order_field})
+        lookups = list(dict.fromkeys(names + ['id', self.order_field]))
+        rows = self.serialize(queryset[:limit + 1], lookups, keyset_fields)
+
+        next_cursor = None
+        if len(rows) > limit:
+            rows = rows[:limit]
+            next_cursor = encode_cursor(rows[-1][self.order_field], rows[-1]['id'])
+        results = [{name: row[name] for name in names} for row in rows]
+        return {'results': results, 'next': next_cursor}
+
+
+class ProjectListApi(KeysetListView):
+    fields = {
+        'id': 'id',
+        'slug': 'slug',
+        'title': 'title',
+        'description': 'description',
+        'category': 'category__slug',
+        'category_name': 'category__name',
+        'location': 'location',
+        'project_date': 'project_date',
+        'is_featured': 'is_featured',
+        'featured_image': 'featured_image',
+    }
+    default_fields = ('slug', 'title', 'category', 'location', 'project_date', 'featured_image')
+    order_field = 'project_date'
+
+    def get_queryset(self, request):
+        queryset = Project.objects.published()
+        category = request.GET.get('category')
+        if category:
+            queryset = queryset.filter(category__slug=category)
+        return queryset
+
+    def parse_order_value(self, value):
+        return parse_date(value)
+
+
+class ProjectDetailApi(ApiView):
+    fields = dict(ProjectListApi.fields, **{
+        'detailed_description': 'detailed_description',
+        'client_name': 'client_name',
+        'budget': 'budget',
+        'duration': 'duration',
+    })
+    default_fields = tuple(fields)
+    image_fields = {'image': 'image', 'caption': 'caption', 'order': 'order'}
+
+    def get_payload(self, request, slug):
+        names = self.selected_fields(request)
+        project = Project.objects.published().filter(slug=slug).order_by()
+        rows = self.serialize(project, list(dict.fromkeys(names + ['id'])))
+        if not rows:
+            raise Http404
+        project = rows[0]
+        pk = project['id'] if 'id' in names else project.pop('id')
+        gallery = ProjectImage.objects.filter(project_id=pk).order_by('order')
+        project['images'] = self.serialize(gallery, list(self.image_fields), self.image_fields)
+        return project
+
+
+class ServiceListApi(ApiView):
+    fields = {
+        'slug': 'slug',
+        'name': 'name',
+        'description': 'description',
+        'icon': 'icon',
+        'image': 'image',
+        'features': 'features',
+        'order': 'order',
+    }
+    default_fields = tuple(fields)
+
+    def get_payload(self, request):
+        names = self.selected_fields(request)
+        results = self.serialize(Service.objects.all(), names)
+        if 'features' in names:
+            for row in results:
+                row['features'] = [f.strip() for f in row['features'].split(',') if f.strip()]
+        return {'results': results}
+
+
+class TeamListApi(ApiView):
+    fields = {
+        'name': 'name',
+        'position': 'position',
+        'bio': 'bio',
+        'image': 'image',
+        'experience_years': 'experience_years',
+        'specialization': 'specialization',
+        'social_links': 'social_links',
+        'order': 'order',
+    }
+    default_fields = tuple(fields)
+
+    def get_payload(self, request):
+        return {'results': self.serialize(TeamMember.objects.all(), self.selected_fields(request))}
+
+
+class BlogListApi(KeysetListView):
+    fields = {
+        'id': 'id',
+        'slug': 'slug',
+        'title': 'title',
+        'excerpt': 'excerpt',
+        'auto_excerpt': 'auto_excerpt',
+        'tags': 'tags',
+        'reading_time': 'reading_time',
+        'featured_image': 'featured_image',
+        'created_at': 'created_at',
+    }
+    default_fields = ('slug', 'title', 'excerpt', 'auto_excerpt', 'reading_time', 'featured_image', 'created_at')
+    order_field = 'created_at'
+
+    def get_queryset(self, request):
+        return BlogPost.objects.published()
+
+    def parse_order_value(self, value):
+        return parse_datetime(value)
+
+
+class BlogDetailApi(ApiView):
+    fields = dict(BlogListApi.fields, **{
+        'content_html': 'content_html',
+        'word_count': 'word_count',
+        'author': 'author__username',
+    })
+    default_fields = tuple(name for name in fields if name != 'id')
+
+    def get_payload(self, request, slug):
+        rows = self.serialize(BlogPost.objects.published().filter(slug=slug), self.selected_fields(request))
+        if not rows:
+            raise Http404
+        return rows[0]
@@ -1,6 +1,16 @@
 from django.apps import AppConfig
+from django.contrib.staticfiles.apps import StaticFilesConfig
 
 
 class PortfolioConfig(AppConfig):
+    default = True
     default_auto_field = 'django.db.models.BigAutoField'
     name = 'portfolio'
+
+    def ready(self):
+        from . import signals  # noqa: F401
+
+
+class PortfolioStaticFilesConfig(StaticFilesConfig):
+    """Keep backup copies such as style_bkp.css out of collectstatic"""
+    ignore_patterns = StaticFilesConfig.ignore_patterns + ['*_bkp.*', '*_bkps.*']
@@ -0,0 +1,130 @@
+import hashlib
+import io
+import json
+import os
+import zipfile
+
+from django.conf import settings
+from django.utils.text import slugify
+
+from .models import Project
+
+CHUNK_SIZE = 64 * 1024
+
+
+class _ZipSink:
+    """Write-only, non-seekable file object collecting zipfile output between yields"""
+
+    def __init__(self):
+        self._chunks = []
+        self._offset = 0
+
+    def write(self, data):
+        self._chunks.append(bytes(data))
+        self._offset += len(data)
+        return len(data)
+
+    def tell(self):
+        return self._offset
+
+    def flush(self):
+        pass
+
+    def drain(self):
+        data, self._chunks = b''.join(self._chunks), []
+        return data
+
+
+def stream_zip(entries, date_time=(1980, 1, 1, 0, 0, 0)):
+    """Yield an uncompressed ZIP of ``(arcname, open_func)`` entries in constant memory
+
+    ``open_func`` returns a binary file object. Members are STORED, since
+    photos do not compress further; entries that cannot be opened are left
+    out.
+    """
+    sink = _ZipSink()
+    with zipfile.ZipFile(sink, 'w', zipfile.ZIP_STORED) as archive:
+        for arcname, open_func in entries:
+            try:
+                source = open_func()
+            except OSError:
+                continue
+            info = zipfile.ZipInfo(arcname, date_time)
+            info.compress_type = zipfile.ZIP_STORED
+            with source, archive.open(info, 'w', force_zip64=True) as member:
+                while chunk := source.read(CHUNK_SIZE):
+                    member.write(chunk)
+                    yield sink.drain()
+            yield sink.drain()
+    yield sink.drain()
+
+
+def _bytes_opener(data):
+    return lambda: io.BytesIO(data)
+
+
+def archive_members(project):
+    """``(arcname, file_field, caption, order)`` for the featured image and the gallery"""
+    members = []
+    if project.featured_image:
+        ext = os.path.splitext(project.featured_image.name)[1].lower()
+        members.append((f'00-{project.slug}{ext}', project.featured_image, project.title, 0))
+    for index, image in enumerate(project.images.all(), start=1):
+        ext = os.path.splitext(image.image.name)[1].lower()
+        label = slugify(image.caption)[:60] or 'image'
+        members.append((f'{index:02d}-{label}{ext}', image.image, image.caption, image.order))
+    return members
+
+
+def manifest(project, members):
+    return {
+        'project': project.title,
+        'slug': project.slug,
+        'url': project.get_absolute_url(),
+        'location': project.location,
+        'files': [{'file': arcname, 'caption': caption, 'order': order} for arcname, _, caption, order in members],
+    }
+
+
+def project_archive(project):
+    """Byte chunks of the project's download archive"""
+    members = archive_members(project)
+    body = json.dumps(manifest(project, members), indent=2, ensure_ascii=False).encode()
+    entries = [(arcname, field.open) for arcname, field, _, _ in members]
+    entries.append(('manifest.json', _bytes_opener(body)))
+    date = project.project_date
+    return stream_zip(entries, (max(date.year, 1980), date.month, date.day, 0, 0, 0))
+
+
+def archive_fingerprint(project):
+    """Hash of everything the archive is built from"""
+    digest = hashlib.sha1(f'{project.slug}|{project.title}|{project.location}|{project.project_date}'.encode())
+    for arcname, field, caption, order in archive_members(project):
+        digest.update(f'|{arcname}|{field.name}|{caption}|{order}'.encode())
+    return digest.hexdigest()[:12]
+
+
+def archive_path(project):
+    return os.path.join(settings.PROJECT_ARCHIVE_DIR, f'{project.slug}-{archive_fingerprint(project)}.zip')
+
+
+def prebuilt_archive(project):
+    """Path of an up-to-date prebuilt archive for ``project``, if one exists"""
+    path = archive_path(project)
+    return path if os.path.isfile(path) else None
+
+
+def build_archive(project):
+    """Write the project's archive to PROJECT_ARCHIVE_DIR; returns its path"""
+    path = archive_path(project)
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    tmp_path = f'{path}.tmp'
+    with open(tmp_path, 'wb') as f:
+        for chunk in project_archive(project):
+            f.write(chunk)
+    os.replace(tmp_path, path)
+    return path
+
+
+def popular_projects(count):
+    return Project.objects.published().order_by('-popularity', '-project_date')[:count]
@@ -0,0 +1,137 @@
+import hashlib
+import time
+
+from django.conf import settings
+from django.contrib.messages.storage.cookie import CookieStorage
+from django.core.cache import cache
+from django.http import HttpResponse
+from django.utils.cache import patch_cache_control
+
+from .compression import encode_all, is_html, minify_content
+
+PAGE_CACHE_PREFIX = 'portfolio:page:'
+# Response headers kept with a cached page and replayed on every hit
+CACHED_HEADERS = ('Link',)
+STALE_PAGE_PREFIX = 'portfolio:stale:'
+
+
+def page_cache_key(path, query=None):
+    """Cache key for a public page; query parameters are order-insensitive"""
+    if query:
+        path = f"{path}?{'&'.join(sorted(f'{k}={v}' for k, v in query))}"
+    return PAGE_CACHE_PREFIX + hashlib.md5(path.encode()).hexdigest()
+
+
+def request_cache_key(request):
+    return page_cache_key(request.path, [
+        (key, value) for key in request.GET for value in request.GET.getlist(key)
+    ])
+
+
+def url_cache_key(url):
+    path, _, query = url.partition('?')
+    pairs = [tuple(pair.split('=', 1)) for pair in query.split('&') if '=' in pair]
+    return page_cache_key(path, pairs)
+
+
+def is_cacheable_request(request):
+    """Only anonymous requests without pending messages share cached pages"""
+    return (
+        request.method in ('GET', 'HEAD')
+        and settings.SESSION_COOKIE_NAME not in request.COOKIES
+        and CookieStorage.cookie_name not in request.COOKIES
+    )
+
+
+def is_cacheable_response(response):
+    return (
+        response.status_code == 200
+        and not response.streaming
+        and not response.cookies
+        and 'private' not in response.get('Cache-Control', '')
+    )
+
+
+def get_cached_page(key):
+    cached = cache.get(key)
+    if cached is None:
+        return None
+    response = HttpResponse(cached['content'], content_type=cached['content_type'], headers=cached.get('headers'))
+    response.encoded_bodies = cached.get('encoded', {})
+    response['X-Page-Cache'] = 'hit'
+    return response
+
+
+def store_page(key, response):
+    """Cache a rendered page, minified and with its compressed bodies
+
+    The response itself is updated to match, so HtmlCompressionMiddleware
+    reuses the encodings instead of recomputing them.
+    """
+    if is_html(response) and not hasattr(response, 'encoded_bodies'):
+        response.content = minify_content(response.content, response.charset)
+        response.encoded_bodies = encode_all(response.content)
+    page = {
+        'content': response.content,
+        'encoded': getattr(response, 'encoded_bodies', {}),
+        'content_type': response['Content-Type'],
+        'headers': {name: response[name] for name in CACHED_HEADERS if response.has_header(name)},
+    }
+    cache.set(key, page, settings.PAGE_CACHE_TIMEOUT)
+    # Last good copy, kept through invalidations for degraded mode
+    cache.set(STALE_PAGE_PREFIX + key, dict(page, stored_at=time.time()), settings.STALE_PAGE_TIMEOUT)
+
+
+def has_cached_page(key):
+    return cache.has_key(key)
+
+
+def has_stale_page(key):
+    return cache.has_key(STALE_PAGE_PREFIX + key)
+
+
+def get_stale_page(key):
+    """The last good copy of a page, marked as stale, or None"""
+    page = cache.get(STALE_PAGE_PREFIX + key)
+    if page is None:
+        return None
+    response = HttpResponse(page['content'], content_type=page['content_type'], headers=page.get('headers'))
+    response.encoded_bodies = page.get('encoded', {})
+    response['X-Page-Cache'] = 'stale'
+    response['Age'] = str(max(0, int(time.time() - page['stored_at'])))
+    response['Cache-Control'] = 'no-cache'
+    return response
+
+
+def invalidate_urls(urls):
+    cache.delete_many([url_cache_key(url) for url in urls])
+
+
+def discard_stale_pages(urls):
+    """Forget the last good copies too, for pages that must never be served again"""
+    cache.delete_many([STALE_PAGE_PREFIX + url_cache_key(url) for url in urls])
+
+
+class CachedPageMixin:
+    """Serve anonymous GET requests for public pages from the page cache
+
+    Those responses are also marked ``public`` for PUBLIC_PAGE_MAX_AGE
+    seconds, so browsers and shared caches in front of the site can keep them.
+    """
+
+    def dispatch(self, request, *args, **kwargs):
+        if not is_cacheable_request(request):
+            return super().dispatch(request, *args, **kwargs)
+
+        key = request_cache_key(request)
+        response = get_cached_page(key)
+        if response is None:
+            response = super().dispatch(request, *args, **kwargs)
+            if hasattr(response, 'render') and callable(response.render):
+                response.render()
+            if not is_cacheable_response(response):
+                return response
+            store_page(key, response)
+            response['X-Page-Cache'] = 'miss'
+        patch_cache_control(response, public=True, max_age=settings.PUBLIC_PAGE_MAX_AGE)
+        return response
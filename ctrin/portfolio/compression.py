@@ -0,0 +1,74 @@
+import gzip
+
+from django.conf import settings
+
+from .minify import minify_html
+from .storage import MIN_COMPRESS_SIZE
+
+# (level for bodies encoded once and cached, level for per-response encoding);
+# see `manage.py benchmark_html` for the CPU cost and size of each level
+GZIP_LEVELS = (9, 6)
+BROTLI_QUALITIES = (11, 5)
+ZSTD_LEVELS = (19, 6)
+
+# Server preference when the client accepts several
+PREFERENCE = ('br', 'zstd', 'gzip')
+
+
+def available_encoders():
+    """``{content_coding: encode(data, cached)}`` for gzip and any installed brotli/zstandard"""
+    encoders = {'gzip': lambda data, cached: gzip.compress(data, GZIP_LEVELS[not cached], mtime=0)}
+    try:
+        import brotli
+    except ImportError:
+        pass
+    else:
+        encoders['br'] = lambda data, cached: brotli.compress(data, quality=BROTLI_QUALITIES[not cached])
+    try:
+        import zstandard
+    except ImportError:
+        pass
+    else:
+        encoders['zstd'] = lambda data, cached: zstandard.ZstdCompressor(level=ZSTD_LEVELS[not cached]).compress(data)
+    return encoders
+
+
+ENCODERS = available_encoders()
+
+
+def negotiate(accept_encoding, available=ENCODERS):
+    """The preferred coding the client accepts (q > 0), or None for identity"""
+    accepted = {}
+    for item in accept_encoding.split(','):
+        coding, _, params = item.strip().partition(';')
+        quality = 1.0
+        name, _, value = params.strip().partition('=')
+        if name.strip() == 'q':
+            try:
+                quality = float(value)
+            except ValueError:
+                quality = 0.0
+        accepted[coding.strip().lower()] = quality
+    for coding in PREFERENCE:
+        if coding in available and accepted.get(coding, accepted.get('*', 0)) > 0:
+            return coding
+    return None
+
+
+def is_html(response):
+    return response.get('Content-Type', '').startswith('text/html')
+
+
+def minify_content(content, charset='utf-8'):
+    return minify_html(content.decode(charset)).encode(charset) if settings.HTML_MINIFY else content
+
+
+def encode_all(content):
+    """Every available encoding of ``content``; None marks ones that would not shrink it"""
+    if not settings.HTML_COMPRESS or len(content) < MIN_COMPRESS_SIZE:
+        return {}
+    encoded = {}
+    for coding, encode in ENCODERS.items():
+        body = encode(content, True)
+        encoded[coding] = body if len(body) < len(content) else None
+    return encoded
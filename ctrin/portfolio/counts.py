@@ -0,0 +1,50 @@
+from django.db.models import Count, F, Q
+
+from .models import Category, Project
+
+
+def _contribution(category_id, is_published, is_featured):
+    """What one project adds to its category's counts: ``(category_id, featured)`` or None"""
+    if not category_id or not is_published:
+        return None
+    return category_id, int(is_featured)
+
+
+def project_contribution(project):
+    return _contribution(project.category_id, project.is_published, project.is_featured)
+
+
+def stored_contribution(pk):
+    """The contribution of project ``pk`` as currently saved in the database"""
+    row = Project.objects.filter(pk=pk).values_list('category_id', 'is_published', 'is_featured').first() if pk else None
+    return _contribution(*row) if row else None
+
+
+def move_contribution(old, new):
+    """Shift a project's contribution between categories with in-database increments"""
+    if old == new:
+        return
+    for contribution, sign in ((old, -1), (new, 1)):
+        if contribution:
+            category_id, featured = contribution
+            Category.objects.filter(pk=category_id).update(
+                project_count=F('project_count') + sign,
+                featured_count=F('featured_count') + sign * featured,
+            )
+
+
+def recount_categories(category_ids=None):
+    """Recompute stored counts with one aggregate query; returns the categories that changed"""
+    published = Q(projects__is_published=True)
+    categories = Category.objects.all() if category_ids is None else Category.objects.filter(pk__in=category_ids)
+    categories = categories.annotate(
+        published=Count('projects', filter=published),
+        featured=Count('projects', filter=published & Q(projects__is_featured=True)),
+    )
+    changed = []
+    for category in categories:
+        if (category.project_count, category.featured_count) != (category.published, category.featured):
+            category.project_count, category.featured_count = category.published, category.featured
+            changed.append(category)
+    Category.objects.bulk_update(changed, ['project_count', 'featured_count'])
+    return changed
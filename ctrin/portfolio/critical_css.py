@@ -0,0 +1,212 @@
+import hashlib
+import json
+import os
+import re
+from html.parser import HTMLParser
+from urllib.parse import urljoin
+
+from django.conf import settings
+from django.contrib.staticfiles import finders
+from django.contrib.staticfiles.storage import staticfiles_storage
+from django.template import TemplateDoesNotExist
+from django.template.loader import get_template
+
+from .minify import minify_css
+
+EXTENDS_RE = re.compile(r"""{%\s*extends\s+['"]([^'"]+)['"]\s*%}""")
+SIMPLE_SELECTOR_RE = re.compile(r'([.#]?)(-?[_a-zA-Z][-_a-zA-Z0-9]*)')
+PSEUDO_RE = re.compile(r'::?[-a-zA-Z]+(\([^)]*\))?|\[[^\]]*\]')
+CSS_URL_RE = re.compile(r'''url\(\s*(['"]?)([^'")]+)\1\s*\)''')
+ALWAYS_KEPT_SELECTORS = {'*', ':root', 'html', 'body'}
+KEPT_AT_RULES = ('@charset', '@import', '@font-face', '@layer')
+
+
+class FoldCollector(HTMLParser):
+    """Collect the tags, classes and ids of the first ``limit`` elements of <body>"""
+
+    def __init__(self, limit):
+        super().__init__()
+        self.limit = limit
+        self.seen = 0
+        self.in_body = False
+        self.tags, self.classes, self.ids = set(), set(), set()
+
+    def handle_starttag(self, tag, attrs):
+        if tag == 'body':
+            self.in_body = True
+        if not self.in_body or self.seen >= self.limit:
+            return
+        self.seen += 1
+        self.tags.add(tag)
+        for name, value in attrs:
+            if name == 'class' and value:
+                self.classes.update(value.split())
+            elif name == 'id' and value:
+                self.ids.add(value)
+
+
+def parse_rules(css):
+    """Split a stylesheet into ``(prelude, body)`` pairs, descending into nested blocks"""
+    rules, depth, start, prelude = [], 0, 0, None
+    i, length = 0, len(css)
+    while i < length:
+        char = css[i]
+        if char in '"\'':
+            end = css.find(char, i + 1)
+            while end != -1 and css[end - 1] == '\\':
+                end = css.find(char, end + 1)
+            i = length if end == -1 else end + 1
+            continue
+        if css.startswith('/*', i):
+            end = css.find('*/', i + 2)
+            i = length if end == -1 else end + 2
+            continue
+        if char == '{':
+            if depth == 0:
+                prelude, start = css[start:i].strip(), i + 1
+            depth += 1
+        elif char == '}':
+            depth -= 1
+            if depth == 0:
+                rules.append((prelude, css[start:i]))
+                start = i + 1
+        elif char == ';' and depth == 0:
+            rules.append((css[start:i].strip(), None))
+            start = i + 1
+        i += 1
+    return rules
+
+
+def selector_matches(selector, used):
+    """True when every tag, class and id named in ``selector`` occurs in ``used``"""
+    selector = selector.strip()
+    if selector in ALWAYS_KEPT_SELECTORS:
+        return True
+    stripped = PSEUDO_RE.sub(' ', selector)
+    tokens = SIMPLE_SELECTOR_RE.findall(stripped)
+    if not tokens:
+        return True
+    for prefix, name in tokens:
+        if prefix == '.' and name not in used['classes']:
+            return False
+        if prefix == '#' and name not in used['ids']:
+            return False
+        if not prefix and name.lower() not in used['tags']:
+            return False
+    return True
+
+
+def extract_critical(css, used):
+    """The subset of ``css`` whose selectors match elements in ``used``"""
+    output = []
+    for prelude, body in parse_rules(css):
+        if body is None:
+            if prelude.startswith(KEPT_AT_RULES):
+                output.append(prelude + ';')
+        elif prelude.startswith('@'):
+            if prelude.startswith(('@media', '@supports', '@layer')):
+                inner = extract_critical(body, used)
+                if inner:
+                    output.append(f'{prelude}{{{inner}}}')
+            elif prelude.startswith('@font-face'):
+                output.append(f'{prelude}{{{body}}}')
+        else:
+            selectors = [s for s in prelude.split(',') if selector_matches(s, used)]
+            if selectors:
+                output.append(f"{','.join(selectors)}{{{body}}}")
+    return minify_css('\n'.join(output))
+
+
+def absolutize_urls(css, base_url):
+    """Rewrite relative url() references so the CSS still works when inlined"""
+    def replace(match):
+        quote, url = match.groups()
+        if url.startswith(('data:', '#', '/', 'http://', 'https://')):
+            return match.group(0)
+        return f'url({quote}{urljoin(base_url, url)}{quote})'
+    return CSS_URL_RE.sub(replace, css)
+
+
+_chains = {}
+
+
+def template_files(template_name):
+    """Source paths of a template and every template it extends"""
+    if template_name not in _chains:
+        paths, name = [], template_name
+        while name:
+            path = get_template(name).origin.name
+            paths.append(path)
+            with open(path, encoding='utf-8') as f:
+                match = EXTENDS_RE.search(f.read())
+            name = match.group(1) if match else None
+        _chains[template_name] = paths
+    return _chains[template_name]
+
+
+def is_remote(href):
+    return href.startswith(('http://', 'https://', '//'))
+
+
+def stylesheet_path(href):
+    return None if is_remote(href) else finders.find(href)
+
+
+def stylesheet_url(href):
+    return href if is_remote(href) else staticfiles_storage.url(href)
+
+
+def fingerprint(template_name, sources):
+    """Hash of everything the critical CSS for ``template_name`` was computed from"""
+    digest = hashlib.sha1()
+    for path in template_files(template_name) + [p for p in map(stylesheet_path, sources) if p]:
+        with open(path, 'rb') as f:
+            digest.update(f.read())
+    digest.update('|'.join(sources).encode())
+    return digest.hexdigest()
+
+
+def manifest_path():
+    return os.path.join(settings.CRITICAL_CSS_DIR, 'manifest.json')
+
+
+def load_manifest():
+    try:
+        with open(manifest_path(), encoding='utf-8') as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return {}
+
+
+_entries = {}
+
+
+def _mtimes(template_name, sources):
+    paths = template_files(template_name) + [manifest_path()]
+    paths += [p for p in map(stylesheet_path, sources) if p]
+    return tuple(os.path.getmtime(p) if os.path.exists(p) else 0 for p in paths)
+
+
+def critical_css_for(template_name):
+    """Up-to-date critical CSS for ``template_name`` and the stylesheets it covers
+
+    Results are memoised per process and re-validated whenever a template,
+    stylesheet or the manifest changes on disk. Returns ``(None, ())``
+    when there is no valid build, so pages fall back to blocking CSS.
+    """
+    sources = settings.CRITICAL_CSS_STYLESHEETS
+    try:
+        mtimes = _mtimes(template_name, sources)
+    except (OSError, TemplateDoesNotExist):
+        return None, ()
+    cached = _entries.get(template_name)
+    if cached and cached[0] == mtimes:
+        return cached[1]
+
+    result = (None, ())
+    entry = load_manifest().get(template_name)
+    if entry and entry['fingerprint'] == fingerprint(template_name, sources):
+        with open(os.path.join(settings.CRITICAL_CSS_DIR, entry['file']), encoding='utf-8') as f:
+            result = (f.read(), tuple(entry['stylesheets']))
+    _entries[template_name] = (mtimes, result)
+    return result
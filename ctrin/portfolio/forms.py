@@ -2,6 +2,11 @@ from django import forms
 from .models import ContactMessage
 
 class ContactForm(forms.ModelForm):
+    # Honeypot: hidden from people, filled in by bots that complete every field
+    website = forms.CharField(required=False, widget=forms.TextInput(attrs={
+        'tabindex': '-1', 'autocomplete': 'off',
+    }))
+
     class Meta:
         model = ContactMessage
         fields = ['name', 'email', 'phone', 'subject', 'message', 'project_type', 'budget']
@@ -14,3 +19,6 @@ class ContactForm(forms.ModelForm):
             'project_type': forms.TextInput(attrs={'class': 'form-control', 'placeholder': 'Type of Project (Optional)'}),
             'budget': forms.TextInput(attrs={'class': 'form-control', 'placeholder': 'Budget Range (Optional)'}),
         }
+
+    def is_honeypot_filled(self):
+        return bool(self.data.get(self.add_prefix('website'), '').strip())
@@ -0,0 +1,142 @@
+import os
+import re
+from urllib.parse import urlsplit
+
+from django.conf import settings
+from django.template import TemplateDoesNotExist
+from django.templatetags.static import static
+
+from .critical_css import CSS_URL_RE, is_remote, parse_rules, stylesheet_path, stylesheet_url, template_files
+
+STYLESHEETS_TAG_RE = re.compile(r'{%\s*stylesheets\s*%}')
+ASSET_TAG_RE = re.compile(r'''<(link|script)\b([^>]*?)\b(?:href|src)=(?:"([^"]+)"|'([^']+)')([^>]*)>''', re.I)
+STATIC_TAG_RE = re.compile(r'''^{%\s*static\s+['"]([^'"]+)['"]\s*%}$''')
+STYLESHEET_REL_RE = re.compile(r'''rel=["']?stylesheet''', re.I)
+FONT_TYPES = {'.woff2': 'font/woff2', '.woff': 'font/woff', '.ttf': 'font/ttf', '.otf': 'font/otf'}
+
+
+def origin(url):
+    parts = urlsplit(url if '://' in url else f'https:{url}')
+    return f'{parts.scheme}://{parts.netloc}'
+
+
+def asset_url(value):
+    """URL of a template asset reference: an absolute URL or a literal ``{% static %}`` tag"""
+    match = STATIC_TAG_RE.match(value.strip())
+    if match:
+        return static(match.group(1))
+    return value if is_remote(value) else None
+
+
+def font_urls(css):
+    """The first font file of each ``@font-face`` rule"""
+    urls = []
+    for prelude, body in parse_rules(css):
+        if prelude.startswith('@font-face') and body:
+            match = CSS_URL_RE.search(body)
+            if match:
+                urls.append(match.group(2))
+    return urls
+
+
+def scan_template(template_name):
+    """Stylesheets, scripts and fonts a template chain references, by static analysis"""
+    stylesheets, scripts = [], []
+    for path in template_files(template_name):
+        with open(path, encoding='utf-8') as f:
+            source = f.read()
+        if STYLESHEETS_TAG_RE.search(source):
+            stylesheets += [stylesheet_url(href) for href in settings.CRITICAL_CSS_STYLESHEETS]
+        for tag, before, double, single, after in ASSET_TAG_RE.findall(source):
+            url = asset_url(double or single)
+            if not url:
+                continue
+            if tag.lower() == 'script':
+                scripts.append(url)
+            elif STYLESHEET_REL_RE.search(before + after):
+                stylesheets.append(url)
+
+    fonts = []
+    for href in settings.CRITICAL_CSS_STYLESHEETS:
+        path = stylesheet_path(href)
+        if path:
+            with open(path, encoding='utf-8') as f:
+                fonts += font_urls(f.read())
+    return list(dict.fromkeys(stylesheets)), list(dict.fromkeys(scripts)), list(dict.fromkeys(fonts))
+
+
+def template_links(template_name):
+    """``Link`` header values preconnecting and preloading a template's critical assets"""
+    stylesheets, scripts, fonts = scan_template(template_name)
+    links = []
+    for url in dict.fromkeys(origin(url) for url in stylesheets + scripts if is_remote(url)):
+        links.append(f'<{url}>; rel=preconnect')
+    for url in dict.fromkeys(origin(url) for url in fonts if is_remote(url)):
+        links.append(f'<{url}>; rel=preconnect; crossorigin')
+    links += [f'<{url}>; rel=preload; as=style' for url in stylesheets]
+    for url in fonts:
+        font_type = FONT_TYPES.get(os.path.splitext(urlsplit(url).path)[1].lower())
+        type_param = f'; type="{font_type}"' if font_type else ''
+        links.append(f'<{url}>; rel=preload; as=font{type_param}; crossorigin')
+    return links
+
+
+_view_templates = {}
+_links = {}
+
+
+def remember_template(view_name, template_name):
+    """Record which template a view renders, for views that do not declare ``template_name``"""
+    if view_name and _view_templates.get(view_name) != template_name:
+        _view_templates[view_name] = template_name
+
+
+def _mtimes(template_name):
+    paths = template_files(template_name) + [p for p in map(stylesheet_path, settings.CRITICAL_CSS_STYLESHEETS) if p]
+    return tuple(os.path.getmtime(p) for p in paths)
+
+
+def links_for_view(view_name, view_class=None):
+    """Cached ``Link`` values for a URL name, known before its view runs
+
+    The template comes from the view's ``template_name``, or from the
+    last render of that view. The list is rebuilt when any template in
+    the chain or a local stylesheet changes on disk.
+    """
+    template_name = getattr(view_class, 'template_name', None) or _view_templates.get(view_name)
+    if not template_name:
+        return []
+    try:
+        mtimes = _mtimes(template_name)
+    except (OSError, TemplateDoesNotExist):
+        return []
+    cached = _links.get(view_name)
+    if cached and cached[0] == (template_name, mtimes):
+        return cached[1]
+    links = template_links(template_name)
+    _links[view_name] = ((template_name, mtimes), links)
+    return links
+
+
+def add_links(response, links):
+    """Append ``links`` to the response's ``Link`` header, skipping ones already there"""
+    existing = [link.strip() for link in response.get('Link', '').split(',') if link.strip()]
+    merged = list(dict.fromkeys(existing + list(links)))
+    if merged:
+        response['Link'] = ', '.join(merged)
+
+
+class PreloadImageMixin:
+    """Preload the detail object's hero image through a ``Link`` header
+
+    Sits after CachedPageMixin in the bases, so the header is stored with
+    the cached page and sent on every hit.
+    """
+    preload_image_field = 'featured_image'
+
+    def render_to_response(self, context, **response_kwargs):
+        response = super().render_to_response(context, **response_kwargs)
+        image = getattr(self.object, self.preload_image_field, None)
+        if image:
+            add_links(response, [f'<{image.url}>; rel=preload; as=image; fetchpriority=high'])
+        return response
@@ -0,0 +1,99 @@
+import base64
+import io
+
+from django.apps import apps
+from django.core.files.images import get_image_dimensions
+from django.core.files.storage import default_storage
+from django.db import models
+from PIL import Image
+
+PLACEHOLDER_SIZE = 16
+PLACEHOLDER_QUALITY = 40
+
+
+def dimension_fields(model):
+    """``(image_field, width_field, height_field)`` names for each ImageField storing its size"""
+    return [
+        (field.name, field.width_field, field.height_field)
+        for field in model._meta.get_fields()
+        if isinstance(field, models.ImageField) and field.width_field and field.height_field
+    ]
+
+
+class DimensionedImageField(models.ImageField):
+    """ImageField that leaves its stored size empty when the file is missing
+
+    Django opens the file to fill empty width/height fields whenever a row
+    is loaded, so a row whose file has gone would otherwise fail every page
+    listing it instead of showing a broken image.
+    """
+
+    def update_dimension_fields(self, instance, force=False, *args, **kwargs):
+        try:
+            super().update_dimension_fields(instance, force, *args, **kwargs)
+        except OSError:
+            pass
+
+
+def models_with_dimensions():
+    return [model for model in apps.get_app_config('portfolio').get_models() if dimension_fields(model)]
+
+
+def read_dimensions(storage, name):
+    """Width and height from the image header, without decoding pixel data"""
+    try:
+        with storage.open(name, 'rb') as f:
+            return get_image_dimensions(f)
+    except OSError:
+        return None, None
+
+
+def placeholder_fields(model):
+    """``(image_field, placeholder_field)`` names for each ImageField with a stored placeholder"""
+    names = {field.name for field in model._meta.get_fields()}
+    return [
+        (field.name, f'{field.name}_placeholder')
+        for field in model._meta.get_fields()
+        if isinstance(field, models.ImageField) and f'{field.name}_placeholder' in names
+    ]
+
+
+def encode_placeholder(file):
+    """Base64 data URI of a tiny JPEG rendition of an open image file"""
+    with Image.open(file) as image:
+        # Let the JPEG decoder downscale while reading instead of decoding full size
+        image.draft('RGB', (PLACEHOLDER_SIZE * 8, PLACEHOLDER_SIZE * 8))
+        image = image.convert('RGB')
+        image.thumbnail((PLACEHOLDER_SIZE, PLACEHOLDER_SIZE))
+        buffer = io.BytesIO()
+        image.save(buffer, 'JPEG', quality=PLACEHOLDER_QUALITY, optimize=True)
+    return 'data:image/jpeg;base64,' + base64.b64encode(buffer.getvalue()).decode('ascii')
+
+
+def placeholder_for_name(name):
+    """Placeholder for a stored file; used by the backfill's worker processes"""
+    try:
+        with default_storage.open(name, 'rb') as f:
+            return name, encode_placeholder(f)
+    except (OSError, ValueError):
+        return name, ''
+
+
+def update_placeholder(instance, image_field, placeholder_field):
+    """Compute the placeholder when a new image is uploaded (called from save())"""
+    field_file = getattr(instance, image_field)
+    if not field_file:
+        setattr(instance, placeholder_field, '')
+        return
+    if field_file._committed and getattr(instance, placeholder_field):
+        return
+    try:
+        field_file.open('rb')
+        setattr(instance, placeholder_field, encode_placeholder(field_file))
+    except (OSError, ValueError):
+        setattr(instance, placeholder_field, '')
+    finally:
+        if field_file._committed:
+            field_file.close()
+        else:
+            field_file.seek(0)
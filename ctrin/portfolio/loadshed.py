@@ -0,0 +1,76 @@
+import threading
+import time
+
+from django.http import HttpResponse
+
+# Route classes that are never shed: page cache hits cost almost nothing,
+# and the admin must stay usable during a spike
+PRIORITY_CLASSES = ('cached', 'admin')
+
+
+class AdaptiveLimit:
+    """Concurrency limit for one route class, adapted to its observed latency (AIMD)
+
+    Every completed request is a latency sample. Below ``target`` seconds
+    the limit grows by ``1 / limit``, about one slot per full window of
+    requests; above it the limit is cut by ``backoff``, at most once per
+    ``target`` interval so a burst of slow requests counts as one signal.
+    Shared by the threads of one worker process.
+    """
+
+    def __init__(self, name, initial, maximum, target, minimum=1, backoff=0.7):
+        self.name = name
+        self.limit = float(initial)
+        self.minimum = minimum
+        self.maximum = maximum
+        self.target = target
+        self.backoff = backoff
+        self.in_flight = 0
+        self._last_decrease = 0.0
+        self._condition = threading.Condition()
+
+    def acquire(self, timeout):
+        """Take a slot, waiting up to ``timeout`` seconds; False when none freed up"""
+        with self._condition:
+            if not self._condition.wait_for(lambda: self.in_flight < int(self.limit), timeout):
+                return False
+            self.in_flight += 1
+            return True
+
+    def release(self, latency):
+        now = time.monotonic()
+        with self._condition:
+            self.in_flight -= 1
+            if latency <= self.target:
+                self.limit = min(self.maximum, self.limit + 1 / self.limit)
+            elif now - self._last_decrease >= self.target:
+                self.limit = max(self.minimum, self.limit * self.backoff)
+                self._last_decrease = now
+            self._condition.notify()
+
+
+def request_queue_time(request, now=None):
+    """Seconds the request waited in front of Django, from the proxy's X-Request-Start
+
+    Accepts ``t=<epoch>`` in seconds, milliseconds or microseconds, as set
+    by nginx (``t=${msec}``) and most load balancers. None when absent.
+    """
+    value = request.headers.get('X-Request-Start', '').removeprefix('t=')
+    try:
+        started = float(value)
+    except ValueError:
+        return None
+    while started > 1e11:
+        started /= 1000
+    now = time.time() if now is None else now
+    return max(0.0, now - started)
+
+
+def service_unavailable(retry_after):
+    response = HttpResponse(
+        'The site is very busy right now. Please try again in a moment.',
+        status=503, content_type='text/plain; charset=utf-8',
+    )
+    response['Retry-After'] = str(retry_after)
+    response['Cache-Control'] = 'no-store'
+    return response
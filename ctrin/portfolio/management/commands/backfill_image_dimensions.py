@@ -0,0 +1,34 @@
+from django.core.management.base import BaseCommand
+from django.db.models import Q
+
+from portfolio.images import dimension_fields, models_with_dimensions, read_dimensions
+
+
+class Command(BaseCommand):
+    help = 'Store width/height for existing images so pages never open image files'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--batch-size', type=int, default=200)
+
+    def handle(self, *args, **options):
+        for model in models_with_dimensions():
+            for image_field, width_field, height_field in dimension_fields(model):
+                storage = model._meta.get_field(image_field).storage
+                missing = model.objects.exclude(**{image_field: ''}).filter(
+                    Q(**{f'{width_field}__isnull': True}) | Q(**{f'{height_field}__isnull': True})
+                )
+                # values_list avoids model instances, whose post_init would
+                # open every file to fill the dimensions on its own
+                updated, batch = 0, []
+                for pk, name in missing.values_list('pk', image_field).iterator():
+                    width, height = read_dimensions(storage, name)
+                    if width is None:
+                        self.stdout.write(self.style.WARNING(f"{model.__name__} {pk}: cannot read {name}"))
+                        continue
+                    batch.append(model(pk=pk, **{width_field: width, height_field: height}))
+                    if len(batch) >= options['batch_size']:
+                        updated += model.objects.bulk_update(batch, [width_field, height_field])
+                        batch = []
+                if batch:
+                    updated += model.objects.bulk_update(batch, [width_field, height_field])
+                self.stdout.write(f"{model.__name__}.{image_field}: {updated} rows updated")
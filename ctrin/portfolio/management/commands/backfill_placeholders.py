@@ -0,0 +1,37 @@
+from concurrent.futures import ProcessPoolExecutor
+
+import django
+from django.apps import apps
+from django.core.management.base import BaseCommand
+
+from portfolio.images import placeholder_fields, placeholder_for_name
+
+
+class Command(BaseCommand):
+    help = 'Compute blurred placeholders for existing images, decoding them in parallel'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--workers', type=int, default=None, help='Worker processes (default: one per CPU)')
+        parser.add_argument('--all', action='store_true', help='Recompute placeholders that are already set')
+        parser.add_argument('--batch-size', type=int, default=200)
+
+    def handle(self, *args, **options):
+        models = [m for m in apps.get_app_config('portfolio').get_models() if placeholder_fields(m)]
+        with ProcessPoolExecutor(max_workers=options['workers'], initializer=django.setup) as executor:
+            for model in models:
+                for image_field, placeholder_field in placeholder_fields(model):
+                    queryset = model.objects.exclude(**{image_field: ''})
+                    if not options['all']:
+                        queryset = queryset.filter(**{placeholder_field: ''})
+                    rows = list(queryset.values_list('pk', image_field))
+                    names = sorted({name for _, name in rows})
+                    placeholders = dict(executor.map(placeholder_for_name, names, chunksize=8))
+
+                    batch = []
+                    for pk, name in rows:
+                        if not placeholders.get(name):
+                            self.stdout.write(self.style.WARNING(f"{model.__name__} {pk}: cannot read {name}"))
+                            continue
+                        batch.append(model(pk=pk, **{placeholder_field: placeholders[name]}))
+                    updated = model.objects.bulk_update(batch, [placeholder_field], batch_size=options['batch_size'])
+                    self.stdout.write(f"{model.__name__}.{image_field}: {updated} rows updated")
@@ -0,0 +1,57 @@
+import time
+
+from django.conf import settings
+from django.core.management.base import BaseCommand
+from django.db import connection
+from django.test import RequestFactory
+from django.test.utils import CaptureQueriesContext
+
+from portfolio.api import ProjectListApi, ProjectDetailApi, BlogListApi
+from portfolio.models import Project
+from portfolio.views import ProjectListView, ProjectDetailView, BlogListView
+
+
+class Command(BaseCommand):
+    help = 'Compare the uncached per-item cost of the JSON API against the HTML views'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--iterations', type=int, default=50)
+
+    def handle(self, *args, **options):
+        project = Project.objects.order_by('-project_date').first()
+        cases = [
+            ('projects list', ProjectListView, ProjectListApi, '/projects/', '/api/projects/', {}, ProjectListView.paginate_by),
+            ('blog list', BlogListView, BlogListApi, '/blog/', '/api/blog/', {}, BlogListView.paginate_by),
+        ]
+        if project:
+            cases.append((
+                'project detail', ProjectDetailView, ProjectDetailApi,
+                project.get_absolute_url(), f'/api/projects/{project.slug}/', {'slug': project.slug}, 1,
+            ))
+
+        self.stdout.write(f"{'endpoint':<24}{'ms/req':>10}{'ms/item':>10}{'bytes':>10}{'queries':>9}")
+        for name, html_view, api_view, html_path, api_path, kwargs, items in cases:
+            # Both sides bypass their caches: the HTML view sees a session
+            # cookie and the API view is built with use_cache=False
+            html = self.measure(html_view.as_view(), html_path, kwargs, options['iterations'], cookie=True)
+            api = self.measure(api_view.as_view(use_cache=False), api_path, kwargs, options['iterations'])
+            for label, (ms, size, queries) in (('html', html), ('json', api)):
+                self.stdout.write(
+                    f"{name + ' ' + label:<24}{ms:>10.2f}{ms / items:>10.3f}{size:>10}{queries:>9}"
+                )
+            self.stdout.write(self.style.SUCCESS(f"{name}: JSON is {html[0] / api[0]:.1f}x cheaper per item"))
+
+    def measure(self, view, path, kwargs, iterations, cookie=False):
+        factory = RequestFactory()
+        size = queries = 0
+        start = time.perf_counter()
+        for _ in range(iterations):
+            request = factory.get(path)
+            if cookie:
+                request.COOKIES[settings.SESSION_COOKIE_NAME] = 'benchmark'
+            with CaptureQueriesContext(connection) as captured:
+                response = view(request, **kwargs)
+                if hasattr(response, 'render'):
+                    response.render()
+            size, queries = len(response.content), len(captured)
+        return (time.perf_counter() - start) * 1000 / iterations, size, queries
@@ -0,0 +1,72 @@
+import gzip
+import time
+
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+from django.test import override_settings
+
+from portfolio.compression import BROTLI_QUALITIES, ENCODERS, GZIP_LEVELS, ZSTD_LEVELS
+from portfolio.minify import minify_html
+from portfolio.warming import internal_client, public_urls
+
+
+def level_encoders():
+    """``{coding: (encoder factory, levels to try, (cached level, per-response level))}``"""
+    levels = {'gzip': (lambda level: lambda data: gzip.compress(data, level, mtime=0), (1, 4, 6, 9), GZIP_LEVELS)}
+    if 'br' in ENCODERS:
+        import brotli
+        levels['br'] = (lambda q: lambda data: brotli.compress(data, quality=q), (1, 4, 5, 8, 11), BROTLI_QUALITIES)
+    if 'zstd' in ENCODERS:
+        import zstandard
+        levels['zstd'] = (lambda l: zstandard.ZstdCompressor(level=l).compress, (1, 3, 6, 12, 19), ZSTD_LEVELS)
+    return levels
+
+
+class Command(BaseCommand):
+    help = 'Measure the CPU cost of HTML minification and each compression level against the bytes saved'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--pages', type=int, default=10, help='Number of public pages to sample')
+        parser.add_argument('--iterations', type=int, default=20)
+
+    def handle(self, *args, **options):
+        client = internal_client()
+        # A session cookie keeps the page cache (and its pre-minified bodies) out of the way
+        client.cookies[settings.SESSION_COOKIE_NAME] = 'benchmark'
+        pages = []
+        with override_settings(HTML_MINIFY=False, HTML_COMPRESS=False):
+            for url in public_urls()[:options['pages']]:
+                response = client.get(url, secure=not settings.DEBUG)
+                if response.status_code == 200:
+                    pages.append(response.content.decode(response.charset))
+        if not pages:
+            raise CommandError('No pages rendered')
+
+        iterations = options['iterations']
+        raw = sum(len(page.encode()) for page in pages)
+        minified = [minify_html(page).encode() for page in pages]
+        minify_ms = self.time(lambda: [minify_html(page) for page in pages], iterations) / len(pages)
+        size = sum(map(len, minified))
+
+        self.stdout.write(f"{len(pages)} pages, {raw / len(pages) / 1024:.1f} KiB average")
+        # "saved" is relative to the raw page; KiB/ms is what the step itself saves per ms of CPU
+        self.stdout.write(f"{'step':<22}{'ms/page':>10}{'bytes/page':>12}{'saved':>8}{'KiB/ms':>9}")
+        self.row('minify', minify_ms, size, raw, raw - size, len(pages))
+        for coding, (factory, levels, (cached_level, fast_level)) in level_encoders().items():
+            for level in levels:
+                encode = factory(level)
+                encoded = sum(len(encode(body)) for body in minified)
+                ms = self.time(lambda: [encode(body) for body in minified], iterations) / len(pages)
+                marks = ' (cached)' if level == cached_level else ''
+                marks += ' (per response)' if level == fast_level else ''
+                self.row(f'{coding} {level}{marks}', ms, encoded, raw, size - encoded, len(pages))
+
+    def time(self, func, iterations):
+        start = time.perf_counter()
+        for _ in range(iterations):
+            func()
+        return (time.perf_counter() - start) * 1000 / iterations
+
+    def row(self, label, ms, size, raw, saved, pages):
+        per_ms = saved / pages / 1024 / ms if ms else 0
+        self.stdout.write(f"{label:<22}{ms:>10.3f}{size / pages:>12.0f}{1 - size / raw:>8.1%}{per_ms:>9.1f}")
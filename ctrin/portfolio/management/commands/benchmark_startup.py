@@ -0,0 +1,59 @@
+import json
+import os
+import statistics
+import subprocess
+import sys
+
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+
+
+class Command(BaseCommand):
+    help = 'Measure worker boot and time-to-first-response for cold and preforked workers'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--profile', action='append', dest='profiles',
+            help='Settings module to compare (repeatable; default: the current one and ctrin.settings_production)',
+        )
+        parser.add_argument('--runs', type=int, default=5, help='Fresh processes per profile')
+        parser.add_argument('--path', default='/')
+
+    def handle(self, *args, **options):
+        profiles = options['profiles'] or list(dict.fromkeys(
+            [os.environ.get('DJANGO_SETTINGS_MODULE', 'ctrin.settings'), 'ctrin.settings_production']
+        ))
+        runs = options['runs']
+        if runs < 1:
+            raise CommandError('--runs must be at least 1')
+
+        self.stdout.write(f"{'profile':<32}{'mode':<10}{'boot ms':>10}{'warm ms':>10}{'first ms':>10}{'next ms':>10}  status")
+        for profile in profiles:
+            cold = [self.run_child(profile, options['path']) for _ in range(runs)]
+            self.report(profile, 'cold', cold, [r['first'] for r in cold], [r['second'] for r in cold],
+                        {r['status'] for r in cold})
+
+            # One warmed master forking `runs` workers, as gunicorn does with preload_app
+            forked = self.run_child(profile, options['path'], forks=runs)
+            firsts = [seconds for seconds, _ in forked['forked']]
+            self.report(profile, 'preforked', [forked], firsts, None,
+                        {status for _, status in forked['forked']}, warm=forked['warm'])
+
+    def run_child(self, profile, path, forks=0):
+        code = f"from portfolio.startup import measure; measure({path!r}, {forks})"
+        env = dict(os.environ, DJANGO_SETTINGS_MODULE=profile)
+        completed = subprocess.run(
+            [sys.executable, '-c', code], cwd=settings.BASE_DIR, env=env, capture_output=True, text=True,
+        )
+        if completed.returncode:
+            raise CommandError(f"{profile}: {completed.stderr.strip().splitlines()[-1]}")
+        return json.loads(completed.stdout.strip().splitlines()[-1])
+
+    def report(self, profile, mode, results, firsts, seconds, statuses, warm=None):
+        def ms(values):
+            return f"{statistics.median(values) * 1000:>10.1f}" if values else f"{'-':>10}"
+
+        self.stdout.write(
+            f"{profile:<32}{mode:<10}{ms([r['boot'] for r in results])}{ms([warm] if warm else [])}"
+            f"{ms(firsts)}{ms(seconds)}  {','.join(map(str, sorted(statuses)))}"
+        )
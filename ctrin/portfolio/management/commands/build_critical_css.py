@@ -0,0 +1,99 @@
+import json
+import os
+import urllib.request
+from fnmatch import fnmatch
+
+from django.conf import settings
+from django.core.management.base import BaseCommand
+from django.template.loader import get_template
+from django.urls import reverse
+
+from portfolio.critical_css import (
+    FoldCollector, absolutize_urls, extract_critical, fingerprint,
+    is_remote, manifest_path, stylesheet_path,
+)
+from portfolio.models import Project, BlogPost
+from portfolio.warming import internal_client
+
+SKIPPED_TEMPLATES = ('base.html', '*_bkp*.html')
+
+
+def representative_url(template_name):
+    """A URL that renders ``template_name`` with real data, or None"""
+    project = Project.objects.order_by('-project_date').first()
+    post = BlogPost.objects.published().first()
+    urls = {
+        'home.html': reverse('portfolio:home'),
+        'projects.html': reverse('portfolio:projects'),
+        'project_detail.html': project.get_absolute_url() if project else None,
+        'services.html': reverse('portfolio:services'),
+        'team.html': reverse('portfolio:team'),
+        'blog.html': reverse('portfolio:blog'),
+        'blog_detail.html': post.get_absolute_url() if post else None,
+        'contact.html': reverse('portfolio:contact'),
+        '404.html': '/critical-css-missing-page/',
+    }
+    return urls.get(template_name)
+
+
+class Command(BaseCommand):
+    help = 'Render every page template and store the CSS rules used above the fold for inlining'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--fold', type=int, default=settings.CRITICAL_CSS_FOLD_ELEMENTS,
+                            help='Number of <body> elements treated as above the fold')
+
+    def handle(self, *args, **options):
+        sources = self.load_stylesheets()
+        template_dir = os.path.dirname(get_template('base.html').origin.name)
+        client = internal_client(raise_request_exception=False)
+        os.makedirs(settings.CRITICAL_CSS_DIR, exist_ok=True)
+
+        manifest = {}
+        for template_name in sorted(os.listdir(template_dir)):
+            if not template_name.endswith('.html') or any(fnmatch(template_name, p) for p in SKIPPED_TEMPLATES):
+                continue
+            url = representative_url(template_name)
+            if url is None:
+                self.stdout.write(self.style.WARNING(f"{template_name}: no representative page, skipped"))
+                continue
+
+            response = client.get(url, secure=not settings.DEBUG)
+            collector = FoldCollector(options['fold'])
+            collector.feed(response.content.decode('utf-8'))
+            used = {'tags': collector.tags, 'classes': collector.classes, 'ids': collector.ids}
+            critical = ''.join(extract_critical(css, used) for css in sources.values())
+
+            filename = template_name.replace('.html', '.css')
+            with open(os.path.join(settings.CRITICAL_CSS_DIR, filename), 'w', encoding='utf-8') as f:
+                f.write(critical)
+            manifest[template_name] = {
+                'file': filename,
+                'fingerprint': fingerprint(template_name, settings.CRITICAL_CSS_STYLESHEETS),
+                'stylesheets': list(sources),
+            }
+            self.stdout.write(f"{template_name}: {len(critical)} bytes critical CSS from {url}")
+
+        with open(manifest_path(), 'w', encoding='utf-8') as f:
+            json.dump(manifest, f, indent=2)
+        self.stdout.write(self.style.SUCCESS(f"Wrote critical CSS for {len(manifest)} templates"))
+
+    def load_stylesheets(self):
+        """Contents of each configured stylesheet that could be read, keyed by href"""
+        sources = {}
+        for href in settings.CRITICAL_CSS_STYLESHEETS:
+            try:
+                if is_remote(href):
+                    with urllib.request.urlopen(href, timeout=30) as response:
+                        css = response.read().decode('utf-8')
+                    base_url = href
+                else:
+                    with open(stylesheet_path(href), encoding='utf-8') as f:
+                        css = f.read()
+                    base_url = settings.STATIC_URL + href
+            except (OSError, TypeError) as e:
+                # Stylesheets that cannot be analysed simply stay render-blocking
+                self.stdout.write(self.style.WARNING(f"{href}: not analysed ({e})"))
+                continue
+            sources[href] = absolutize_urls(css, base_url)
+        return sources
@@ -0,0 +1,30 @@
+import os
+
+from django.conf import settings
+from django.core.management.base import BaseCommand
+
+from portfolio.archives import archive_path, build_archive, popular_projects
+
+
+class Command(BaseCommand):
+    help = 'Prebuild gallery ZIP archives for the most popular projects and drop stale ones'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--count', type=int, default=settings.PROJECT_ARCHIVE_COUNT)
+
+    def handle(self, *args, **options):
+        keep = set()
+        for project in popular_projects(options['count']).prefetch_related('images'):
+            path = archive_path(project)
+            if not os.path.isfile(path):
+                build_archive(project)
+                self.stdout.write(f"Built {os.path.basename(path)} ({os.path.getsize(path) / 1024:.0f} KiB)")
+            keep.add(os.path.basename(path))
+
+        removed = 0
+        if os.path.isdir(settings.PROJECT_ARCHIVE_DIR):
+            for filename in os.listdir(settings.PROJECT_ARCHIVE_DIR):
+                if filename not in keep:
+                    os.remove(os.path.join(settings.PROJECT_ARCHIVE_DIR, filename))
+                    removed += 1
+        self.stdout.write(self.style.SUCCESS(f"{len(keep)} archives current, {removed} removed"))
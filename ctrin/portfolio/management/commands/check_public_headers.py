@@ -0,0 +1,67 @@
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+from django.urls import reverse
+from django.utils.cache import cc_delim_re
+
+from portfolio.warming import internal_client, public_urls
+
+
+def header_tokens(response, name):
+    return {token.strip().lower() for token in cc_delim_re.split(response.get(name, '')) if token.strip()}
+
+
+class Command(BaseCommand):
+    help = 'Check that anonymous public pages are shareable: no Set-Cookie, no Vary: Cookie, public Cache-Control'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--limit', type=int, default=0, help='Check at most this many public URLs (0 = all)')
+
+    def handle(self, *args, **options):
+        urls = public_urls()
+        if options['limit']:
+            urls = urls[:options['limit']]
+
+        failures = []
+        for url in urls:
+            # Fetched twice: the first render fills the page cache, the second is a hit
+            for attempt in ('miss', 'hit'):
+                problems = self.public_problems(self.fetch(url))
+                failures += [f"{url} ({attempt}): {problem}" for problem in problems]
+
+        contact = reverse('portfolio:contact')
+        failures += [f"{contact}: {problem}" for problem in self.contact_problems(self.fetch(contact), contact)]
+
+        for failure in failures:
+            self.stdout.write(self.style.ERROR(failure))
+        checked = len(urls) + 1
+        if failures:
+            raise CommandError(f"{len(failures)} header problems across {checked} URLs")
+        self.stdout.write(self.style.SUCCESS(f"{checked} URLs send the expected caching headers"))
+
+    def fetch(self, url):
+        # A fresh client per request: no cookies carried over from earlier pages
+        return internal_client().get(url, secure=not settings.DEBUG)
+
+    def public_problems(self, response):
+        problems = []
+        if response.status_code != 200:
+            problems.append(f"status {response.status_code}")
+        if response.cookies:
+            problems.append(f"sets cookies: {', '.join(response.cookies)}")
+        if 'cookie' in header_tokens(response, 'Vary'):
+            problems.append("varies on Cookie")
+        cache_control = header_tokens(response, 'Cache-Control')
+        if 'public' not in cache_control or not any(token.startswith('max-age=') for token in cache_control):
+            problems.append(f"Cache-Control is {response.get('Cache-Control')!r}, expected public with max-age")
+        return problems
+
+    def contact_problems(self, response, path):
+        problems = []
+        cookie = response.cookies.get(settings.CSRF_COOKIE_NAME)
+        if cookie is None:
+            problems.append("no CSRF cookie")
+        elif cookie['path'] != path:
+            problems.append(f"CSRF cookie path is {cookie['path']!r}, expected {path!r}")
+        if 'private' not in header_tokens(response, 'Cache-Control'):
+            problems.append(f"Cache-Control is {response.get('Cache-Control')!r}, expected private")
+        return problems
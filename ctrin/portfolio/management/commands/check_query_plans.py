@@ -0,0 +1,57 @@
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connection
+from django.test import Client, override_settings
+from django.test.utils import setup_databases, teardown_databases
+
+from portfolio.queryplans import explain_problems, extra_querysets, page_queries, public_requests, seed
+
+
+class Command(BaseCommand):
+    help = ('Seed a throwaway database and fail if any public query plan uses a full scan or a temp sort '
+            '(the test suite runs the same checks on a small dataset; use this for larger scales)')
+
+    def add_arguments(self, parser):
+        parser.add_argument('--scale', type=int, default=2000, help='Number of projects to seed')
+        parser.add_argument('--verbose-plans', action='store_true', help='Print every query with its problems')
+
+    def handle(self, *args, **options):
+        old_config = setup_databases(verbosity=0, interactive=False, aliases={'default'})
+        try:
+            failures = self.check_plans(options)
+        finally:
+            teardown_databases(old_config, verbosity=0)
+        if failures:
+            raise CommandError(f'{failures} queries fell back to full scans or temp sorts')
+        self.stdout.write(self.style.SUCCESS('All query plans use indexes'))
+
+    @override_settings(
+        CACHES={'default': {'BACKEND': 'django.core.cache.backends.dummy.DummyCache'}},
+        ALLOWED_HOSTS=['testserver'],
+    )
+    def check_plans(self, options):
+        seed(options['scale'])
+        checked = {}
+        client = Client()
+        for urls in public_requests().values():
+            for url in urls:
+                status, selects = page_queries(client, url)
+                if status != 200:
+                    raise CommandError(f'{url} returned {status}')
+                for sql in selects:
+                    # Captured SQL has its parameters inlined already
+                    checked.setdefault(sql, (url, ()))
+        for label, queryset in extra_querysets().items():
+            sql, params = queryset.query.sql_with_params()
+            checked.setdefault(sql, (label, params))
+
+        failures = 0
+        for sql, (source, params) in checked.items():
+            problems = explain_problems(sql, params)
+            if problems:
+                failures += 1
+                self.stdout.write(self.style.ERROR(f'{source}: {"; ".join(problems)}'))
+                self.stdout.write(f'    {sql}')
+            elif options['verbose_plans']:
+                self.stdout.write(f'{source}: ok  {sql}')
+        self.stdout.write(f'{len(checked)} distinct queries checked, {failures} with problems')
+        return failures
@@ -0,0 +1,60 @@
+import os
+import time
+
+from django.core.files.storage import default_storage
+from django.core.management.base import BaseCommand, CommandError
+
+from portfolio.media import referenced_blobs
+from portfolio.models import MediaBlob
+from portfolio.storage import ContentAddressedStorage
+
+
+class Command(BaseCommand):
+    help = 'Delete content-addressed media blobs no longer referenced by any model'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--grace', type=int, default=3600,
+                            help='Keep unreferenced files younger than this many seconds (uploads in flight)')
+        parser.add_argument('--dry-run', action='store_true')
+
+    def handle(self, *args, **options):
+        if not isinstance(default_storage, ContentAddressedStorage):
+            raise CommandError('The default storage is not content-addressed')
+        dry_run = options['dry_run']
+        cutoff = time.time() - options['grace']
+
+        # Mark: the database rows are the source of truth; repair drifted counts
+        referenced = referenced_blobs()
+        repaired = 0
+        for blob in MediaBlob.objects.all():
+            count = referenced.get(blob.name, 0)
+            if blob.ref_count != count:
+                repaired += 1
+                if not dry_run:
+                    MediaBlob.objects.filter(pk=blob.pk).update(ref_count=count)
+        known = set(MediaBlob.objects.values_list('name', flat=True))
+        for name in set(referenced) - known:
+            repaired += 1
+            if not dry_run:
+                MediaBlob.objects.create(name=name, size=default_storage.size(name), ref_count=referenced[name])
+
+        # Sweep: every file under cas/ that nothing points at
+        root = default_storage.path(ContentAddressedStorage.prefix)
+        deleted, freed = 0, 0
+        for dirpath, _, filenames in os.walk(root):
+            for filename in filenames:
+                path = os.path.join(dirpath, filename)
+                name = os.path.relpath(path, default_storage.location).replace(os.sep, '/')
+                if name in referenced or os.path.getmtime(path) > cutoff:
+                    continue
+                deleted += 1
+                freed += os.path.getsize(path)
+                if not dry_run:
+                    os.remove(path)
+                    MediaBlob.objects.filter(name=name).delete()
+
+        prefix = '[dry run] ' if dry_run else ''
+        self.stdout.write(self.style.SUCCESS(
+            f"{prefix}{len(referenced)} blobs referenced, {repaired} counts repaired, "
+            f"{deleted} files deleted ({freed / 1024:.0f} KiB)"
+        ))
@@ -0,0 +1,90 @@
+import itertools
+import statistics
+import threading
+import time
+import urllib.error
+import urllib.request
+from collections import Counter, defaultdict
+
+from django.core.management.base import BaseCommand, CommandError
+
+from portfolio.analytics import INTERNAL_USER_AGENT
+from portfolio.warming import public_urls
+
+
+class Command(BaseCommand):
+    help = 'Generate concurrent load against a running server and report status codes and latency per URL'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--base-url', default='http://127.0.0.1:8000')
+        parser.add_argument('--url', action='append', dest='urls', help='Path to request (repeatable; default: every public URL)')
+        parser.add_argument('--concurrency', type=int, default=20)
+        parser.add_argument('--duration', type=float, default=10.0, help='Seconds to keep sending requests')
+        parser.add_argument('--timeout', type=float, default=30.0)
+
+    def handle(self, *args, **options):
+        urls = options['urls'] or public_urls()
+        if not urls:
+            raise CommandError('No URLs to request')
+        base_url = options['base_url'].rstrip('/')
+        deadline = time.monotonic() + options['duration']
+        next_url = itertools.cycle(urls).__next__
+        lock = threading.Lock()
+        results = defaultdict(list)
+
+        def worker():
+            while time.monotonic() < deadline:
+                with lock:
+                    url = next_url()
+                status, seconds, retry_after = self.fetch(base_url + url, options['timeout'])
+                with lock:
+                    results[url].append((status, seconds, retry_after))
+
+        threads = [threading.Thread(target=worker) for _ in range(options['concurrency'])]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        self.report(results, options['duration'])
+
+    def fetch(self, url, timeout):
+        start = time.perf_counter()
+        try:
+            request = urllib.request.Request(url, headers={'User-Agent': INTERNAL_USER_AGENT})
+            with urllib.request.urlopen(request, timeout=timeout) as response:
+                response.read()
+                status, retry_after = response.status, None
+        except urllib.error.HTTPError as e:
+            status, retry_after = e.code, e.headers.get('Retry-After')
+        except OSError as e:
+            status, retry_after = type(e).__name__, None
+        return status, time.perf_counter() - start, retry_after
+
+    def report(self, results, duration):
+        def ms(values, quantile):
+            if not values:
+                return f"{'-':>9}"
+            values = sorted(values)
+            return f"{values[min(len(values) - 1, int(len(values) * quantile))] * 1000:>9.1f}"
+
+        self.stdout.write(f"{'url':<40}{'requests':>9}{'p50 ms':>9}{'p95 ms':>9}  statuses")
+        totals = Counter()
+        for url, samples in sorted(results.items()):
+            statuses = Counter(status for status, _, _ in samples)
+            totals.update(statuses)
+            served = [seconds for status, seconds, _ in samples if status == 200]
+            self.stdout.write(
+                f"{url[:39]:<40}{len(samples):>9}{ms(served, 0.5)}{ms(served, 0.95)}  "
+                + ', '.join(f'{status}: {count}' for status, count in sorted(statuses.items(), key=str))
+            )
+
+        total = sum(totals.values())
+        shed = [s for samples in results.values() for s in samples if s[0] == 503]
+        self.stdout.write(f"{total} requests in {duration:.0f}s ({total / duration:.1f}/s), {len(shed)} shed with 503")
+        retry_afters = [int(r) for _, _, r in shed if r and r.isdigit()]
+        if retry_afters:
+            self.stdout.write(f"Retry-After: median {statistics.median(retry_afters):.0f}s")
+        if shed:
+            self.stdout.write(self.style.WARNING(f"{len(shed) / total:.1%} of requests were shed"))
+        else:
+            self.stdout.write(self.style.SUCCESS('No requests were shed'))
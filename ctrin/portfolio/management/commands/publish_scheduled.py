@@ -0,0 +1,14 @@
+from django.core.management.base import BaseCommand
+
+from portfolio.publishing import run_schedule
+
+
+class Command(BaseCommand):
+    help = 'Publish and unpublish scheduled projects and posts, pre-rendering their pages (run every minute)'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--batch-size', type=int, default=50)
+
+    def handle(self, *args, **options):
+        for model, (published, unpublished) in run_schedule(options['batch_size']).items():
+            self.stdout.write(f"{model._meta.verbose_name_plural}: {published} published, {unpublished} unpublished")
@@ -0,0 +1,14 @@
+from django.core.management.base import BaseCommand
+
+from portfolio.related import ProjectRelatedIndex, BlogPostRelatedIndex
+
+
+class Command(BaseCommand):
+    help = 'Recompute the related projects and related blog posts tables from scratch'
+
+    def handle(self, *args, **options):
+        for index in (ProjectRelatedIndex(), BlogPostRelatedIndex()):
+            count = index.rebuild()
+            self.stdout.write(self.style.SUCCESS(
+                f"{index.model._meta.verbose_name_plural.capitalize()}: {count} related links"
+            ))
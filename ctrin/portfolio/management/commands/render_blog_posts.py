@@ -0,0 +1,30 @@
+from django.core.management.base import BaseCommand
+from django.urls import reverse
+
+from portfolio.cache import invalidate_urls
+from portfolio.models import BlogPost
+from portfolio.warming import blog_detail_urls, blog_list_urls
+
+RENDERED_FIELDS = ['content_html', 'auto_excerpt', 'word_count', 'reading_time']
+
+
+class Command(BaseCommand):
+    help = 'Pre-render HTML, word count, reading time and excerpts for existing blog posts'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--batch-size', type=int, default=200)
+
+    def handle(self, *args, **options):
+        batch_size = options['batch_size']
+        batch = []
+        total = 0
+        for post in BlogPost.objects.only('id', 'markup', 'content').iterator(chunk_size=batch_size):
+            post.render_content()
+            batch.append(post)
+            if len(batch) >= batch_size:
+                total += BlogPost.objects.bulk_update(batch, RENDERED_FIELDS)
+                batch = []
+        if batch:
+            total += BlogPost.objects.bulk_update(batch, RENDERED_FIELDS)
+        invalidate_urls([reverse('portfolio:home')] + blog_list_urls() + blog_detail_urls())
+        self.stdout.write(self.style.SUCCESS(f"Rendered {total} blog posts"))
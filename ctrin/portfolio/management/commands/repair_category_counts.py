@@ -0,0 +1,13 @@
+from django.core.management.base import BaseCommand
+
+from portfolio.counts import recount_categories
+
+
+class Command(BaseCommand):
+    help = 'Recompute the stored project counts of every category'
+
+    def handle(self, *args, **options):
+        changed = recount_categories()
+        for category in changed:
+            self.stdout.write(f"{category.name}: {category.project_count} projects, {category.featured_count} featured")
+        self.stdout.write(self.style.SUCCESS(f"{len(changed)} categories repaired"))
@@ -0,0 +1,22 @@
+from django.core.management.base import BaseCommand
+from django.urls import reverse
+
+from portfolio.analytics import update_popularity, view_counter
+from portfolio.cache import invalidate_urls
+from portfolio.warming import blog_detail_urls
+
+
+class Command(BaseCommand):
+    help = 'Recompute time-decayed popularity scores from the daily view stats (run periodically, e.g. hourly)'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--half-life', type=int, help='Days for a view to lose half its weight')
+        parser.add_argument('--window', type=int, help='Only consider views from the last N days')
+
+    def handle(self, *args, **options):
+        view_counter.flush()
+        changed = update_popularity(options['half_life'], options['window'])
+        if changed:
+            # Popular lists live on the home page and blog sidebars
+            invalidate_urls([reverse('portfolio:home')] + blog_detail_urls())
+        self.stdout.write(self.style.SUCCESS(f"Updated popularity for {changed} items"))
@@ -0,0 +1,46 @@
+from django.apps import apps
+from django.core.management.base import BaseCommand, CommandError
+
+from portfolio.cache import invalidate_urls
+from portfolio.warming import public_urls, urls_for_instance, warm_urls
+
+
+class Command(BaseCommand):
+    help = 'Fetch every public page (or the pages affected by one object) to fill the page cache'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--concurrency', type=int, default=4, help='Number of pages fetched at once')
+        parser.add_argument('--base-url', help='Warm a running server, e.g. http://127.0.0.1:8000, instead of in-process')
+        parser.add_argument('--model', help='Incremental mode: model label such as portfolio.project')
+        parser.add_argument('--pk', help='Incremental mode: primary key of the changed object')
+        parser.add_argument('--refresh', action='store_true', help='Drop cached copies before fetching')
+
+    def handle(self, *args, **options):
+        if options['model'] or options['pk']:
+            urls = self.urls_for_object(options['model'], options['pk'])
+        else:
+            urls = public_urls()
+
+        if options['refresh']:
+            invalidate_urls(urls)
+
+        results = warm_urls(urls, concurrency=options['concurrency'], base_url=options['base_url'])
+        total = 0
+        for url, status, seconds in results:
+            total += seconds
+            style = self.style.SUCCESS if status == 200 else self.style.WARNING
+            self.stdout.write(style(f"{status}  {seconds * 1000:8.1f} ms  {url}"))
+        self.stdout.write(f"Warmed {len(results)} URLs in {total:.2f}s of request time")
+
+    def urls_for_object(self, label, pk):
+        if not (label and pk):
+            raise CommandError('--model and --pk must be given together')
+        try:
+            model = apps.get_model(label)
+        except (LookupError, ValueError):
+            raise CommandError(f"Unknown model '{label}'")
+        try:
+            instance = model.objects.get(pk=pk)
+        except model.DoesNotExist:
+            raise CommandError(f"{model.__name__} {pk} does not exist")
+        return urls_for_instance(instance)
@@ -0,0 +1,48 @@
+import math
+
+from django.core.exceptions import ImproperlyConfigured
+from django.utils.html import linebreaks, strip_tags
+from django.utils.text import Truncator
+
+MARKUP_PLAIN = 'plain'
+MARKUP_MARKDOWN = 'markdown'
+MARKUP_HTML = 'html'
+
+MARKUP_CHOICES = [
+    (MARKUP_PLAIN, 'Plain text'),
+    (MARKUP_MARKDOWN, 'Markdown'),
+    (MARKUP_HTML, 'Rich text (HTML)'),
+]
+
+WORDS_PER_MINUTE = 200
+EXCERPT_WORDS = 40
+
+
+def sanitize_html(html):
+    try:
+        import nh3
+    except ImportError:
+        raise ImproperlyConfigured("Rich text blog posts require the 'nh3' package")
+    return nh3.clean(html)
+
+
+def render_markup(text, markup):
+    """Render blog content to sanitized HTML"""
+    if markup == MARKUP_MARKDOWN:
+        try:
+            import markdown
+        except ImportError:
+            raise ImproperlyConfigured("Markdown blog posts require the 'Markdown' package")
+        return sanitize_html(markdown.markdown(text, extensions=['extra', 'sane_lists']))
+    if markup == MARKUP_HTML:
+        return sanitize_html(text)
+    return linebreaks(text, autoescape=True)
+
+
+def text_stats(html, max_length):
+    """Word count, reading time in minutes and a plain-text excerpt for rendered HTML"""
+    text = ' '.join(strip_tags(html).split())
+    word_count = len(text.split())
+    reading_time = max(1, math.ceil(word_count / WORDS_PER_MINUTE)) if word_count else 0
+    excerpt = Truncator(Truncator(text).words(EXCERPT_WORDS)).chars(max_length)
+    return word_count, reading_time, excerpt
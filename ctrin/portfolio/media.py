@@ -0,0 +1,65 @@
+from collections import Counter
+
+from django.apps import apps
+from django.db import models
+from django.db.models import F
+from django.db.models.functions import Greatest
+
+from .models import MediaBlob
+from .storage import ContentAddressedStorage
+
+
+def blob_fields(model):
+    """File fields of ``model`` kept in a content-addressed storage"""
+    return [
+        field for field in model._meta.concrete_fields
+        if isinstance(field, models.FileField) and isinstance(field.storage, ContentAddressedStorage)
+    ]
+
+
+def models_with_blobs():
+    return [model for model in apps.get_app_config('portfolio').get_models() if blob_fields(model)]
+
+
+def _blob_names(fields, values):
+    return Counter(
+        str(value) for field, value in zip(fields, values)
+        if value and field.storage.is_blob(str(value))
+    )
+
+
+def instance_blobs(instance):
+    """Counter of the blob names ``instance`` refers to"""
+    fields = blob_fields(type(instance))
+    return _blob_names(fields, [getattr(instance, field.attname) for field in fields])
+
+
+def stored_blobs(model, pk):
+    """Counter of the blob names saved in the database for row ``pk``"""
+    fields = blob_fields(model)
+    row = model.objects.filter(pk=pk).values_list(*(f.attname for f in fields)).first() if pk else None
+    return _blob_names(fields, row or ())
+
+
+def change_references(storage, counts, delta):
+    """Add ``delta`` references for each ``name -> count`` in ``counts``"""
+    for name, count in counts.items():
+        if delta > 0:
+            try:
+                size = storage.size(name)
+            except OSError:
+                size = 0
+            MediaBlob.objects.get_or_create(name=name, defaults={'size': size})
+            MediaBlob.objects.filter(name=name).update(ref_count=F('ref_count') + count)
+        else:
+            MediaBlob.objects.filter(name=name).update(ref_count=Greatest(F('ref_count') - count, 0))
+
+
+def referenced_blobs():
+    """Counter of every blob name referenced by any model (the GC mark phase)"""
+    counts = Counter()
+    for model in models_with_blobs():
+        for field in blob_fields(model):
+            names = model.objects.exclude(**{field.attname: ''}).values_list(field.attname, flat=True)
+            counts.update(name for name in names.iterator() if field.storage.is_blob(name))
+    return counts
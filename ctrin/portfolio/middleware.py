@@ -0,0 +1,298 @@
+import mimetypes
+import os
+import re
+import time
+
+from django.conf import settings
+from django.contrib.sessions.middleware import SessionMiddleware
+from django.db import DatabaseError, connection
+from django.http import FileResponse
+from django.middleware.csrf import CsrfViewMiddleware
+from django.urls import Resolver404, resolve, reverse
+from django.utils.cache import patch_vary_headers
+
+from .notfound import SCANNER_PATH_RE, SLUG_ROUTES, appends_slash, not_found_response
+from .compression import ENCODERS, is_html, minify_content, negotiate
+from .hints import add_links, links_for_view
+from .cache import get_stale_page, has_cached_page, has_stale_page, is_cacheable_request, request_cache_key
+from .loadshed import PRIORITY_CLASSES, AdaptiveLimit, request_queue_time, service_unavailable
+from .resilience import QueryBudget, Revalidator
+from .storage import MIN_COMPRESS_SIZE, ContentAddressedStorage
+
+HASHED_NAME_RE = re.compile(r'\.[0-9a-f]{12}\.[^/.]+$')
+IMMUTABLE_MAX_AGE = 60 * 60 * 24 * 365
+
+
+class StaticAssetsMiddleware:
+    """Serve collected static files with their pre-compressed siblings
+
+    Content-hashed names are cached forever (``immutable``); anything else
+    gets a short max-age. Only files under STATIC_ROOT are served, so the
+    development static view keeps working when nothing has been collected.
+    Content-addressed media blobs under ``MEDIA_URL/cas/`` are served the
+    same way, since their names change whenever their bytes do.
+    """
+    ENCODINGS = (('br', '.br'), ('gzip', '.gz'))
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+        self.static_url = settings.STATIC_URL
+        self.static_root = os.path.realpath(settings.STATIC_ROOT)
+        self.blob_url = f'{settings.MEDIA_URL}{ContentAddressedStorage.prefix}/'
+        self.media_root = os.path.realpath(settings.MEDIA_ROOT)
+
+    def __call__(self, request):
+        if request.method in ('GET', 'HEAD'):
+            response = None
+            if request.path.startswith(self.static_url):
+                name = request.path[len(self.static_url):]
+                response = self.serve(request, self.static_root, name, bool(HASHED_NAME_RE.search(name)))
+            elif request.path.startswith(self.blob_url):
+                response = self.serve(request, self.media_root, request.path[len(settings.MEDIA_URL):], True)
+            if response is not None:
+                return response
+        return self.get_response(request)
+
+    def serve(self, request, root, name, immutable):
+        path = os.path.realpath(os.path.join(root, name))
+        if not path.startswith(root + os.sep) or not os.path.isfile(path):
+            return None
+
+        content_type, _ = mimetypes.guess_type(path)
+        accepted = request.headers.get('Accept-Encoding', '')
+        encoding = None
+        for candidate, suffix in self.ENCODINGS:
+            if candidate in accepted and os.path.isfile(path + suffix):
+                path, encoding = path + suffix, candidate
+                break
+
+        response = FileResponse(open(path, 'rb'), content_type=content_type or 'application/octet-stream')
+        del response['Content-Disposition']
+        if encoding:
+            response['Content-Encoding'] = encoding
+        patch_vary_headers(response, ('Accept-Encoding',))
+        if immutable:
+            response['Cache-Control'] = f'public, max-age={IMMUTABLE_MAX_AGE}, immutable'
+        else:
+            response['Cache-Control'] = 'public, max-age=60'
+        return response
+
+
+class DegradedModeMiddleware:
+    """Keep public pages up when the database fails or is too slow
+
+    Anonymous GET requests run under a query time budget. When a view
+    raises a database error, or spends more than QUERY_TIME_BUDGET seconds
+    in queries, the last good copy of the page is served with
+    ``X-Page-Cache: stale`` and an ``Age`` header, and the page is
+    re-rendered in the background once the database is back.
+    """
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+        self.revalidator = Revalidator(settings.REVALIDATE_INTERVAL)
+
+    def __call__(self, request):
+        if not settings.QUERY_TIME_BUDGET or not is_cacheable_request(request):
+            return self.get_response(request)
+        key = request_cache_key(request)
+        with connection.execute_wrapper(QueryBudget(settings.QUERY_TIME_BUDGET, lambda: has_stale_page(key))):
+            return self.get_response(request)
+
+    def process_exception(self, request, exception):
+        if not isinstance(exception, DatabaseError) or not is_cacheable_request(request):
+            return None
+        response = get_stale_page(request_cache_key(request))
+        if response is not None:
+            self.revalidator.schedule(request.get_full_path())
+        return response
+
+
+class NotFoundFastPathMiddleware:
+    """Answer requests that can only 404 before sessions, auth or any view run
+
+    Covers scanner probes, paths the URL resolver cannot match (unless
+    APPEND_SLASH would redirect them) and project or blog slugs missing
+    from the in-memory slug sets. The response is the cached 404 page, and
+    every 404 path is counted. Disabled under DEBUG to keep Django's
+    technical 404 page.
+    """
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+
+    def __call__(self, request):
+        if not settings.DEBUG and self.is_not_found(request.path_info):
+            return not_found_response(request)
+        return self.get_response(request)
+
+    def is_not_found(self, path):
+        if SCANNER_PATH_RE.search(path):
+            return True
+        try:
+            match = resolve(path)
+        except Resolver404:
+            return not appends_slash(path)
+        slugs = SLUG_ROUTES.get(match.url_name) if match.namespace == 'portfolio' else None
+        return slugs is not None and match.kwargs.get('slug') not in slugs
+
+
+class LoadSheddingMiddleware:
+    """Bound the work each worker accepts per route class and shed the excess fast
+
+    Requests are classed as ``admin``, ``cached`` (a page cache hit),
+    ``write`` (POST and friends, e.g. the contact form) or ``dynamic``.
+    The last two run under their own adaptive concurrency limit, so slow
+    SMTP sends or deep list pages cannot take every thread. A request that
+    waited longer than LOADSHED_QUEUE_THRESHOLD in the proxy queue, or
+    LOADSHED_QUEUE_TIMEOUT for a slot, gets the stale copy of its page if
+    there is one and a 503 with ``Retry-After`` otherwise.
+    """
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+        self.admin_prefix = reverse('admin:index')
+        self.limits = {
+            name: AdaptiveLimit(
+                name, settings.LOADSHED_INITIAL_LIMIT, settings.LOADSHED_MAX_LIMIT, settings.LOADSHED_TARGET_LATENCY,
+            )
+            for name in ('write', 'dynamic')
+        }
+
+    def __call__(self, request):
+        if not settings.LOADSHED_ENABLED:
+            return self.get_response(request)
+        route_class = self.route_class(request)
+        if route_class in PRIORITY_CLASSES:
+            return self.get_response(request)
+
+        queued = request_queue_time(request)
+        if queued is not None and queued > settings.LOADSHED_QUEUE_THRESHOLD:
+            return self.shed(request)
+        limit = self.limits[route_class]
+        if not limit.acquire(settings.LOADSHED_QUEUE_TIMEOUT):
+            return self.shed(request)
+        start = time.monotonic()
+        try:
+            return self.get_response(request)
+        finally:
+            limit.release(time.monotonic() - start)
+
+    def route_class(self, request):
+        if request.path_info.startswith(self.admin_prefix):
+            return 'admin'
+        if request.method not in ('GET', 'HEAD', 'OPTIONS'):
+            return 'write'
+        if is_cacheable_request(request) and has_cached_page(request_cache_key(request)):
+            return 'cached'
+        return 'dynamic'
+
+    def shed(self, request):
+        response = get_stale_page(request_cache_key(request)) if is_cacheable_request(request) else None
+        return response or service_unavailable(settings.LOADSHED_RETRY_AFTER)
+
+
+class PreloadHintsMiddleware:
+    """Send ``Link`` preload/preconnect headers for a page's critical assets
+
+    The asset list comes from static analysis of the view's template chain
+    and is cached per URL name, so it is known before the view runs. A
+    CDN or proxy with Early Hints support can turn these headers into a
+    ``103 Early Hints`` response.
+    """
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+
+    def __call__(self, request):
+        response = self.get_response(request)
+        links = getattr(request, 'preload_links', None)
+        if links and response.get('Content-Type', '').startswith('text/html') and response.status_code == 200:
+            add_links(response, links)
+        return response
+
+    def process_view(self, request, view_func, view_args, view_kwargs):
+        match = request.resolver_match
+        request.preload_links = links_for_view(match.view_name, getattr(view_func, 'view_class', None))
+
+
+class HtmlCompressionMiddleware:
+    """Minify HTML responses and compress them with the best coding the client accepts
+
+    Pages from the page cache arrive minified with their encoded bodies
+    (``encoded_bodies``), so a hit costs no minification or compression.
+    Other HTML is minified and compressed per response at a faster level,
+    except pages carrying a CSRF token, which are not compressed (BREACH).
+    """
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+
+    def __call__(self, request):
+        response = self.get_response(request)
+        if response.streaming or response.has_header('Content-Encoding') or not is_html(response):
+            return response
+
+        encoded = getattr(response, 'encoded_bodies', None)
+        if encoded is None:
+            response.content = minify_content(response.content, response.charset)
+            encoded = {}
+        patch_vary_headers(response, ('Accept-Encoding',))
+
+        coding = negotiate(request.headers.get('Accept-Encoding', '')) if settings.HTML_COMPRESS else None
+        if coding in encoded:
+            body = encoded[coding]
+        elif coding and len(response.content) >= MIN_COMPRESS_SIZE and b'csrfmiddlewaretoken' not in response.content:
+            body = ENCODERS[coding](response.content, False)
+        else:
+            body = None
+        if body is not None and len(body) < len(response.content):
+            response.content = body
+            response['Content-Encoding'] = coding
+            etag = response.get('ETag')
+            if etag and etag.startswith('"'):
+                response['ETag'] = 'W/' + etag
+        if response.has_header('Content-Length'):
+            response['Content-Length'] = str(len(response.content))
+        return response
+
+
+class AnonymousSessionMiddleware(SessionMiddleware):
+    """Session middleware that leaves cookie-less requests without session side effects
+
+    A request without a session cookie starts with an empty session, which
+    costs no lookup. If the response leaves it empty, nothing is saved and
+    no ``Vary: Cookie`` is added, so public pages stay shareable.
+    """
+
+    def process_response(self, request, response):
+        session = getattr(request, 'session', None)
+        if (
+            session is not None
+            and settings.SESSION_COOKIE_NAME not in request.COOKIES
+            and not session.modified
+            and session.is_empty()
+        ):
+            return response
+        return super().process_response(request, response)
+
+
+class ScopedCsrfViewMiddleware(CsrfViewMiddleware):
+    """Scope the CSRF cookie to the pages with forms: the contact page and the admin
+
+    The cookie is only sent back where it is needed, so it never turns a
+    request for a public page into a cookie-bearing one.
+    """
+
+    def __init__(self, get_response):
+        super().__init__(get_response)
+        self.scopes = (reverse('portfolio:contact'), reverse('admin:index'))
+
+    def process_response(self, request, response):
+        response = super().process_response(request, response)
+        cookie = response.cookies.get(settings.CSRF_COOKIE_NAME)
+        if cookie is not None:
+            cookie['path'] = next(
+                (scope for scope in self.scopes if request.path.startswith(scope)), settings.CSRF_COOKIE_PATH,
+            )
+        return response
@@ -0,0 +1,41 @@
+# Generated by Django 4.2.7 on 2026-10-19 07:13
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('portfolio', '0005_alter_sitesettings_site_name'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='blogpost',
+            name='popularity',
+            field=models.FloatField(db_index=True, default=0, editable=False, help_text='Time-decayed view score'),
+        ),
+        migrations.AddField(
+            model_name='project',
+            name='popularity',
+            field=models.FloatField(db_index=True, default=0, editable=False, help_text='Time-decayed view score'),
+        ),
+        migrations.CreateModel(
+            name='DailyViewStat',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('kind', models.CharField(choices=[('project', 'Project'), ('blog', 'Blog post')], max_length=20)),
+                ('object_id', models.PositiveIntegerField()),
+                ('date', models.DateField()),
+                ('views', models.PositiveIntegerField(default=0)),
+            ],
+            options={
+                'ordering': ['-date', '-views'],
+                'indexes': [models.Index(fields=['kind', 'date'], name='viewstat_kind_date_idx')],
+            },
+        ),
+        migrations.AddConstraint(
+            model_name='dailyviewstat',
+            constraint=models.UniqueConstraint(fields=('kind', 'object_id', 'date'), name='unique_daily_view_stat'),
+        ),
+    ]
@@ -0,0 +1,38 @@
+# Generated by Django 4.2.7 on 2026-10-19 07:14
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('portfolio', '0006_view_stats_popularity'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='blogpost',
+            name='auto_excerpt',
+            field=models.CharField(blank=True, editable=False, max_length=300),
+        ),
+        migrations.AddField(
+            model_name='blogpost',
+            name='content_html',
+            field=models.TextField(blank=True, editable=False),
+        ),
+        migrations.AddField(
+            model_name='blogpost',
+            name='markup',
+            field=models.CharField(choices=[('plain', 'Plain text'), ('markdown', 'Markdown'), ('html', 'Rich text (HTML)')], default='plain', max_length=20),
+        ),
+        migrations.AddField(
+            model_name='blogpost',
+            name='reading_time',
+            field=models.PositiveIntegerField(default=0, editable=False, help_text='Minutes'),
+        ),
+        migrations.AddField(
+            model_name='blogpost',
+            name='word_count',
+            field=models.PositiveIntegerField(default=0, editable=False),
+        ),
+    ]
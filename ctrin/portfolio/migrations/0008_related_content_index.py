@@ -0,0 +1,53 @@
+# Generated by Django 4.2.7 on 2026-10-19 07:15
+
+from django.db import migrations, models
+import django.db.models.deletion
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('portfolio', '0007_blogpost_prerendered_content'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='RelatedBlogPost',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('score', models.FloatField()),
+                ('rank', models.PositiveSmallIntegerField()),
+                ('source', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='related_links', to='portfolio.blogpost')),
+                ('target', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='linked_from', to='portfolio.blogpost')),
+            ],
+            options={
+                'ordering': ['source', 'rank'],
+            },
+        ),
+        migrations.CreateModel(
+            name='RelatedProject',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('score', models.FloatField()),
+                ('rank', models.PositiveSmallIntegerField()),
+                ('source', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='related_links', to='portfolio.project')),
+                ('target', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='linked_from', to='portfolio.project')),
+            ],
+            options={
+                'ordering': ['source', 'rank'],
+                'indexes': [models.Index(fields=['source', 'rank'], name='relatedproject_rank_idx')],
+            },
+        ),
+        migrations.AddConstraint(
+            model_name='relatedproject',
+            constraint=models.UniqueConstraint(fields=('source', 'target'), name='unique_related_project'),
+        ),
+        migrations.AddIndex(
+            model_name='relatedblogpost',
+            index=models.Index(fields=['source', 'rank'], name='relatedblogpost_rank_idx'),
+        ),
+        migrations.AddConstraint(
+            model_name='relatedblogpost',
+            constraint=models.UniqueConstraint(fields=('source', 'target'), name='unique_related_blogpost'),
+        ),
+    ]
@@ -0,0 +1,103 @@
+# Generated by Django 4.2.7 on 2026-10-19 07:20
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('portfolio', '0008_related_content_index'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='blogpost',
+            name='featured_image_height',
+            field=models.PositiveIntegerField(blank=True, editable=False, null=True),
+        ),
+        migrations.AddField(
+            model_name='blogpost',
+            name='featured_image_width',
+            field=models.PositiveIntegerField(blank=True, editable=False, null=True),
+        ),
+        migrations.AddField(
+            model_name='project',
+            name='featured_image_height',
+            field=models.PositiveIntegerField(blank=True, editable=False, null=True),
+        ),
+        migrations.AddField(
+            model_name='project',
+            name='featured_image_width',
+            field=models.PositiveIntegerField(blank=True, editable=False, null=True),
+        ),
+        migrations.AddField(
+            model_name='projectimage',
+            name='image_height',
+            field=models.PositiveIntegerField(blank=True, editable=False, null=True),
+        ),
+        migrations.AddField(
+            model_name='projectimage',
+            name='image_width',
+            field=models.PositiveIntegerField(blank=True, editable=False, null=True),
+        ),
+        migrations.AddField(
+            model_name='service',
+            name='image_height',
+            field=models.PositiveIntegerField(blank=True, editable=False, null=True),
+        ),
+        migrations.AddField(
+            model_name='service',
+            name='image_width',
+            field=models.PositiveIntegerField(blank=True, editable=False, null=True),
+        ),
+        migrations.AddField(
+            model_name='teammember',
+            name='image_height',
+            field=models.PositiveIntegerField(blank=True, editable=False, null=True),
+        ),
+        migrations.AddField(
+            model_name='teammember',
+            name='image_width',
+            field=models.PositiveIntegerField(blank=True, editable=False, null=True),
+        ),
+        migrations.AddField(
+            model_name='testimonial',
+            name='client_image_height',
+            field=models.PositiveIntegerField(blank=True, editable=False, null=True),
+        ),
+        migrations.AddField(
+            model_name='testimonial',
+            name='client_image_width',
+            field=models.PositiveIntegerField(blank=True, editable=False, null=True),
+        ),
+        migrations.AlterField(
+            model_name='blogpost',
+            name='featured_image',
+            field=models.ImageField(height_field='featured_image_height', upload_to='blog/', width_field='featured_image_width'),
+        ),
+        migrations.AlterField(
+            model_name='project',
+            name='featured_image',
+            field=models.ImageField(height_field='featured_image_height', upload_to='projects/', width_field='featured_image_width'),
+        ),
+        migrations.AlterField(
+            model_name='projectimage',
+            name='image',
+            field=models.ImageField(height_field='image_height', upload_to='projects/', width_field='image_width'),
+        ),
+        migrations.AlterField(
+            model_name='service',
+            name='image',
+            field=models.ImageField(blank=True, height_field='image_height', upload_to='services/', width_field='image_width'),
+        ),
+        migrations.AlterField(
+            model_name='teammember',
+            name='image',
+            field=models.ImageField(height_field='image_height', upload_to='team/', width_field='image_width'),
+        ),
+        migrations.AlterField(
+            model_name='testimonial',
+            name='client_image',
+            field=models.ImageField(blank=True, height_field='client_image_height', upload_to='testimonials/', width_field='client_image_width'),
+        ),
+    ]
@@ -0,0 +1,25 @@
+# Generated by Django 4.2.7 on 2026-10-19 07:28
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('portfolio', '0011_media_blobs'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='NotFoundStat',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('path', models.CharField(max_length=255, unique=True)),
+                ('hits', models.PositiveIntegerField(default=0)),
+                ('last_seen', models.DateTimeField()),
+            ],
+            options={
+                'ordering': ['-hits'],
+            },
+        ),
+    ]
@@ -0,0 +1,46 @@
+# Generated by Django 4.2.7 on 2026-10-19 07:30
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('portfolio', '0012_not_found_stats'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='blogpost',
+            name='publish_at',
+            field=models.DateTimeField(blank=True, help_text='Leave empty to publish by hand. When set, the item goes live at this time', null=True),
+        ),
+        migrations.AddField(
+            model_name='blogpost',
+            name='unpublish_at',
+            field=models.DateTimeField(blank=True, help_text='Optional time at which the item is taken down again', null=True),
+        ),
+        migrations.AddField(
+            model_name='project',
+            name='is_published',
+            field=models.BooleanField(default=True),
+        ),
+        migrations.AddField(
+            model_name='project',
+            name='publish_at',
+            field=models.DateTimeField(blank=True, help_text='Leave empty to publish by hand. When set, the item goes live at this time', null=True),
+        ),
+        migrations.AddField(
+            model_name='project',
+            name='unpublish_at',
+            field=models.DateTimeField(blank=True, help_text='Optional time at which the item is taken down again', null=True),
+        ),
+        migrations.AddIndex(
+            model_name='blogpost',
+            index=models.Index(fields=['is_published', 'publish_at'], name='blogpost_publish_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='project',
+            index=models.Index(fields=['is_published', 'publish_at'], name='project_publish_idx'),
+        ),
+    ]
@@ -0,0 +1,37 @@
+# Generated by Django 4.2.7 on 2026-10-19 07:36
+
+from django.db import migrations, models
+from django.db.models import Count, Q
+
+
+def count_projects(apps, schema_editor):
+    Category = apps.get_model('portfolio', 'Category')
+    published = Q(projects__is_published=True)
+    categories = Category.objects.annotate(
+        published=Count('projects', filter=published),
+        featured=Count('projects', filter=published & Q(projects__is_featured=True)),
+    )
+    for category in categories:
+        category.project_count, category.featured_count = category.published, category.featured
+    Category.objects.bulk_update(categories, ['project_count', 'featured_count'])
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('portfolio', '0014_public_query_indexes'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='category',
+            name='featured_count',
+            field=models.PositiveIntegerField(default=0, editable=False, help_text='Published featured projects'),
+        ),
+        migrations.AddField(
+            model_name='category',
+            name='project_count',
+            field=models.PositiveIntegerField(default=0, editable=False, help_text='Published projects'),
+        ),
+        migrations.RunPython(count_projects, migrations.RunPython.noop),
+    ]
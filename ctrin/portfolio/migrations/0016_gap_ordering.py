@@ -0,0 +1,31 @@
+from django.db import migrations
+
+ORDER_GAP = 1024
+
+
+def renumber(queryset, model):
+    rows = []
+    for index, pk in enumerate(queryset.order_by('order', 'pk').values_list('pk', flat=True)):
+        rows.append(model(pk=pk, order=(index + 1) * ORDER_GAP))
+    model.objects.bulk_update(rows, ['order'], batch_size=500)
+
+
+def spread_orders(apps, schema_editor):
+    """Leave ORDER_GAP between neighbouring order values, keeping the current sequence"""
+    for name in ('Service', 'TeamMember', 'Testimonial'):
+        model = apps.get_model('portfolio', name)
+        renumber(model.objects.all(), model)
+    ProjectImage = apps.get_model('portfolio', 'ProjectImage')
+    for project_id in ProjectImage.objects.order_by().values_list('project_id', flat=True).distinct():
+        renumber(ProjectImage.objects.filter(project_id=project_id), ProjectImage)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('portfolio', '0015_category_project_counts'),
+    ]
+
+    operations = [
+        migrations.RunPython(spread_orders, migrations.RunPython.noop),
+    ]
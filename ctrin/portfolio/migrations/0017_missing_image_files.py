@@ -0,0 +1,44 @@
+# Generated by Django 4.2.7 on 2026-10-19 08:01
+
+from django.db import migrations
+import portfolio.images
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('portfolio', '0016_gap_ordering'),
+    ]
+
+    operations = [
+        migrations.AlterField(
+            model_name='blogpost',
+            name='featured_image',
+            field=portfolio.images.DimensionedImageField(height_field='featured_image_height', upload_to='blog/', width_field='featured_image_width'),
+        ),
+        migrations.AlterField(
+            model_name='project',
+            name='featured_image',
+            field=portfolio.images.DimensionedImageField(height_field='featured_image_height', upload_to='projects/', width_field='featured_image_width'),
+        ),
+        migrations.AlterField(
+            model_name='projectimage',
+            name='image',
+            field=portfolio.images.DimensionedImageField(height_field='image_height', upload_to='projects/', width_field='image_width'),
+        ),
+        migrations.AlterField(
+            model_name='service',
+            name='image',
+            field=portfolio.images.DimensionedImageField(blank=True, height_field='image_height', upload_to='services/', width_field='image_width'),
+        ),
+        migrations.AlterField(
+            model_name='teammember',
+            name='image',
+            field=portfolio.images.DimensionedImageField(height_field='image_height', upload_to='team/', width_field='image_width'),
+        ),
+        migrations.AlterField(
+            model_name='testimonial',
+            name='client_image',
+            field=portfolio.images.DimensionedImageField(blank=True, height_field='client_image_height', upload_to='testimonials/', width_field='client_image_width'),
+        ),
+    ]
@@ -0,0 +1,18 @@
+# Generated by Django 4.2.7 on 2026-10-19 08:02
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('portfolio', '0017_missing_image_files'),
+    ]
+
+    operations = [
+        migrations.AlterField(
+            model_name='notfoundstat',
+            name='last_seen',
+            field=models.DateTimeField(db_index=True),
+        ),
+    ]
@@ -0,0 +1,56 @@
+import re
+
+# String literals are copied verbatim; everything between them is minified
+CSS_TOKEN_RE = re.compile(r'''("(?:\\.|[^"\\])*"|'(?:\\.|[^'\\])*')''')
+CSS_COMMENT_RE = re.compile(r'/\*(?!!).*?\*/', re.S)
+CSS_SPACE_RE = re.compile(r'\s+')
+CSS_PUNCT_RE = re.compile(r'\s*([{};,>])\s*')
+# Elements whose content is whitespace-sensitive or not HTML, copied verbatim
+HTML_RAW_RE = re.compile(r'(<(pre|textarea|script|style)\b.*?</\2\s*>)', re.S | re.I)
+HTML_COMMENT_RE = re.compile(r'<!--(?!\[if|<!|>).*?-->', re.S)
+HTML_LINE_SPACE_RE = re.compile(r'[ \t\r\f\v]*\n\s*')
+
+
+def minify_css(css):
+    """Strip comments and redundant whitespace, leaving strings untouched"""
+    parts = CSS_TOKEN_RE.split(CSS_COMMENT_RE.sub('', css))
+    for i in range(0, len(parts), 2):
+        code = CSS_SPACE_RE.sub(' ', parts[i])
+        code = CSS_PUNCT_RE.sub(r'\1', code)
+        parts[i] = code.replace(';}', '}')
+    return ''.join(parts).strip()
+
+
+def minify_js(js):
+    """Minify JavaScript with rjsmin, or return it unchanged when that is not installed
+
+    Stripping comments or whitespace safely needs a real tokenizer (regex
+    literals, template strings), so there is no regex fallback.
+    """
+    try:
+        import rjsmin
+    except ImportError:
+        return js
+    return rjsmin.jsmin(js)
+
+
+def minify_html(html):
+    """Drop comments and indentation from rendered HTML
+
+    Runs of whitespace that contain a line break collapse to one newline,
+    which renders identically; ``<pre>``, ``<textarea>``, ``<script>`` and
+    ``<style>`` elements and conditional comments are left untouched.
+    """
+    parts = HTML_RAW_RE.split(html)
+    output = []
+    for i in range(0, len(parts), 3):
+        output.append(HTML_LINE_SPACE_RE.sub('\n', HTML_COMMENT_RE.sub('', parts[i])))
+        if i + 1 < len(parts):
+            output.append(parts[i + 1])
+    return ''.join(output).strip()
+
+
+MINIFIERS = {
+    '.css': minify_css,
+    '.js': minify_js,
+}
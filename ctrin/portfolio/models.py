@@ -1,16 +1,72 @@
 from django.db import models
+from django.db.models import Q
+from django.utils import timezone
 from django.utils.text import slugify
 from django.urls import reverse
 
+from .images import DimensionedImageField, update_placeholder
+from .markup import MARKUP_CHOICES, MARKUP_PLAIN, render_markup, text_stats
+
+PUBLISHED = Q(is_published=True)
+PUBLISH_AT_HELP = "Leave empty to publish by hand. When set, the item goes live at this time"
+UNPUBLISH_AT_HELP = "Optional time at which the item is taken down again"
+
+
+class PublishableQuerySet(models.QuerySet):
+    def published(self):
+        """Publicly visible rows; ``publish_scheduled`` keeps ``is_published`` current"""
+        return self.filter(is_published=True)
+
+    def due_for_publishing(self, now):
+        return self.filter(is_published=False, publish_at__lte=now).filter(
+            Q(unpublish_at__isnull=True) | Q(unpublish_at__gt=now)
+        )
+
+    def due_for_unpublishing(self, now):
+        return self.published().filter(unpublish_at__lte=now)
+
+
+def apply_publishing_window(instance, now=None):
+    """Derive ``is_published`` from the publishing window, unless changed by hand
+
+    Publishing or unpublishing by hand after the window opened or closed
+    clears the date that would undo it, so neither this nor
+    ``publish_scheduled`` flips the item back.
+    """
+    now = now or timezone.now()
+    requested = instance.is_published
+    stored = None
+    if not instance._state.adding:
+        stored = type(instance).objects.filter(pk=instance.pk).values_list('is_published', flat=True).first()
+
+    if instance.publish_at:
+        if instance.publish_at > now:
+            instance.is_published = False
+        elif stored and not requested:
+            instance.publish_at = None
+        else:
+            instance.is_published = True
+    if instance.unpublish_at and instance.unpublish_at <= now:
+        if stored is False and requested:
+            instance.unpublish_at = None
+        else:
+            instance.is_published = False
+
+
 class Category(models.Model):
     """Project categories"""
     name = models.CharField(max_length=100)
     slug = models.SlugField(unique=True, blank=True)
     description = models.TextField(blank=True)
+    project_count = models.PositiveIntegerField(default=0, editable=False, help_text="Published projects")
+    featured_count = models.PositiveIntegerField(default=0, editable=False, help_text="Published featured projects")
     
     class Meta:
         verbose_name_plural = "Categories"
         ordering = ['name']
+        indexes = [
+            models.Index(fields=['name'], name='category_name_idx'),
+        ]
     
     def save(self, *args, **kwargs):
         if not self.slug:
@@ -28,22 +84,44 @@ class Project(models.Model):
     category = models.ForeignKey(Category, on_delete=models.SET_NULL, null=True, related_name='projects')
     description = models.TextField()
     detailed_description = models.TextField(blank=True)
-    featured_image = models.ImageField(upload_to='projects/')
+    featured_image = DimensionedImageField(upload_to='projects/', width_field='featured_image_width', height_field='featured_image_height')
+    featured_image_width = models.PositiveIntegerField(null=True, blank=True, editable=False)
+    featured_image_height = models.PositiveIntegerField(null=True, blank=True, editable=False)
+    featured_image_placeholder = models.TextField(blank=True, editable=False)
     project_date = models.DateField()
     location = models.CharField(max_length=200, blank=True)
     client_name = models.CharField(max_length=200, blank=True)
     budget = models.CharField(max_length=100, blank=True, help_text="e.g., $50,000 - $100,000")
     duration = models.CharField(max_length=100, blank=True, help_text="e.g., 3 months")
     is_featured = models.BooleanField(default=False)
+    is_published = models.BooleanField(default=True)
+    publish_at = models.DateTimeField(null=True, blank=True, help_text=PUBLISH_AT_HELP)
+    unpublish_at = models.DateTimeField(null=True, blank=True, help_text=UNPUBLISH_AT_HELP)
+    popularity = models.FloatField(default=0, db_index=True, editable=False, help_text="Time-decayed view score")
     created_at = models.DateTimeField(auto_now_add=True)
     updated_at = models.DateTimeField(auto_now=True)
     
+    objects = PublishableQuerySet.as_manager()
+    
     class Meta:
         ordering = ['-project_date']
+        indexes = [
+            models.Index(fields=['is_published', 'publish_at'], name='project_publish_idx'),
+            # Partial indexes: the published filter compiles to a bare boolean,
+            # which SQLite can only match against an index condition
+            models.Index(fields=['publish_at'], condition=~PUBLISHED, name='project_due_idx'),
+            models.Index(fields=['unpublish_at'], condition=PUBLISHED, name='project_expiry_idx'),
+            models.Index(fields=['-project_date', '-id'], condition=PUBLISHED, name='project_pub_date_idx'),
+            models.Index(fields=['-project_date'], condition=PUBLISHED & Q(is_featured=True), name='project_featured_idx'),
+            models.Index(fields=['category', '-project_date', '-id'], condition=PUBLISHED, name='project_category_idx'),
+            models.Index(fields=['-popularity'], condition=PUBLISHED, name='project_popular_idx'),
+        ]
     
     def save(self, *args, **kwargs):
         if not self.slug:
             self.slug = slugify(self.title)
+        apply_publishing_window(self)
+        update_placeholder(self, 'featured_image', 'featured_image_placeholder')
         super().save(*args, **kwargs)
     
     def get_absolute_url(self):
@@ -56,12 +134,22 @@ class Project(models.Model):
 class ProjectImage(models.Model):
     """Additional images for a project"""
     project = models.ForeignKey(Project, on_delete=models.CASCADE, related_name='images')
-    image = models.ImageField(upload_to='projects/')
+    image = DimensionedImageField(upload_to='projects/', width_field='image_width', height_field='image_height')
+    image_width = models.PositiveIntegerField(null=True, blank=True, editable=False)
+    image_height = models.PositiveIntegerField(null=True, blank=True, editable=False)
+    image_placeholder = models.TextField(blank=True, editable=False)
     caption = models.CharField(max_length=200, blank=True)
     order = models.PositiveIntegerField(default=0)
     
     class Meta:
         ordering = ['order']
+        indexes = [
+            models.Index(fields=['project', 'order'], name='projectimage_order_idx'),
+        ]
+    
+    def save(self, *args, **kwargs):
+        update_placeholder(self, 'image', 'image_placeholder')
+        super().save(*args, **kwargs)
     
     def __str__(self):
         return f"{self.project.title} - Image {self.order}"
@@ -73,12 +161,17 @@ class Service(models.Model):
     slug = models.SlugField(unique=True, blank=True)
     description = models.TextField()
     icon = models.CharField(max_length=50, blank=True, help_text="Font Awesome icon class, e.g., 'fas fa-paint-brush'")
-    image = models.ImageField(upload_to='services/', blank=True)
+    image = DimensionedImageField(upload_to='services/', blank=True, width_field='image_width', height_field='image_height')
+    image_width = models.PositiveIntegerField(null=True, blank=True, editable=False)
+    image_height = models.PositiveIntegerField(null=True, blank=True, editable=False)
     features = models.TextField(blank=True, help_text="List features separated by commas")
     order = models.PositiveIntegerField(default=0)
     
     class Meta:
         ordering = ['order']
+        indexes = [
+            models.Index(fields=['order'], name='service_order_idx'),
+        ]
     
     def save(self, *args, **kwargs):
         if not self.slug:
@@ -105,7 +198,9 @@ class TeamMember(models.Model):
     name = models.CharField(max_length=200)
     position = models.CharField(max_length=50, choices=POSITION_CHOICES)
     bio = models.TextField(blank=True)
-    image = models.ImageField(upload_to='team/')
+    image = DimensionedImageField(upload_to='team/', width_field='image_width', height_field='image_height')
+    image_width = models.PositiveIntegerField(null=True, blank=True, editable=False)
+    image_height = models.PositiveIntegerField(null=True, blank=True, editable=False)
     email = models.EmailField(blank=True)
     phone = models.CharField(max_length=20, blank=True)
     experience_years = models.PositiveIntegerField(default=0)
@@ -115,6 +210,9 @@ class TeamMember(models.Model):
     
     class Meta:
         ordering = ['order']
+        indexes = [
+            models.Index(fields=['order'], name='teammember_order_idx'),
+        ]
     
     def __str__(self):
         return self.name
@@ -127,13 +225,19 @@ class Testimonial(models.Model):
     client_company = models.CharField(max_length=200, blank=True)
     content = models.TextField()
     rating = models.PositiveIntegerField(default=5, choices=[(i, i) for i in range(1, 6)])
-    client_image = models.ImageField(upload_to='testimonials/', blank=True)
+    client_image = DimensionedImageField(upload_to='testimonials/', blank=True, width_field='client_image_width', height_field='client_image_height')
+    client_image_width = models.PositiveIntegerField(null=True, blank=True, editable=False)
+    client_image_height = models.PositiveIntegerField(null=True, blank=True, editable=False)
     is_featured = models.BooleanField(default=False)
     order = models.PositiveIntegerField(default=0)
     created_at = models.DateTimeField(auto_now_add=True)
     
     class Meta:
         ordering = ['-is_featured', 'order']
+        indexes = [
+            models.Index(fields=['-is_featured', 'order'], name='testimonial_order_idx'),
+            models.Index(fields=['order'], condition=Q(is_featured=True), name='testimonial_featured_idx'),
+        ]
     
     def __str__(self):
         return f"Testimonial by {self.client_name}"
@@ -144,22 +248,51 @@ class BlogPost(models.Model):
     title = models.CharField(max_length=300)
     slug = models.SlugField(unique=True, blank=True)
     author = models.ForeignKey('auth.User', on_delete=models.SET_NULL, null=True)
+    markup = models.CharField(max_length=20, choices=MARKUP_CHOICES, default=MARKUP_PLAIN)
     content = models.TextField()
-    featured_image = models.ImageField(upload_to='blog/')
+    content_html = models.TextField(blank=True, editable=False)
+    featured_image = DimensionedImageField(upload_to='blog/', width_field='featured_image_width', height_field='featured_image_height')
+    featured_image_width = models.PositiveIntegerField(null=True, blank=True, editable=False)
+    featured_image_height = models.PositiveIntegerField(null=True, blank=True, editable=False)
+    featured_image_placeholder = models.TextField(blank=True, editable=False)
     excerpt = models.CharField(max_length=300, blank=True)
+    auto_excerpt = models.CharField(max_length=300, blank=True, editable=False)
+    word_count = models.PositiveIntegerField(default=0, editable=False)
+    reading_time = models.PositiveIntegerField(default=0, editable=False, help_text="Minutes")
     tags = models.CharField(max_length=200, blank=True, help_text="Tags separated by commas")
     is_published = models.BooleanField(default=True)
+    publish_at = models.DateTimeField(null=True, blank=True, help_text=PUBLISH_AT_HELP)
+    unpublish_at = models.DateTimeField(null=True, blank=True, help_text=UNPUBLISH_AT_HELP)
+    popularity = models.FloatField(default=0, db_index=True, editable=False, help_text="Time-decayed view score")
     created_at = models.DateTimeField(auto_now_add=True)
     updated_at = models.DateTimeField(auto_now=True)
     
+    objects = PublishableQuerySet.as_manager()
+    
     class Meta:
         ordering = ['-created_at']
+        indexes = [
+            models.Index(fields=['is_published', 'publish_at'], name='blogpost_publish_idx'),
+            models.Index(fields=['publish_at'], condition=~PUBLISHED, name='blogpost_due_idx'),
+            models.Index(fields=['unpublish_at'], condition=PUBLISHED, name='blogpost_expiry_idx'),
+            models.Index(fields=['-created_at', '-id'], condition=PUBLISHED, name='blogpost_pub_created_idx'),
+            models.Index(fields=['-popularity'], condition=PUBLISHED, name='blogpost_popular_idx'),
+        ]
     
     def save(self, *args, **kwargs):
         if not self.slug:
             self.slug = slugify(self.title)
+        apply_publishing_window(self)
+        self.render_content()
+        update_placeholder(self, 'featured_image', 'featured_image_placeholder')
         super().save(*args, **kwargs)
     
+    def render_content(self):
+        """Pre-render the body and its derived stats so requests never do it"""
+        self.content_html = render_markup(self.content, self.markup)
+        max_length = self._meta.get_field('auto_excerpt').max_length
+        self.word_count, self.reading_time, self.auto_excerpt = text_stats(self.content_html, max_length)
+    
     def get_absolute_url(self):
         return reverse('portfolio:blog_detail', kwargs={'slug': self.slug})
     
@@ -170,6 +303,46 @@ class BlogPost(models.Model):
         return self.title
 
 
+class RelatedProject(models.Model):
+    """Precomputed nearest neighbours of a project, rebuilt by portfolio.related"""
+    source = models.ForeignKey(Project, on_delete=models.CASCADE, related_name='related_links')
+    target = models.ForeignKey(Project, on_delete=models.CASCADE, related_name='linked_from')
+    score = models.FloatField()
+    rank = models.PositiveSmallIntegerField()
+
+    class Meta:
+        ordering = ['source', 'rank']
+        constraints = [
+            models.UniqueConstraint(fields=['source', 'target'], name='unique_related_project'),
+        ]
+        indexes = [
+            models.Index(fields=['source', 'rank'], name='relatedproject_rank_idx'),
+        ]
+
+    def __str__(self):
+        return f"{self.source_id} -> {self.target_id} ({self.score:.3f})"
+
+
+class RelatedBlogPost(models.Model):
+    """Precomputed nearest neighbours of a blog post, rebuilt by portfolio.related"""
+    source = models.ForeignKey(BlogPost, on_delete=models.CASCADE, related_name='related_links')
+    target = models.ForeignKey(BlogPost, on_delete=models.CASCADE, related_name='linked_from')
+    score = models.FloatField()
+    rank = models.PositiveSmallIntegerField()
+
+    class Meta:
+        ordering = ['source', 'rank']
+        constraints = [
+            models.UniqueConstraint(fields=['source', 'target'], name='unique_related_blogpost'),
+        ]
+        indexes = [
+            models.Index(fields=['source', 'rank'], name='relatedblogpost_rank_idx'),
+        ]
+
+    def __str__(self):
+        return f"{self.source_id} -> {self.target_id} ({self.score:.3f})"
+
+
 class ContactMessage(models.Model):
     """Contact form submissions"""
     name = models.CharField(max_length=200)
@@ -184,11 +357,67 @@ class ContactMessage(models.Model):
     
     class Meta:
         ordering = ['-created_at']
+        indexes = [
+            models.Index(fields=['-created_at'], name='contactmessage_created_idx'),
+            models.Index(fields=['-created_at'], condition=Q(is_read=False), name='contactmessage_unread_idx'),
+        ]
     
     def __str__(self):
         return f"Message from {self.name} - {self.created_at.strftime('%Y-%m-%d')}"
 
 
+class DailyViewStat(models.Model):
+    """Aggregated page views per item and day, written in batches"""
+    KIND_CHOICES = [
+        ('project', 'Project'),
+        ('blog', 'Blog post'),
+    ]
+
+    kind = models.CharField(max_length=20, choices=KIND_CHOICES)
+    object_id = models.PositiveIntegerField()
+    date = models.DateField()
+    views = models.PositiveIntegerField(default=0)
+
+    class Meta:
+        ordering = ['-date', '-views']
+        constraints = [
+            models.UniqueConstraint(fields=['kind', 'object_id', 'date'], name='unique_daily_view_stat'),
+        ]
+        indexes = [
+            models.Index(fields=['kind', 'date'], name='viewstat_kind_date_idx'),
+        ]
+
+    def __str__(self):
+        return f"{self.get_kind_display()} {self.object_id} - {self.date}: {self.views}"
+
+
+class NotFoundStat(models.Model):
+    """Hits per path that ended in a 404, written in batches"""
+    path = models.CharField(max_length=255, unique=True)
+    hits = models.PositiveIntegerField(default=0)
+    last_seen = models.DateTimeField(db_index=True)
+
+    class Meta:
+        ordering = ['-hits']
+
+    def __str__(self):
+        return f"{self.path}: {self.hits}"
+
+
+class MediaBlob(models.Model):
+    """A content-addressed media file and the number of model fields using it"""
+    name = models.CharField(max_length=255, unique=True)
+    size = models.PositiveBigIntegerField(default=0)
+    ref_count = models.PositiveIntegerField(default=0, db_index=True)
+    created_at = models.DateTimeField(auto_now_add=True)
+
+    class Meta:
+        ordering = ['-created_at']
+
+    def __str__(self):
+        return f"{self.name} ({self.ref_count} refs)"
+
+
 class SiteSettings(models.Model):
     """Global site settings"""
     site_name = models.CharField(max_length=200, default='Ctrin Interior')
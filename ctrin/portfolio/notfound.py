@@ -0,0 +1,79 @@
+import re
+import time
+
+from django.conf import settings
+from django.core.cache import cache
+from django.db import DatabaseError
+from django.urls import Resolver404, resolve
+
+from .analytics import record_not_found
+from .models import Project, BlogPost
+
+SLUG_GENERATION_KEY = 'portfolio:slugs:generation'
+
+# Probes for software this site does not run
+SCANNER_PATH_RE = re.compile(
+    r'\.(php\d?|aspx?|jsp|cgi|env|ini|bak|old|sql|sh|git|svn|ds_store|htaccess)(/|$)'
+    r'|^/(wp-|wordpress|phpmyadmin|pma/|xmlrpc|cgi-bin|vendor/|boaform|actuator|owa/)',
+    re.IGNORECASE,
+)
+
+
+def bump_slug_generation():
+    """Make every process reload its slug sets on the next lookup"""
+    cache.set(SLUG_GENERATION_KEY, time.time_ns(), None)
+
+
+class SlugSet:
+    """In-process set of existing slugs, reloaded when the shared generation changes
+
+    A lookup costs one cache read; the database is only queried after a
+    project or post was saved or deleted somewhere. The generation lives in
+    the shared cache, so saves made by other workers or cron commands are
+    seen too.
+    """
+
+    def __init__(self, get_queryset):
+        self.get_queryset = get_queryset
+        self._slugs = None
+        self._generation = None
+
+    def __contains__(self, slug):
+        generation = cache.get_or_set(SLUG_GENERATION_KEY, time.time_ns, None)
+        if self._slugs is None or generation != self._generation:
+            try:
+                self._slugs = frozenset(self.get_queryset().values_list('slug', flat=True))
+            except DatabaseError:
+                # Let the view decide (and degraded mode answer)
+                return True
+            self._generation = generation
+        return slug in self._slugs
+
+
+project_slugs = SlugSet(lambda: Project.objects.published())
+blog_slugs = SlugSet(lambda: BlogPost.objects.published())
+
+# URL names whose ``slug`` argument must exist in a slug set
+SLUG_ROUTES = {
+    'project_detail': project_slugs,
+    'project_download': project_slugs,
+    'blog_detail': blog_slugs,
+}
+
+
+def appends_slash(path):
+    """True when CommonMiddleware will turn this 404 into a redirect to ``path/``"""
+    if not settings.APPEND_SLASH or path.endswith('/'):
+        return False
+    try:
+        resolve(path + '/')
+    except Resolver404:
+        return False
+    return True
+
+
+def not_found_response(request):
+    from .views import render_error_page
+
+    record_not_found(request.path)
+    return render_error_page(404, '404.html')
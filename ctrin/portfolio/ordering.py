@@ -0,0 +1,72 @@
+from django.db import transaction
+from django.db.models import Max
+
+# Space between neighbouring ``order`` values, so an item can move between
+# two others by rewriting only its own row
+ORDER_GAP = 1024
+
+
+def next_order(queryset):
+    """``order`` value placing a new item after everything in ``queryset``"""
+    last = queryset.aggregate(last=Max('order'))['last']
+    return ORDER_GAP if last is None else last + ORDER_GAP
+
+
+def _normalize(queryset, pks):
+    field = queryset.model._meta.pk
+    return [field.to_python(pk) for pk in pks]
+
+
+def apply_ordering(queryset, pks):
+    """Renumber ``queryset`` to follow ``pks`` with ORDER_GAP spacing
+
+    ``pks`` must list every item of ``queryset`` exactly once. Only rows
+    whose value changes are written, with one ``bulk_update`` (a single
+    CASE UPDATE per batch) in a transaction; save signals are not sent.
+    Returns ``{pk: order}`` for the rows that changed.
+    """
+    pks = _normalize(queryset, pks)
+    current = dict(queryset.values_list('pk', 'order'))
+    if len(set(pks)) != len(pks) or set(pks) != set(current):
+        raise ValueError('The new ordering must list every item exactly once')
+    changed = {pk: (index + 1) * ORDER_GAP for index, pk in enumerate(pks) if current[pk] != (index + 1) * ORDER_GAP}
+    with transaction.atomic():
+        queryset.model.objects.bulk_update(
+            [queryset.model(pk=pk, order=order) for pk, order in changed.items()], ['order'],
+        )
+    return changed
+
+
+def display_ordering(queryset):
+    """The ordering lists of ``queryset`` are displayed in, e.g. featured testimonials first"""
+    return [*(queryset.query.order_by or queryset.model._meta.ordering), 'pk']
+
+
+def move_item(queryset, pk, after=None, before=None):
+    """Place item ``pk`` right after ``after`` or right before ``before`` (neither: first)
+
+    Neighbours are taken in display order. The item takes the midpoint of
+    their values, so only its own row is written. When they leave no gap,
+    or ``order`` does not increase along the display order (as across the
+    featured/other boundary of testimonials), the whole list is renumbered
+    with apply_ordering. Returns ``{pk: order}`` for the rows that changed.
+    """
+    pk, after, before = _normalize(queryset, [pk, after, before])
+    items = list(queryset.order_by(*display_ordering(queryset)).values_list('pk', 'order'))
+    if pk not in dict(items):
+        raise ValueError('Unknown item')
+    items = [item for item in items if item[0] != pk]
+    pks = [item_pk for item_pk, _ in items]
+    anchor = after if after is not None else before
+    if anchor is not None and anchor not in pks:
+        raise ValueError('Unknown neighbour')
+
+    index = pks.index(after) + 1 if after is not None else pks.index(before) if before is not None else 0
+    previous = items[index - 1][1] if index > 0 else -1
+    following = items[index][1] if index < len(items) else previous + 2 * ORDER_GAP
+    increasing = all(a[1] < b[1] for a, b in zip(items, items[1:]))
+    if increasing and following - previous >= 2:
+        order = (previous + following) // 2
+        queryset.filter(pk=pk).update(order=order)
+        return {pk: order}
+    return apply_ordering(queryset, pks[:index] + [pk] + pks[index:])
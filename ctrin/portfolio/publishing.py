@@ -0,0 +1,83 @@
+from django.db import transaction
+from django.utils import timezone
+
+from .api import bump_api_generation
+from .cache import discard_stale_pages, invalidate_urls
+from .counts import recount_categories
+from .models import Project, BlogPost
+from .notfound import bump_slug_generation
+from .related import index_for
+from .warming import project_detail_urls, urls_for_instance, warm_urls
+
+PUBLISHABLE_MODELS = (Project, BlogPost)
+
+# Above this many changed items one full related-index rebuild beats per-item refreshes
+REBUILD_THRESHOLD = 20
+
+
+def _refresh_index(model, pks):
+    """Update the related-content index; returns the pks whose neighbours changed"""
+    index = index_for(model)
+    if len(pks) > REBUILD_THRESHOLD:
+        index.rebuild()
+        return set(model.objects.published().values_list('pk', flat=True))
+    affected = set()
+    for pk in pks:
+        affected |= index.refresh(pk)
+    return affected
+
+
+def set_published(model, pks, value):
+    """Flip ``is_published`` for ``pks`` and refresh every page that depends on them
+
+    The update, category counts and related-content index change in one
+    transaction. The page cache is only touched once it commits: slug sets
+    are bumped, then affected pages are invalidated and re-rendered, so no
+    process serves pages for a state that was rolled back or is not yet
+    visible to it. Returns the URLs that are refreshed.
+    """
+    with transaction.atomic():
+        model.objects.filter(pk__in=pks).update(is_published=value)
+        if model is Project:
+            recount_categories(Project.objects.filter(pk__in=pks).values('category_id'))
+        affected = _refresh_index(model, pks)
+
+        items = list(model.objects.filter(pk__in=pks))
+        urls = [url for item in items for url in urls_for_instance(item)]
+        if model is Project:
+            urls += project_detail_urls(Project.objects.filter(pk__in=affected))
+        urls = list(dict.fromkeys(urls))
+        unpublished = [] if value else [item.get_absolute_url() for item in items]
+
+        def refresh_pages():
+            bump_slug_generation()
+            discard_stale_pages(unpublished)
+            invalidate_urls(urls)
+            warm_urls(urls, concurrency=0)
+            bump_api_generation()
+
+        transaction.on_commit(refresh_pages)
+    return urls
+
+
+def run_schedule(batch_size=50, now=None):
+    """Publish and unpublish every due item; returns ``{model: (published, unpublished)}``"""
+    now = now or timezone.now()
+    results = {}
+    for model in PUBLISHABLE_MODELS:
+        counts = []
+        schedule = (
+            (model.objects.due_for_publishing, 'publish_at', True),
+            (model.objects.due_for_unpublishing, 'unpublish_at', False),
+        )
+        for due, order_field, value in schedule:
+            total = 0
+            while True:
+                pks = list(due(now).order_by(order_field).values_list('pk', flat=True)[:batch_size])
+                if not pks:
+                    break
+                set_published(model, pks, value)
+                total += len(pks)
+            counts.append(total)
+        results[model] = tuple(counts)
+    return results
@@ -0,0 +1,149 @@
+"""Query plan checks: a seeded dataset and EXPLAIN-based detection of full scans and temp sorts
+
+Shared by the ``check_query_plans`` command and the test suite.
+"""
+import datetime
+import json
+import re
+
+from django.contrib.auth.models import User
+from django.db import connection, transaction
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+from django.utils import timezone
+
+from .models import (
+    Category, Project, ProjectImage, Service, TeamMember, Testimonial,
+    BlogPost, ContactMessage, SiteSettings
+)
+from .related import index_for
+
+# SQLite: "SCAN table" without an index, or a sort the index could not provide
+SQLITE_FULL_SCAN_RE = re.compile(r'^SCAN (\S+)(?! USING)(?: \(~\d+ rows\))?$')
+SQLITE_TEMP_SORT_RE = re.compile(r'USE TEMP B-TREE FOR (ORDER BY|GROUP BY|DISTINCT)')
+POSTGRES_BAD_NODES = {'Seq Scan', 'Sort', 'Incremental Sort'}
+
+# Tables small enough by design that a scan is the right plan
+SCAN_ALLOWED_TABLES = {SiteSettings._meta.db_table}
+
+
+def image_size(field):
+    # Stored dimensions keep ImageField from opening the (missing) files on init
+    return {f'{field}_width': 1200, f'{field}_height': 800}
+
+
+def seed(scale):
+    """A dataset large enough for the planner to prefer indexes over scans"""
+    user = User.objects.create(username='query-plan-author')
+    SiteSettings.objects.create(pk=1)
+    categories = Category.objects.bulk_create(
+        Category(name=f'Category {i}', slug=f'category-{i}') for i in range(8)
+    )
+    start = datetime.date(2015, 1, 1)
+    projects = Project.objects.bulk_create(
+        Project(
+            title=f'Project {i}', slug=f'project-{i}', category=categories[i % len(categories)],
+            description=f'Interior project {i} with oak, marble and brass details',
+            featured_image=f'projects/p{i}.jpg', **image_size('featured_image'), project_date=start + datetime.timedelta(days=i),
+            location=['Gurgaon', 'Delhi', 'Noida'][i % 3], is_featured=i % 10 == 0,
+            is_published=i % 20 != 0, popularity=(i * 7) % 13,
+        ) for i in range(scale)
+    )
+    ProjectImage.objects.bulk_create(
+        ProjectImage(project=project, image=f'projects/g{project.pk}-{j}.jpg', **image_size('image'), caption=f'View {j}', order=j)
+        for project in projects for j in range(3)
+    )
+    BlogPost.objects.bulk_create(
+        BlogPost(
+            title=f'Post {i}', slug=f'post-{i}', author=user, content='Light and colour. ' * 50,
+            featured_image=f'blog/b{i}.jpg', **image_size('featured_image'), tags='design, light', is_published=i % 10 != 0,
+            popularity=(i * 5) % 11,
+        ) for i in range(scale // 2)
+    )
+    Service.objects.bulk_create(Service(name=f'Service {i}', slug=f'service-{i}', description='-', order=i)
+                                for i in range(scale // 10))
+    TeamMember.objects.bulk_create(TeamMember(name=f'Member {i}', position='designer', image=f'team/t{i}.jpg', **image_size('image'), order=i)
+                                   for i in range(scale // 10))
+    Testimonial.objects.bulk_create(Testimonial(client_name=f'Client {i}', content='-', is_featured=i % 3 == 0, order=i)
+                                    for i in range(scale // 5))
+    ContactMessage.objects.bulk_create(ContactMessage(name='-', email='a@example.com', subject='-', message='-')
+                                       for i in range(scale))
+    index_for(Project).rebuild()
+    index_for(BlogPost).rebuild()
+    with connection.cursor() as cursor:
+        cursor.execute('ANALYZE')
+
+
+def explain_problems(sql, params):
+    """Plan lines showing a full scan or a temporary sort"""
+    problems = []
+    with connection.cursor() as cursor:
+        if connection.vendor == 'sqlite':
+            cursor.execute(f'EXPLAIN QUERY PLAN {sql}', params)
+            for row in cursor.fetchall():
+                detail = row[-1]
+                match = SQLITE_FULL_SCAN_RE.match(detail)
+                if (match and match.group(1) not in SCAN_ALLOWED_TABLES) or SQLITE_TEMP_SORT_RE.search(detail):
+                    problems.append(detail)
+        elif connection.vendor == 'postgresql':
+            # Make the planner pick an index whenever one can serve the query;
+            # SET LOCAL only lasts, and only works, inside a transaction
+            with transaction.atomic():
+                cursor.execute('SET LOCAL enable_seqscan = off')
+                cursor.execute('SET LOCAL enable_sort = off')
+                cursor.execute(f'EXPLAIN (FORMAT JSON) {sql}', params)
+                plan = cursor.fetchone()[0]
+            nodes = [(plan if isinstance(plan, list) else json.loads(plan))[0]['Plan']]
+            while nodes:
+                node = nodes.pop()
+                nodes.extend(node.get('Plans', ()))
+                if node['Node Type'] in POSTGRES_BAD_NODES and node.get('Relation Name') not in SCAN_ALLOWED_TABLES:
+                    problems.append(f"{node['Node Type']} on {node.get('Relation Name', node.get('Sort Key'))}")
+        else:
+            raise NotImplementedError(f'No EXPLAIN support for {connection.vendor}')
+    return problems
+
+
+def public_requests():
+    """URLs of every public view, including filtered and paginated variants, by page"""
+    project = Project.objects.published().first()
+    post = BlogPost.objects.published().first()
+    category = Category.objects.first()
+    projects, blog = reverse('portfolio:projects'), reverse('portfolio:blog')
+    return {
+        'home': [reverse('portfolio:home')],
+        'projects': [projects, f'{projects}?page=3', f'{projects}?category={category.slug}'],
+        'project detail': [project.get_absolute_url()],
+        'services': [reverse('portfolio:services')],
+        'team': [reverse('portfolio:team')],
+        'blog': [blog, f'{blog}?page=2'],
+        'blog detail': [post.get_absolute_url()],
+        'contact': [reverse('portfolio:contact')],
+        'api': [
+            reverse('portfolio:api_projects'),
+            f"{reverse('portfolio:api_projects')}?category={category.slug}",
+            reverse('portfolio:api_project_detail', kwargs={'slug': project.slug}),
+            reverse('portfolio:api_services'),
+            reverse('portfolio:api_team'),
+            reverse('portfolio:api_blog'),
+            reverse('portfolio:api_blog_detail', kwargs={'slug': post.slug}),
+        ],
+    }
+
+
+def page_queries(client, url):
+    """Status code of ``url`` and the SELECT statements it ran, parameters inlined"""
+    with CaptureQueriesContext(connection) as queries:
+        response = client.get(url)
+    selects = [query['sql'] for query in queries if query['sql'].lstrip().upper().startswith('SELECT')]
+    return response.status_code, selects
+
+
+def extra_querysets():
+    """Hot querysets not reached through a public page"""
+    return {
+        'admin: contact messages': ContactMessage.objects.all()[:100],
+        'admin: unread contact messages': ContactMessage.objects.filter(is_read=False)[:100],
+        'scheduler: due projects': Project.objects.due_for_publishing(timezone.now()).order_by('publish_at').values('pk')[:50],
+        'scheduler: expired posts': BlogPost.objects.due_for_unpublishing(timezone.now()).order_by('unpublish_at').values('pk')[:50],
+    }
@@ -0,0 +1,87 @@
+import hashlib
+import math
+import time
+
+from django.conf import settings
+from django.core.cache import cache
+from django.http import HttpResponse
+
+RATELIMIT_PREFIX = 'portfolio:ratelimit:'
+
+
+class SlidingWindowLimit:
+    """At most ``limit`` hits per ``window`` seconds per identity, shared through the cache
+
+    Approximates a sliding window from the current and previous fixed
+    windows, weighting the previous one by how much of it still overlaps.
+    Counting uses ``cache.add``/``cache.incr``, which are atomic on the
+    shared backends, so every worker process enforces the same budget.
+    """
+
+    def __init__(self, name, limit, window):
+        self.name = name
+        self.limit = limit
+        self.window = window
+
+    def _key(self, identity, index):
+        digest = hashlib.md5(str(identity).lower().encode()).hexdigest()
+        return f'{RATELIMIT_PREFIX}{self.name}:{digest}:{index}'
+
+    def hit(self, identity, now=None):
+        """Count a hit; returns 0 when allowed, else the seconds until the next one would be"""
+        now = time.time() if now is None else now
+        index, offset = divmod(now, self.window)
+        index = int(index)
+        current_key = self._key(identity, index)
+        counts = cache.get_many([current_key, self._key(identity, index - 1)])
+        current = counts.get(current_key, 0)
+        previous = counts.get(self._key(identity, index - 1), 0)
+        overlap = 1 - offset / self.window
+
+        if previous * overlap + current >= self.limit:
+            if current >= self.limit:
+                return math.ceil(self.window - offset)
+            # Wait until enough of the previous window has slid out
+            needed = (previous * overlap + current - self.limit + 1) / previous
+            return max(1, math.ceil(needed * self.window))
+
+        if not cache.add(current_key, 1, self.window * 2):
+            try:
+                cache.incr(current_key)
+            except ValueError:
+                cache.set(current_key, 1, self.window * 2)
+        return 0
+
+
+def client_ip(request):
+    """Client address, read from RATELIMIT_IP_HEADER when behind a trusted proxy"""
+    if settings.RATELIMIT_IP_HEADER:
+        forwarded = request.META.get(settings.RATELIMIT_IP_HEADER, '')
+        # The proxy appends the address it saw; anything before it is client-supplied
+        if forwarded:
+            return forwarded.split(',')[-1].strip()
+    return request.META.get('REMOTE_ADDR', '')
+
+
+def is_duplicate(*parts, timeout=None):
+    """True when the same content was already submitted within ``timeout`` seconds"""
+    normalized = '\x00'.join(' '.join(str(part).lower().split()) for part in parts)
+    key = f"{RATELIMIT_PREFIX}dup:{hashlib.sha256(normalized.encode()).hexdigest()}"
+    return not cache.add(key, 1, timeout or settings.CONTACT_DUPLICATE_WINDOW)
+
+
+def too_many_requests(retry_after):
+    response = HttpResponse(
+        'Too many messages have been sent from here. Please try again later.',
+        status=429, content_type='text/plain; charset=utf-8',
+    )
+    response['Retry-After'] = str(retry_after)
+    return response
+
+
+contact_ip_limit = SlidingWindowLimit(
+    'contact-ip', settings.CONTACT_RATE_LIMIT_PER_IP, settings.CONTACT_RATE_LIMIT_WINDOW
+)
+contact_email_limit = SlidingWindowLimit(
+    'contact-email', settings.CONTACT_RATE_LIMIT_PER_EMAIL, settings.CONTACT_RATE_LIMIT_WINDOW
+)
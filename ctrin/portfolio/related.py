@@ -0,0 +1,184 @@
+import math
+import re
+from collections import Counter
+
+from django.conf import settings
+from django.db import transaction
+
+from .models import Project, BlogPost, RelatedProject, RelatedBlogPost
+
+TOKEN_RE = re.compile(r'[a-z0-9]+')
+
+STOP_WORDS = frozenset("""
+a about after all also an and any are as at be been but by can for from has have
+how in into is it its more most not of on or our out so than that the their them
+then there these they this to up was we were what when which while who will with
+you your
+""".split())
+
+
+def tokenize(text):
+    return [t for t in TOKEN_RE.findall(text.lower()) if len(t) > 2 and t not in STOP_WORDS]
+
+
+def tfidf_vectors(documents):
+    """L2-normalised TF-IDF vectors for ``{key: [tokens]}``"""
+    doc_freq = Counter()
+    for tokens in documents.values():
+        doc_freq.update(set(tokens))
+    total = len(documents)
+
+    vectors = {}
+    for key, tokens in documents.items():
+        counts = Counter(tokens)
+        vector = {
+            term: (1 + math.log(count)) * math.log((1 + total) / (1 + doc_freq[term]))
+            for term, count in counts.items()
+        }
+        norm = math.sqrt(sum(w * w for w in vector.values())) or 1.0
+        vectors[key] = {term: w / norm for term, w in vector.items()}
+    return vectors
+
+
+def cosine(a, b):
+    if len(a) > len(b):
+        a, b = b, a
+    return sum(w * b.get(term, 0.0) for term, w in a.items())
+
+
+class RelatedIndex:
+    """Top-N similar items per object, stored in ``link_model``"""
+    model = None
+    link_model = None
+    fields = ()
+
+    def __init__(self, size=None):
+        self.size = size or settings.RELATED_ITEMS_COUNT
+
+    def get_queryset(self):
+        return self.model.objects.all()
+
+    def text(self, row):
+        raise NotImplementedError
+
+    def similarity(self, a, b):
+        """Score of ``b`` as a neighbour of ``a``; rows carry a ``vector`` key"""
+        raise NotImplementedError
+
+    def load(self):
+        rows = {row['id']: row for row in self.get_queryset().values('id', *self.fields)}
+        vectors = tfidf_vectors({pk: tokenize(self.text(row)) for pk, row in rows.items()})
+        for pk, row in rows.items():
+            row['vector'] = vectors[pk]
+        return rows
+
+    def neighbours(self, rows, pk):
+        scored = []
+        for other_pk, other in rows.items():
+            if other_pk != pk:
+                score = self.similarity(rows[pk], other)
+                if score > 0:
+                    scored.append((score, other_pk))
+        scored.sort(key=lambda item: (-item[0], item[1]))
+        return scored[:self.size]
+
+    def _links(self, rows, pks):
+        return [
+            self.link_model(source_id=pk, target_id=target, score=round(score, 6), rank=rank)
+            for pk in pks
+            for rank, (score, target) in enumerate(self.neighbours(rows, pk))
+        ]
+
+    @transaction.atomic
+    def rebuild(self):
+        """Recompute every item's neighbours; returns the number of links written"""
+        rows = self.load()
+        links = self._links(rows, rows)
+        self.link_model.objects.all().delete()
+        self.link_model.objects.bulk_create(links, batch_size=500)
+        return len(links)
+
+    @transaction.atomic
+    def refresh(self, pk, extra_sources=()):
+        """Update the index after item ``pk`` changed (or disappeared)
+
+        Recomputes the item's own neighbours, plus those of items that
+        linked to it or that it would now displace. Returns the pks whose
+        neighbour lists were recomputed.
+        """
+        rows = self.load()
+        links = self.link_model.objects.all()
+        affected = set(extra_sources) | set(links.filter(target_id=pk).values_list('source_id', flat=True))
+
+        if pk in rows:
+            affected.add(pk)
+            floors = {}
+            counts = Counter()
+            for source, score in links.values_list('source_id', 'score'):
+                floors[source] = min(score, floors.get(source, score))
+                counts[source] += 1
+            for other_pk, other in rows.items():
+                if other_pk == pk:
+                    continue
+                score = self.similarity(other, rows[pk])
+                if score > 0 and (counts[other_pk] < self.size or score > floors[other_pk]):
+                    affected.add(other_pk)
+
+        links.filter(source_id__in=affected | {pk}).delete()
+        self.link_model.objects.bulk_create(self._links(rows, affected & rows.keys()), batch_size=500)
+        return affected
+
+
+class ProjectRelatedIndex(RelatedIndex):
+    model = Project
+    link_model = RelatedProject
+    fields = ('title', 'description', 'detailed_description', 'category_id', 'location')
+
+    TEXT_WEIGHT = 0.6
+    CATEGORY_WEIGHT = 0.3
+    LOCATION_WEIGHT = 0.1
+
+    def get_queryset(self):
+        return Project.objects.published()
+
+    def text(self, row):
+        return ' '.join((row['title'], row['description'], row['detailed_description']))
+
+    def similarity(self, a, b):
+        score = self.TEXT_WEIGHT * cosine(a['vector'], b['vector'])
+        if a['category_id'] and a['category_id'] == b['category_id']:
+            score += self.CATEGORY_WEIGHT
+        if a['location'] and a['location'].strip().lower() == b['location'].strip().lower():
+            score += self.LOCATION_WEIGHT
+        return score
+
+
+class BlogPostRelatedIndex(RelatedIndex):
+    model = BlogPost
+    link_model = RelatedBlogPost
+    fields = ('title', 'content', 'tags')
+
+    TEXT_WEIGHT = 0.6
+    TAG_WEIGHT = 0.4
+
+    def get_queryset(self):
+        return BlogPost.objects.published()
+
+    def text(self, row):
+        return f"{row['title']} {row['content']}"
+
+    def load(self):
+        rows = super().load()
+        for row in rows.values():
+            row['tag_set'] = {tag.strip().lower() for tag in row['tags'].split(',') if tag.strip()}
+        return rows
+
+    def similarity(self, a, b):
+        score = self.TEXT_WEIGHT * cosine(a['vector'], b['vector'])
+        if a['tag_set'] and b['tag_set']:
+            score += self.TAG_WEIGHT * len(a['tag_set'] & b['tag_set']) / len(a['tag_set'] | b['tag_set'])
+        return score
+
+
+def index_for(model):
+    return {Project: ProjectRelatedIndex, BlogPost: BlogPostRelatedIndex}[model]()
@@ -0,0 +1,86 @@
+import logging
+import threading
+import time
+
+from django.db import DatabaseError, connection
+
+from .cache import invalidate_urls
+
+logger = logging.getLogger(__name__)
+
+
+class QueryBudgetExceeded(DatabaseError):
+    pass
+
+
+class QueryBudget:
+    """``execute_wrapper`` aborting a request once its queries have used up ``budget`` seconds
+
+    A query that is already running cannot be interrupted, so the check
+    happens before each new one. ``can_abort`` is consulted only once the
+    budget is spent, so pages without a fallback still finish slowly.
+    """
+
+    def __init__(self, budget, can_abort):
+        self.budget = budget
+        self.can_abort = can_abort
+        self.spent = 0.0
+
+    def __call__(self, execute, sql, params, many, context):
+        if self.spent > self.budget and self.can_abort():
+            raise QueryBudgetExceeded(f"Queries took {self.spent:.2f}s (budget {self.budget}s)")
+        start = time.perf_counter()
+        try:
+            return execute(sql, params, many, context)
+        finally:
+            self.spent += time.perf_counter() - start
+
+
+def database_available():
+    try:
+        with connection.cursor() as cursor:
+            cursor.execute('SELECT 1')
+        return True
+    except DatabaseError:
+        return False
+    finally:
+        connection.close()
+
+
+class Revalidator:
+    """Re-render pages that were served stale, once the database answers again
+
+    One daemon thread per process polls the database every ``interval``
+    seconds while there are stale URLs, then drops their cached copies and
+    warms them in place.
+    """
+
+    def __init__(self, interval):
+        self.interval = interval
+        self._urls = set()
+        self._lock = threading.Lock()
+        self._thread = None
+
+    def schedule(self, url):
+        with self._lock:
+            self._urls.add(url)
+            if self._thread is None:
+                self._thread = threading.Thread(target=self._run, daemon=True)
+                self._thread.start()
+
+    def _run(self):
+        from .warming import warm_urls
+
+        while True:
+            time.sleep(self.interval)
+            if not database_available():
+                continue
+            with self._lock:
+                urls, self._urls = list(self._urls), set()
+            invalidate_urls(urls)
+            warm_urls(urls)
+            logger.info("Database available again; revalidated %d stale pages", len(urls))
+            with self._lock:
+                if not self._urls:
+                    self._thread = None
+                    return
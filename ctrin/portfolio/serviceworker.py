@@ -0,0 +1,75 @@
+import functools
+import hashlib
+import json
+import re
+
+from django.conf import settings
+from django.template.loader import get_template
+from django.urls import reverse
+
+from .critical_css import is_remote
+from .hints import scan_template
+from .middleware import HASHED_NAME_RE
+
+# Slug placeholder used to turn a detail route into a path pattern
+SLUG_MARKER = 'swslugmarker'
+
+
+def precache_assets():
+    """Content-hashed stylesheets and scripts the base template loads
+
+    Names come from the collectstatic manifest, so they change whenever a
+    file does. Without a manifest (development) nothing is precached and
+    assets always come from the network.
+    """
+    stylesheets, scripts, _ = scan_template('base.html')
+    return [url for url in dict.fromkeys(stylesheets + scripts)
+            if not is_remote(url) and HASHED_NAME_RE.search(url)]
+
+
+def route_pattern(view_name):
+    """JavaScript-compatible regex matching every path of a one-slug route"""
+    path = reverse(view_name, kwargs={'slug': SLUG_MARKER})
+    return '^' + re.escape(path).replace(SLUG_MARKER, '[^/]+') + '$'
+
+
+@functools.lru_cache(maxsize=None)
+def service_worker_config():
+    """Everything the generated service worker needs, fixed for the lifetime of a deployment
+
+    The version hashes the configuration and the worker template, so any
+    deploy that changes an asset name, a route or the worker itself makes
+    browsers install a fresh worker and drop the old precache.
+    """
+    config = {
+        'precache': precache_assets(),
+        'routes': [reverse(name) for name in settings.SERVICE_WORKER_ROUTES],
+        'pagePatterns': [route_pattern(name) for name in settings.SERVICE_WORKER_PAGE_ROUTES],
+        'staticUrl': settings.STATIC_URL,
+        'mediaUrl': settings.MEDIA_URL,
+        'pageLimit': settings.SERVICE_WORKER_PAGE_LIMIT,
+        'imageLimit': settings.SERVICE_WORKER_IMAGE_LIMIT,
+    }
+    with open(get_template('sw.js').origin.name, 'rb') as f:
+        source = f.read()
+    digest = hashlib.sha1(json.dumps(config, sort_keys=True).encode() + source)
+    config['version'] = digest.hexdigest()[:12]
+    return config
+
+
+def web_manifest(site_settings):
+    manifest = {
+        'name': site_settings.site_name,
+        'short_name': site_settings.site_name,
+        'description': site_settings.tagline or site_settings.meta_description,
+        'start_url': reverse('portfolio:home'),
+        'scope': '/',
+        'display': 'standalone',
+        'background_color': settings.WEB_MANIFEST_BACKGROUND_COLOR,
+        'theme_color': settings.WEB_MANIFEST_THEME_COLOR,
+        'icons': [],
+    }
+    for image in (site_settings.logo, site_settings.favicon):
+        if image:
+            manifest['icons'].append({'src': image.url, 'sizes': 'any', 'purpose': 'any'})
+    return manifest
@@ -0,0 +1,114 @@
+from collections import Counter
+from functools import partial
+
+from django.conf import settings
+from django.core.files.storage import default_storage
+from django.db import transaction
+from django.db.models.signals import post_save, post_delete, pre_delete, pre_save
+from django.dispatch import receiver
+
+from .models import (
+    Category, Project, ProjectImage, Service, TeamMember,
+    Testimonial, BlogPost, SiteSettings
+)
+from .api import bump_api_generation
+from .counts import move_contribution, project_contribution, stored_contribution
+from .media import change_references, instance_blobs, models_with_blobs, stored_blobs
+from .notfound import bump_slug_generation
+from .related import index_for
+from .views import invalidate_site_settings
+from .warming import project_detail_urls, refresh_urls, urls_for_instance
+
+PUBLIC_MODELS = (
+    Category, Project, ProjectImage, Service, TeamMember,
+    Testimonial, BlogPost, SiteSettings,
+)
+
+BLOB_MODELS = tuple(models_with_blobs())
+
+
+def _refresh_related(model, pk, extra_sources=()):
+    affected = index_for(model).refresh(pk, extra_sources)
+    if model is Project and affected:
+        refresh_urls(
+            project_detail_urls(Project.objects.filter(pk__in=affected)),
+            warm=settings.CACHE_WARM_ON_SAVE,
+        )
+
+
+@receiver(pre_delete, sender=Project)
+@receiver(pre_delete, sender=BlogPost)
+def remember_related_sources(sender, instance, **kwargs):
+    # The links pointing at the instance are cascaded away with it
+    instance._related_sources = list(instance.linked_from.values_list('source_id', flat=True))
+
+
+@receiver(post_save, sender=Project)
+@receiver(post_save, sender=BlogPost)
+@receiver(post_delete, sender=Project)
+@receiver(post_delete, sender=BlogPost)
+def refresh_related_content(sender, instance, raw=False, **kwargs):
+    """Keep the precomputed related-content index and the 404 slug sets current"""
+    if raw:
+        return
+    sources = getattr(instance, '_related_sources', ())
+    transaction.on_commit(partial(_refresh_related, sender, instance.pk, sources))
+    transaction.on_commit(bump_slug_generation)
+
+
+@receiver(post_save, sender=SiteSettings)
+@receiver(post_delete, sender=SiteSettings)
+def invalidate_cached_site_settings(sender, instance, **kwargs):
+    transaction.on_commit(invalidate_site_settings)
+
+
+@receiver(post_save)
+@receiver(post_delete)
+def refresh_cached_pages(sender, instance, raw=False, **kwargs):
+    """Invalidate and re-warm the pages affected by a content change"""
+    if raw or sender not in PUBLIC_MODELS:
+        return
+    transaction.on_commit(bump_api_generation)
+    urls = urls_for_instance(instance)
+    if urls:
+        transaction.on_commit(partial(refresh_urls, urls, warm=settings.CACHE_WARM_ON_SAVE))
+
+
+@receiver(pre_save)
+def remember_stored_blobs(sender, instance, **kwargs):
+    if sender in BLOB_MODELS:
+        instance._stored_blobs = Counter() if instance._state.adding else stored_blobs(sender, instance.pk)
+
+
+@receiver(post_save)
+def count_blob_references(sender, instance, **kwargs):
+    """Keep MediaBlob reference counts in step with the files each row points at"""
+    if sender not in BLOB_MODELS:
+        return
+    previous, current = getattr(instance, '_stored_blobs', Counter()), instance_blobs(instance)
+    change_references(default_storage, current - previous, 1)
+    change_references(default_storage, previous - current, -1)
+    instance._stored_blobs = current
+
+
+@receiver(post_delete)
+def release_blob_references(sender, instance, **kwargs):
+    if sender in BLOB_MODELS:
+        change_references(default_storage, instance_blobs(instance), -1)
+
+
+@receiver(pre_save, sender=Project)
+def remember_category_contribution(sender, instance, **kwargs):
+    instance._stored_contribution = None if instance._state.adding else stored_contribution(instance.pk)
+
+
+@receiver(post_save, sender=Project)
+def update_category_counts(sender, instance, **kwargs):
+    """Keep Category.project_count/featured_count in step, in the saving transaction"""
+    move_contribution(getattr(instance, '_stored_contribution', None), project_contribution(instance))
+    instance._stored_contribution = project_contribution(instance)
+
+
+@receiver(post_delete, sender=Project)
+def release_category_counts(sender, instance, **kwargs):
+    move_contribution(project_contribution(instance), None)
@@ -0,0 +1,106 @@
+import json
+import os
+import time
+from wsgiref.util import setup_testing_defaults
+
+
+def project_template_dirs():
+    """Template directories belonging to this project rather than to installed packages"""
+    from django.conf import settings
+    from django.template import engines
+
+    base = str(settings.BASE_DIR)
+    for engine in engines.all():
+        for directory in getattr(engine, 'template_dirs', ()):
+            if str(directory).startswith(base) and os.path.isdir(directory):
+                yield engine, str(directory)
+
+
+def warm_process():
+    """Build the lazy per-process state a first request would otherwise pay for
+
+    Meant to run once in a preforking master: URL resolvers are populated
+    and every project template is compiled into the cached loader, so
+    forked workers inherit them. Returns the number of templates loaded.
+    """
+    from django.db import connections
+    from django.template import TemplateSyntaxError
+    from django.urls import get_resolver, reverse
+
+    get_resolver().reverse_dict
+    reverse('portfolio:home')
+
+    loaded = set()
+    for engine, directory in project_template_dirs():
+        for root, _, files in os.walk(directory):
+            for filename in files:
+                if not filename.endswith(('.html', '.txt', '.xml')):
+                    continue
+                name = os.path.relpath(os.path.join(root, filename), directory).replace(os.sep, '/')
+                if name in loaded:
+                    continue
+                try:
+                    engine.get_template(name)
+                except TemplateSyntaxError:
+                    continue
+                loaded.add(name)
+
+    connections.close_all()
+    return len(loaded)
+
+
+def timed_request(application, path):
+    """Send one request straight to the WSGI callable; returns ``(seconds, status)``"""
+    from .analytics import INTERNAL_USER_AGENT
+    from .warming import _warm_host
+
+    environ = {
+        'PATH_INFO': path, 'HTTP_HOST': _warm_host(), 'HTTP_USER_AGENT': INTERNAL_USER_AGENT,
+        'wsgi.url_scheme': 'https', 'HTTPS': 'on',
+    }
+    setup_testing_defaults(environ)
+    status = []
+    start = time.perf_counter()
+    body = application(environ, lambda s, headers, exc_info=None: status.append(int(s.split()[0])))
+    try:
+        for _ in body:
+            pass
+    finally:
+        if hasattr(body, 'close'):
+            body.close()
+    return time.perf_counter() - start, status[0]
+
+
+def measure(path, forks=0):
+    """Print boot and first-response timings of a fresh process as JSON
+
+    With ``forks`` the process warms itself like a preloading master, then
+    times the first request of that many forked children.
+    """
+    start = time.perf_counter()
+    from django.core.wsgi import get_wsgi_application
+
+    application = get_wsgi_application()
+    result = {'boot': time.perf_counter() - start}
+
+    if not forks:
+        result['first'], result['status'] = timed_request(application, path)
+        result['second'] = timed_request(application, path)[0]
+    else:
+        warm_start = time.perf_counter()
+        result['templates'] = warm_process()
+        result['warm'] = time.perf_counter() - warm_start
+        result['forked'] = []
+        for _ in range(forks):
+            read_fd, write_fd = os.pipe()
+            pid = os.fork()
+            if pid == 0:
+                os.close(read_fd)
+                with os.fdopen(write_fd, 'w') as pipe:
+                    json.dump(timed_request(application, path), pipe)
+                os._exit(0)
+            os.close(write_fd)
+            with os.fdopen(read_fd) as pipe:
+                result['forked'].append(json.load(pipe))
+            os.waitpid(pid, 0)
+    print(json.dumps(result))
@@ -0,0 +1,157 @@
+/**
+ * Chunked, resumable gallery uploads for the project change form
+ *
+ * Each file is sent in chunks to the project's upload endpoint, several
+ * files at a time. A session is remembered in localStorage, so picking the
+ * same file again after a failure or reload resumes from the last chunk
+ * the server stored.
+ */
+(function () {
+    'use strict';
+
+    const PARALLEL_UPLOADS = 3;
+    const MAX_RETRIES = 5;
+
+    function csrfToken() {
+        const input = document.querySelector('input[name=csrfmiddlewaretoken]');
+        return input ? input.value : '';
+    }
+
+    function sleep(ms) {
+        return new Promise(resolve => setTimeout(resolve, ms));
+    }
+
+    async function send(url, options) {
+        options.headers = Object.assign({'X-CSRFToken': csrfToken()}, options.headers || {});
+        options.credentials = 'same-origin';
+        const response = await fetch(url, options);
+        const data = response.status === 204 ? {} : await response.json();
+        // 409 carries the offset the server expects; the caller resumes from it
+        if (!response.ok && response.status !== 409) {
+            const error = new Error(data.error || response.statusText);
+            error.status = response.status;
+            throw error;
+        }
+        return data;
+    }
+
+    function resumeKey(file) {
+        return `chunked-upload:${location.pathname}:${file.name}:${file.size}:${file.lastModified}`;
+    }
+
+    async function openSession(baseUrl, file) {
+        const saved = localStorage.getItem(resumeKey(file));
+        if (saved) {
+            const session = JSON.parse(saved);
+            try {
+                session.offset = (await send(session.url, {method: 'GET'})).offset;
+                return session;
+            } catch (error) {
+                localStorage.removeItem(resumeKey(file));
+            }
+        }
+        const data = await send(baseUrl, {
+            method: 'POST',
+            headers: {'Content-Type': 'application/json'},
+            body: JSON.stringify({filename: file.name, size: file.size}),
+        });
+        const session = {url: data.url, chunkSize: data.chunk_size, offset: data.offset};
+        localStorage.setItem(resumeKey(file), JSON.stringify(session));
+        return session;
+    }
+
+    async function uploadFile(baseUrl, file, onProgress) {
+        const session = await openSession(baseUrl, file);
+        let offset = session.offset;
+        let retries = 0;
+        while (true) {
+            const chunk = file.slice(offset, offset + session.chunkSize);
+            try {
+                const data = await send(session.url, {
+                    method: 'PATCH',
+                    headers: {'Upload-Offset': String(offset), 'Content-Type': 'application/offset+octet-stream'},
+                    body: chunk,
+                });
+                if (data.image) {
+                    localStorage.removeItem(resumeKey(file));
+                    return data.image;
+                }
+                offset = data.offset;
+                retries = 0;
+                onProgress(offset / file.size);
+            } catch (error) {
+                // Client errors (bad file, too large) are final; network and server errors are retried
+                if ((error.status && error.status < 500) || ++retries > MAX_RETRIES) {
+                    localStorage.removeItem(resumeKey(file));
+                    throw error;
+                }
+                await sleep(500 * 2 ** retries);
+                try {
+                    offset = (await send(session.url, {method: 'GET'})).offset;
+                } catch (ignored) {
+                    // Keep the last known offset; the next PATCH reports the right one
+                }
+            }
+        }
+    }
+
+    function renderPanel(group) {
+        const panel = document.createElement('fieldset');
+        panel.className = 'module aligned';
+        panel.innerHTML = '<h2>Upload gallery images</h2>' +
+            '<div class="form-row"><input type="file" accept="image/*" multiple>' +
+            '<p class="help">Large files are sent in chunks and can be resumed by selecting them again.</p>' +
+            '<ul class="chunked-upload-list"></ul><p class="chunked-upload-status"></p></div>';
+        group.parentNode.insertBefore(panel, group);
+        return panel;
+    }
+
+    function init() {
+        const group = document.getElementById('images-group');
+        if (!group || !/\/change\/$/.test(location.pathname)) {
+            return;
+        }
+        const baseUrl = location.pathname.replace(/change\/$/, 'uploads/');
+        const panel = renderPanel(group);
+        const input = panel.querySelector('input[type=file]');
+        const list = panel.querySelector('.chunked-upload-list');
+        const status = panel.querySelector('.chunked-upload-status');
+
+        input.addEventListener('change', async function () {
+            const queue = Array.from(input.files);
+            input.value = '';
+            let added = 0;
+            let failed = 0;
+
+            async function worker() {
+                while (queue.length) {
+                    const file = queue.shift();
+                    const item = document.createElement('li');
+                    const progress = document.createElement('progress');
+                    progress.max = 1;
+                    progress.value = 0;
+                    item.textContent = file.name + ' ';
+                    item.appendChild(progress);
+                    list.appendChild(item);
+                    try {
+                        await uploadFile(baseUrl, file, value => { progress.value = value; });
+                        progress.value = 1;
+                        added += 1;
+                    } catch (error) {
+                        item.textContent = `${file.name}: ${error.message}`;
+                        item.className = 'errornote';
+                        failed += 1;
+                    }
+                }
+            }
+
+            status.textContent = 'Uploading…';
+            await Promise.all(Array.from({length: PARALLEL_UPLOADS}, worker));
+            status.innerHTML = `${added} image(s) added to the gallery` +
+                (failed ? `, ${failed} failed` : '') +
+                '. <a href="">Reload</a> to edit their captions and order.';
+        });
+    }
+
+    document.addEventListener('DOMContentLoaded', init);
+})();
@@ -0,0 +1,107 @@
+/**
+ * Drag-and-drop reordering for admin changelists and the project gallery inline
+ *
+ * Dropping a row sends one move ("put this item after that one") to the
+ * reorder endpoint, which usually rewrites a single row thanks to the gaps
+ * between order values. The order column is updated from the response.
+ */
+(function () {
+    'use strict';
+
+    function csrfToken() {
+        const input = document.querySelector('input[name=csrfmiddlewaretoken]');
+        if (input) {
+            return input.value;
+        }
+        const match = document.cookie.match(/(?:^|; )csrftoken=([^;]+)/);
+        return match ? decodeURIComponent(match[1]) : '';
+    }
+
+    function setup(tbody, url, rowPk, orderCell) {
+        let dragged = null;
+        const rows = () => Array.from(tbody.querySelectorAll('tr')).filter(rowPk);
+
+        rows().forEach(row => {
+            row.draggable = true;
+            row.style.cursor = 'move';
+            row.addEventListener('dragstart', event => {
+                dragged = row;
+                event.dataTransfer.effectAllowed = 'move';
+                row.style.opacity = '0.5';
+            });
+            row.addEventListener('dragend', () => {
+                row.style.opacity = '';
+            });
+            row.addEventListener('dragover', event => {
+                if (!dragged || dragged === row) {
+                    return;
+                }
+                event.preventDefault();
+                const box = row.getBoundingClientRect();
+                const below = event.clientY > box.top + box.height / 2;
+                tbody.insertBefore(dragged, below ? row.nextSibling : row);
+            });
+            row.addEventListener('drop', event => event.preventDefault());
+        });
+
+        tbody.addEventListener('drop', async function () {
+            if (!dragged) {
+                return;
+            }
+            const current = rows();
+            const index = current.indexOf(dragged);
+            const payload = {move: rowPk(dragged)};
+            if (index > 0) {
+                payload.after = rowPk(current[index - 1]);
+            } else if (current.length > 1) {
+                payload.before = rowPk(current[1]);
+            }
+            dragged = null;
+
+            const response = await fetch(url, {
+                method: 'POST',
+                credentials: 'same-origin',
+                headers: {'Content-Type': 'application/json', 'X-CSRFToken': csrfToken()},
+                body: JSON.stringify(payload),
+            });
+            if (!response.ok) {
+                location.reload();
+                return;
+            }
+            const data = await response.json();
+            current.forEach(row => {
+                const order = data.changed[rowPk(row)];
+                const cell = orderCell(row);
+                if (order !== undefined && cell) {
+                    cell.textContent = order;
+                }
+            });
+        });
+    }
+
+    function init() {
+        // Changelist, only while it is shown in its default (order) sorting
+        const results = document.querySelector('#result_list tbody');
+        if (results && !new URLSearchParams(location.search).has('o')) {
+            setup(
+                results,
+                location.pathname + 'reorder/',
+                row => { const box = row.querySelector('input.action-select'); return box && box.value; },
+                row => row.querySelector('td.field-order'),
+            );
+        }
+
+        // Saved rows of the project gallery inline
+        const gallery = document.querySelector('#images-group tbody');
+        if (gallery && /\/change\/$/.test(location.pathname)) {
+            setup(
+                gallery,
+                location.pathname.replace(/change\/$/, 'images/reorder/'),
+                row => { const id = row.querySelector('input[name$="-id"]'); return row.classList.contains('has_original') && id && id.value; },
+                row => row.querySelector('td.field-order p') || row.querySelector('td.field-order'),
+            );
+        }
+    }
+
+    document.addEventListener('DOMContentLoaded', init);
+})();
@@ -7,7 +7,6 @@ document.addEventListener('DOMContentLoaded', function () {
     initNavbar();
     initSmoothScroll();
     initFormValidation();
-    initLazyLoad();
     initAnimations();
 });
 
@@ -67,30 +66,6 @@ function initFormValidation() {
     });
 }
 
-/**
- * Lazy Load Images
- */
-function initLazyLoad() {
-    if ('IntersectionObserver' in window) {
-        const imageObserver = new IntersectionObserver((entries, observer) => {
-            entries.forEach(entry => {
-                if (entry.isIntersecting) {
-                    const img = entry.target;
-                    if (img.dataset.src) {
-                        img.src = img.dataset.src;
-                        img.classList.add('loaded');
-                    }
-                    observer.unobserve(img);
-                }
-            });
-        });
-
-        document.querySelectorAll('img[data-src]').forEach(img => {
-            imageObserver.observe(img);
-        });
-    }
-}
-
 /**
  * Scroll Animations
  */
@@ -290,6 +265,7 @@ document.addEventListener('DOMContentLoaded', function () {
     initGalleryLightbox();
     initScrollToTop();
     handleContactFormSuccess();
+    initServiceWorker();
 
     // Format phone inputs
     const phoneInputs = document.querySelectorAll('input[type="tel"]');
@@ -298,6 +274,20 @@ document.addEventListener('DOMContentLoaded', function () {
     });
 });
 
+/**
+ * Service Worker Registration
+ */
+function initServiceWorker() {
+    const url = document.documentElement.dataset.serviceWorker;
+    if (!url || !('serviceWorker' in navigator)) return;
+
+    window.addEventListener('load', function () {
+        navigator.serviceWorker.register(url, { scope: '/' }).catch(function (error) {
+            console.warn('Service worker registration failed:', error);
+        });
+    });
+}
+
 
 document.addEventListener("DOMContentLoaded", function () {
   const scroller = document.getElementById("autoStrip");
@@ -0,0 +1,127 @@
+import gzip
+import hashlib
+import os
+import tempfile
+from concurrent.futures import ProcessPoolExecutor
+
+from django.conf import settings
+from django.contrib.staticfiles.storage import ManifestStaticFilesStorage
+from django.core.files.base import ContentFile
+from django.core.files.storage import FileSystemStorage
+
+from .minify import MINIFIERS
+
+COMPRESSIBLE_EXTENSIONS = ('.css', '.js', '.svg', '.json', '.txt', '.html', '.xml', '.map', '.webmanifest')
+MIN_COMPRESS_SIZE = 256
+
+
+def compress_file(path):
+    """Write ``.gz`` (and ``.br`` when brotli is installed) siblings of ``path``
+
+    Runs in a worker process. Returns the encodings that were written.
+    """
+    with open(path, 'rb') as f:
+        data = f.read()
+    encoders = {'gz': lambda d: gzip.compress(d, compresslevel=9, mtime=0)}
+    try:
+        import brotli
+    except ImportError:
+        pass
+    else:
+        encoders['br'] = lambda d: brotli.compress(d, quality=11)
+
+    written = []
+    for suffix, encode in encoders.items():
+        encoded = encode(data)
+        if len(encoded) < len(data):
+            with open(f'{path}.{suffix}', 'wb') as f:
+                f.write(encoded)
+            written.append(suffix)
+    return written
+
+
+class OptimizedManifestStaticFilesStorage(ManifestStaticFilesStorage):
+    """Manifest storage that minifies CSS/JS and pre-compresses the output
+
+    Minification happens as collectstatic copies each file, so content
+    hashes reflect the minified bytes. Compression of every collected file
+    is spread over a process pool once hashing has finished.
+    """
+
+    def _save(self, name, content):
+        minify = MINIFIERS.get(os.path.splitext(name)[1])
+        if minify and '.min.' not in name:
+            content.seek(0)
+            content = ContentFile(minify(content.read().decode('utf-8')).encode('utf-8'))
+        return super()._save(name, content)
+
+    def post_process(self, paths, dry_run=False, **options):
+        processed_names = []
+        for name, hashed_name, processed in super().post_process(paths, dry_run, **options):
+            if not isinstance(processed, Exception):
+                processed_names.extend(n for n in (name, hashed_name) if n)
+            yield name, hashed_name, processed
+        if not dry_run:
+            self.compress(processed_names)
+
+    def compress(self, names):
+        paths = [
+            self.path(name) for name in dict.fromkeys(names)
+            if name.endswith(COMPRESSIBLE_EXTENSIONS) and self.exists(name)
+            and self.size(name) >= MIN_COMPRESS_SIZE
+        ]
+        if not paths:
+            return
+        with ProcessPoolExecutor(max_workers=settings.STATIC_COMPRESS_WORKERS or None) as executor:
+            list(executor.map(compress_file, paths, chunksize=8))
+
+
+class ContentAddressedStorage(FileSystemStorage):
+    """Media storage keeping one copy of each distinct upload, named by its SHA-256
+
+    Uploads are hashed while they are streamed to a temporary file, then
+    moved to ``cas/<xx>/<digest><ext>`` unless that blob already exists.
+    The ``upload_to`` directory is ignored, so the same photo used by a
+    project, a gallery and a blog post shares one file and one URL. Blobs
+    are never deleted on save; ``gc_media`` sweeps unreferenced ones.
+    """
+    prefix = 'cas'
+
+    def blob_name(self, digest, ext):
+        return f'{self.prefix}/{digest[:2]}/{digest}{ext}'
+
+    def is_blob(self, name):
+        return bool(name) and name.startswith(self.prefix + '/')
+
+    def get_available_name(self, name, max_length=None):
+        # The final name comes from the content, so collisions mean "same file"
+        return name
+
+    def _save(self, name, content):
+        ext = os.path.splitext(name)[1].lower()
+        tmp_dir = self.path(f'{self.prefix}/tmp')
+        os.makedirs(tmp_dir, exist_ok=True)
+        fd, tmp_path = tempfile.mkstemp(dir=tmp_dir)
+        try:
+            digest = hashlib.sha256()
+            with os.fdopen(fd, 'wb') as f:
+                for chunk in content.chunks():
+                    digest.update(chunk)
+                    f.write(chunk)
+            name = self.blob_name(digest.hexdigest(), ext)
+            path = self.path(name)
+            if os.path.exists(path):
+                os.remove(tmp_path)
+                # Restart gc_media's grace period: the reference to this blob
+                # is only saved after the upload returns
+                os.utime(path)
+            else:
+                os.makedirs(os.path.dirname(path), exist_ok=True)
+                if self.file_permissions_mode is not None:
+                    os.chmod(tmp_path, self.file_permissions_mode)
+                os.replace(tmp_path, path)
+        except BaseException:
+            if os.path.exists(tmp_path):
+                os.remove(tmp_path)
+            raise
+        return name
@@ -0,0 +1,57 @@
+from django import template
+from django.conf import settings
+from django.utils.html import format_html, format_html_join, mark_safe
+
+from portfolio.critical_css import critical_css_for, stylesheet_url
+from portfolio.hints import remember_template
+
+register = template.Library()
+
+
+@register.simple_tag(takes_context=True)
+def stylesheets(context):
+    """Inline the page's critical CSS and load the covered stylesheets without blocking"""
+    request = context.get('request')
+    if request is not None and request.resolver_match:
+        remember_template(request.resolver_match.view_name, context.template.name)
+    critical, covered = critical_css_for(context.template.name)
+    blocking, deferred = [], []
+    for href in settings.CRITICAL_CSS_STYLESHEETS:
+        (deferred if href in covered else blocking).append((stylesheet_url(href),))
+
+    html = format_html_join('\n', '<link rel="stylesheet" href="{}">', blocking)
+    if critical:
+        html += format_html('\n<style>{}</style>', mark_safe(critical.replace('</', '<\\/')))
+        html += format_html_join(
+            '\n',
+            '<link rel="preload" href="{0}" as="style" onload="this.onload=null;this.rel=\'stylesheet\'">'
+            '<noscript><link rel="stylesheet" href="{0}"></noscript>',
+            deferred,
+        )
+    return html
+
+
+@register.simple_tag
+def image_size(instance, field_name):
+    """``width``/``height`` attributes from an image's stored dimensions"""
+    field = instance._meta.get_field(field_name)
+    width = getattr(instance, field.width_field, None)
+    height = getattr(instance, field.height_field, None)
+    if not (width and height):
+        return ''
+    return format_html('width="{}" height="{}"', width, height)
+
+
+@register.simple_tag
+def image_placeholder(instance, field_name):
+    """Inline ``background`` declaration showing an image's blurred placeholder while it loads"""
+    placeholder = getattr(instance, f'{field_name}_placeholder', '')
+    if not placeholder:
+        return ''
+    return format_html('background: url({}) center / cover no-repeat;', placeholder)
+
+
+@register.simple_tag
+def theme_color():
+    """Browser UI colour, the same one the web manifest declares"""
+    return settings.WEB_MANIFEST_THEME_COLOR
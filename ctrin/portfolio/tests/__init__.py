@@ -0,0 +1 @@
+"""Run with ``python manage.py test portfolio.tests``"""
@@ -0,0 +1,60 @@
+import datetime
+
+from portfolio.models import Project
+
+from .utils import PortfolioTestCase, make_project
+
+
+class ProjectListApiTests(PortfolioTestCase):
+    @classmethod
+    def setUpTestData(cls):
+        # Several projects share a date, so the cursor has to break ties on id
+        dates = [1, 1, 1, 2, 2, 3, 4]
+        for i, day in enumerate(dates):
+            make_project(f'Project {i}', project_date=datetime.date(2024, 1, day))
+
+    def get(self, query='', headers=None):
+        return self.client.get(f'/api/projects/{query}', headers=headers)
+
+    def test_cursors_page_through_every_row_once(self):
+        expected = list(Project.objects.order_by('-project_date', '-id').values_list('slug', flat=True))
+        slugs, query = [], '?limit=2'
+        while True:
+            payload = self.get(query).json()
+            self.assertLessEqual(len(payload['results']), 2)
+            slugs += [row['slug'] for row in payload['results']]
+            if payload['next'] is None:
+                break
+            query = f"?limit=2&after={payload['next']}"
+        self.assertEqual(slugs, expected)
+
+    def test_malformed_cursor_is_a_bad_request(self):
+        for cursor in ('!!!', 'bm90LWEtY3Vyc29y', 'eHh8MQ'):
+            with self.subTest(cursor=cursor):
+                response = self.get(f'?after={cursor}')
+                self.assertEqual(response.status_code, 400)
+                self.assertEqual(response.json(), {'error': 'Invalid cursor'})
+
+    def test_bad_limit_is_a_bad_request(self):
+        for limit in ('0', '-1', 'ten'):
+            with self.subTest(limit=limit):
+                self.assertEqual(self.get(f'?limit={limit}').status_code, 400)
+
+    def test_limit_is_capped(self):
+        self.assertEqual(len(self.get('?limit=1000').json()['results']), Project.objects.count())
+
+    def test_fields_selects_columns(self):
+        rows = self.get('?fields=slug,title').json()['results']
+        self.assertEqual(set(rows[0]), {'slug', 'title'})
+
+    def test_unknown_field_is_a_bad_request(self):
+        response = self.get('?fields=slug,password')
+        self.assertEqual(response.status_code, 400)
+        self.assertEqual(response.json(), {'error': 'Unknown fields: password'})
+
+    def test_matching_etag_is_not_modified(self):
+        etag = self.get()['ETag']
+        response = self.get(headers={'If-None-Match': etag})
+        self.assertEqual(response.status_code, 304)
+        self.assertEqual(response['ETag'], etag)
+        self.assertEqual(self.get(headers={'If-None-Match': '"stale"'}).status_code, 200)
@@ -0,0 +1,68 @@
+from io import StringIO
+
+from django.core.management import call_command
+
+from portfolio.models import Category, Project
+from portfolio.publishing import set_published
+
+from .utils import PortfolioTestCase, make_project
+
+
+class CategoryCountTests(PortfolioTestCase):
+    def setUp(self):
+        super().setUp()
+        self.kitchen = Category.objects.create(name='Kitchen')
+        self.office = Category.objects.create(name='Office')
+
+    def assertCounts(self, category, projects, featured):
+        """Stored counts match ``projects``/``featured`` and a full recount finds nothing to repair"""
+        category.refresh_from_db()
+        self.assertEqual((category.project_count, category.featured_count), (projects, featured))
+        output = StringIO()
+        call_command('repair_category_counts', stdout=output)
+        self.assertIn('0 categories repaired', output.getvalue())
+
+    def test_create_and_delete(self):
+        project = make_project('Island', category=self.kitchen, is_featured=True)
+        make_project('Pantry', category=self.kitchen)
+        make_project('Draft', category=self.kitchen, is_published=False)
+        self.assertCounts(self.kitchen, 2, 1)
+        project.delete()
+        self.assertCounts(self.kitchen, 1, 0)
+
+    def test_category_change(self):
+        project = make_project('Island', category=self.kitchen, is_featured=True)
+        project.category = self.office
+        project.save()
+        self.assertCounts(self.kitchen, 0, 0)
+        self.assertCounts(self.office, 1, 1)
+        project.category = None
+        project.save()
+        self.assertCounts(self.office, 0, 0)
+
+    def test_toggle_featured(self):
+        project = make_project('Island', category=self.kitchen)
+        project.is_featured = True
+        project.save()
+        self.assertCounts(self.kitchen, 1, 1)
+        project.is_featured = False
+        project.save()
+        self.assertCounts(self.kitchen, 1, 0)
+
+    def test_set_published(self):
+        projects = [make_project(f'Project {i}', category=self.kitchen, is_featured=i == 0) for i in range(3)]
+        pks = [project.pk for project in projects[:2]]
+        with self.captureOnCommitCallbacks(execute=True):
+            set_published(Project, pks, False)
+        self.assertCounts(self.kitchen, 1, 0)
+        with self.captureOnCommitCallbacks(execute=True):
+            set_published(Project, pks, True)
+        self.assertCounts(self.kitchen, 3, 1)
+
+    def test_repair_fixes_drifted_counts(self):
+        make_project('Island', category=self.kitchen)
+        Category.objects.filter(pk=self.kitchen.pk).update(project_count=7)
+        output = StringIO()
+        call_command('repair_category_counts', stdout=output)
+        self.assertIn('Kitchen: 1 projects, 0 featured', output.getvalue())
+        self.assertCounts(self.kitchen, 1, 0)
@@ -0,0 +1,57 @@
+from django.test import override_settings
+
+from portfolio.models import ContactMessage
+from portfolio.ratelimit import SlidingWindowLimit, contact_email_limit, contact_ip_limit
+
+from .utils import PortfolioTestCase
+
+
+class SlidingWindowLimitTests(PortfolioTestCase):
+    def test_previous_window_counts_while_it_overlaps(self):
+        limit = SlidingWindowLimit('test', 2, 100)
+        self.assertEqual(limit.hit('a', now=1000), 0)
+        self.assertEqual(limit.hit('a', now=1010), 0)
+        self.assertEqual(limit.hit('a', now=1050), 50)
+        # Half of the previous window still overlaps: 2 * 0.5 + 0 < 2
+        self.assertEqual(limit.hit('a', now=1150), 0)
+        self.assertEqual(limit.hit('b', now=1050), 0)
+
+
+@override_settings(EMAIL_BACKEND='django.core.mail.backends.locmem.EmailBackend')
+class ContactViewTests(PortfolioTestCase):
+    url = '/contact/'
+
+    def post(self, ip='10.0.0.1', **data):
+        fields = {'name': 'Asha', 'email': 'asha@example.com', 'subject': 'Kitchen', 'message': 'Hello'}
+        fields.update(data)
+        return self.client.post(self.url, fields, REMOTE_ADDR=ip)
+
+    def test_ip_limit_answers_429_without_storing(self):
+        for i in range(contact_ip_limit.limit):
+            response = self.post(email=f'visitor{i}@example.com')
+            self.assertRedirects(response, self.url, fetch_redirect_response=False)
+        response = self.post(email='one-more@example.com')
+        self.assertEqual(response.status_code, 429)
+        self.assertGreater(int(response['Retry-After']), 0)
+        self.assertEqual(ContactMessage.objects.count(), contact_ip_limit.limit)
+
+    def test_filled_honeypot_redirects_without_storing(self):
+        response = self.post(website='http://spam.example')
+        self.assertRedirects(response, self.url, fetch_redirect_response=False)
+        self.assertFalse(ContactMessage.objects.exists())
+
+    def test_duplicate_message_is_stored_once(self):
+        for ip in ('10.0.0.1', '10.0.0.2'):
+            self.assertEqual(self.post(ip=ip).status_code, 302)
+        self.assertEqual(ContactMessage.objects.count(), 1)
+
+    def test_email_limit_only_counts_valid_submissions(self):
+        for i in range(contact_email_limit.limit):
+            # Invalid forms are re-rendered and do not use up the email's budget
+            self.assertEqual(self.post(ip=f'10.0.1.{i}', message='').status_code, 200)
+        for i in range(contact_email_limit.limit):
+            self.assertEqual(self.post(ip=f'10.0.2.{i}', message=f'Message {i}').status_code, 302)
+        response = self.post(ip='10.0.3.1', message='One too many')
+        self.assertEqual(response.status_code, 429)
+        self.assertIn('Retry-After', response)
+        self.assertEqual(ContactMessage.objects.count(), contact_email_limit.limit)
@@ -0,0 +1,53 @@
+import gzip
+
+from django.http import HttpResponse
+from django.test import RequestFactory, SimpleTestCase, override_settings
+
+from portfolio.middleware import HtmlCompressionMiddleware
+from portfolio.minify import minify_html
+from portfolio.storage import MIN_COMPRESS_SIZE
+
+
+class MinifyHtmlTests(SimpleTestCase):
+    def test_drops_comments_and_indentation(self):
+        html = '<div>\n    <!-- note -->\n    <p>Text</p>\n\n</div>'
+        self.assertEqual(minify_html(html), '<div>\n<p>Text</p>\n</div>')
+
+    def test_raw_elements_are_copied_verbatim(self):
+        for element in (
+            '<pre>  two\n    lines  </pre>',
+            '<textarea name="m">\n  keep\n</textarea>',
+            '<script>\n  // <!-- not a comment -->\n  let a = `\n    x`;\n</script>',
+            '<style>\n  p {  color: red;  }\n</style>',
+        ):
+            with self.subTest(element=element):
+                self.assertIn(element, minify_html(f'<body>\n  {element}\n</body>'))
+
+    def test_conditional_comments_are_kept(self):
+        comment = '<!--[if lt IE 9]><script src="shiv.js"></script><![endif]-->'
+        self.assertIn(comment, minify_html(f'<head>\n  {comment}\n</head>'))
+
+    def test_whitespace_without_a_newline_is_kept(self):
+        self.assertEqual(minify_html('<p>a  <b>b</b> \t c</p>'), '<p>a  <b>b</b> \t c</p>')
+
+
+@override_settings(HTML_MINIFY=True, HTML_COMPRESS=True)
+class HtmlCompressionMiddlewareTests(SimpleTestCase):
+    body = '<html>\n  <body>\n' + '    <p>Interior design</p>\n' * (MIN_COMPRESS_SIZE // 10) + '  </body>\n</html>'
+
+    def respond(self, body):
+        middleware = HtmlCompressionMiddleware(lambda request: HttpResponse(body))
+        request = RequestFactory().get('/', headers={'Accept-Encoding': 'gzip'})
+        return middleware(request)
+
+    def test_html_is_minified_and_compressed(self):
+        response = self.respond(self.body)
+        self.assertEqual(response['Content-Encoding'], 'gzip')
+        self.assertEqual(gzip.decompress(response.content).decode(), minify_html(self.body))
+        self.assertIn('Accept-Encoding', response['Vary'])
+
+    def test_pages_with_a_csrf_token_are_not_compressed(self):
+        body = self.body.replace('</body>', '<input type="hidden" name="csrfmiddlewaretoken" value="x"></body>')
+        response = self.respond(body)
+        self.assertFalse(response.has_header('Content-Encoding'))
+        self.assertEqual(response.content.decode(), minify_html(body))
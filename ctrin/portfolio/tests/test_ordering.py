@@ -0,0 +1,118 @@
+from django.contrib.auth.models import User
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+
+from portfolio.models import Service, Testimonial
+from portfolio.ordering import ORDER_GAP, apply_ordering, move_item, next_order
+
+from .utils import PortfolioTestCase
+
+
+class OrderingTests(PortfolioTestCase):
+    def setUp(self):
+        super().setUp()
+        self.a, self.b, self.c, self.d = [
+            Service.objects.create(name=name, description=name, order=(index + 1) * ORDER_GAP)
+            for index, name in enumerate('ABCD')
+        ]
+        self.services = Service.objects.all()
+
+    def assertOrder(self, queryset, items):
+        self.assertEqual(list(queryset.all()), items)
+
+    def updates(self, context):
+        return [query['sql'] for query in context.captured_queries if query['sql'].startswith('UPDATE')]
+
+    def test_next_order(self):
+        self.assertEqual(next_order(self.services), 5 * ORDER_GAP)
+        self.assertEqual(next_order(Testimonial.objects.all()), ORDER_GAP)
+
+    def test_move_to_first_and_last(self):
+        move_item(self.services, self.c.pk)
+        self.assertOrder(self.services, [self.c, self.a, self.b, self.d])
+        move_item(self.services, self.a.pk, after=self.d.pk)
+        self.assertOrder(self.services, [self.c, self.b, self.d, self.a])
+
+    def test_move_writes_only_the_moved_row(self):
+        with self.assertNumQueries(2):
+            changed = move_item(self.services, str(self.d.pk), before=str(self.b.pk))
+        self.assertEqual(changed, {self.d.pk: ORDER_GAP + ORDER_GAP // 2})
+        self.assertOrder(self.services, [self.a, self.d, self.b, self.c])
+
+    def test_exhausted_gap_renumbers(self):
+        Service.objects.filter(pk=self.a.pk).update(order=0)
+        Service.objects.filter(pk=self.b.pk).update(order=1)
+        changed = move_item(self.services, self.c.pk, after=self.a.pk)
+        self.assertOrder(self.services, [self.a, self.c, self.b, self.d])
+        self.assertEqual(
+            list(self.services.values_list('order', flat=True)),
+            [ORDER_GAP, 2 * ORDER_GAP, 3 * ORDER_GAP, 4 * ORDER_GAP],
+        )
+        # D already sits at 4 * ORDER_GAP
+        self.assertEqual(set(changed), {self.a.pk, self.b.pk, self.c.pk})
+
+    def test_apply_ordering_writes_only_changed_rows(self):
+        with CaptureQueriesContext(connection) as context:
+            changed = apply_ordering(self.services, [self.b.pk, self.a.pk, self.c.pk, self.d.pk])
+        self.assertEqual(changed, {self.b.pk: ORDER_GAP, self.a.pk: 2 * ORDER_GAP})
+        self.assertEqual(len(self.updates(context)), 1)
+        self.assertOrder(self.services, [self.b, self.a, self.c, self.d])
+
+        with CaptureQueriesContext(connection) as context:
+            self.assertEqual(apply_ordering(self.services, [self.b.pk, self.a.pk, self.c.pk, self.d.pk]), {})
+        self.assertEqual(self.updates(context), [])
+
+    def test_invalid_ordering(self):
+        for pks in (
+            [self.a.pk, self.b.pk, self.c.pk],
+            [self.a.pk, self.b.pk, self.c.pk, self.c.pk],
+            [self.a.pk, self.b.pk, self.c.pk, self.d.pk, self.d.pk + 1],
+        ):
+            with self.subTest(pks=pks), self.assertRaises(ValueError):
+                apply_ordering(self.services, pks)
+        with self.assertRaisesMessage(ValueError, 'Unknown item'):
+            move_item(self.services, self.d.pk + 1)
+        with self.assertRaisesMessage(ValueError, 'Unknown neighbour'):
+            move_item(self.services, self.a.pk, after=self.d.pk + 1)
+        with self.assertRaisesMessage(ValueError, 'Unknown neighbour'):
+            move_item(self.services, self.a.pk, before=self.a.pk)
+        self.assertOrder(self.services, [self.a, self.b, self.c, self.d])
+
+    def test_testimonials_across_the_featured_boundary(self):
+        # Featured testimonials come first, so order drops from F2 to O1
+        o1, o2 = [Testimonial.objects.create(client_name=name, content=name, order=order)
+                  for name, order in (('O1', ORDER_GAP), ('O2', 2 * ORDER_GAP))]
+        f1, f2 = [Testimonial.objects.create(client_name=name, content=name, is_featured=True, order=order)
+                  for name, order in (('F1', 5 * ORDER_GAP), ('F2', 6 * ORDER_GAP))]
+        testimonials = Testimonial.objects.all()
+        self.assertOrder(testimonials, [f1, f2, o1, o2])
+
+        move_item(testimonials, o2.pk, after=f2.pk)
+        self.assertOrder(testimonials.filter(is_featured=False), [o2, o1])
+        self.assertOrder(testimonials, [f1, f2, o2, o1])
+
+        move_item(testimonials, f1.pk, after=f2.pk)
+        self.assertOrder(testimonials, [f2, f1, o2, o1])
+
+
+class ReorderViewTests(PortfolioTestCase):
+    url = '/admin/portfolio/service/reorder/'
+
+    def setUp(self):
+        super().setUp()
+        self.client.force_login(User.objects.create_superuser('admin', 'admin@example.com', 'password'))
+        self.a, self.b = [Service.objects.create(name=name, description=name, order=(index + 1) * ORDER_GAP)
+                          for index, name in enumerate('AB')]
+
+    def post(self, body):
+        return self.client.post(self.url, body, content_type='application/json')
+
+    def test_reorder(self):
+        response = self.post({'move': self.b.pk})
+        self.assertEqual(response.json(), {'changed': {str(self.b.pk): (ORDER_GAP - 1) // 2}})
+        self.assertEqual(list(Service.objects.all()), [self.b, self.a])
+
+    def test_invalid_requests(self):
+        for body in ({'move': 'x'}, {'move': self.a.pk, 'after': 'x'}, {'order': [self.a.pk]}, {'order': 'x'}, {}, 'x'):
+            with self.subTest(body=body):
+                self.assertEqual(self.post(body).status_code, 400)
@@ -0,0 +1,61 @@
+from io import StringIO
+
+from django.conf import settings
+from django.contrib.auth.models import User
+from django.core.management import call_command
+from django.test import Client
+from django.urls import reverse
+from django.utils.cache import cc_delim_re
+
+from portfolio.models import Category, Service, TeamMember
+from portfolio.warming import public_urls
+
+from .utils import PortfolioTestCase, image_file, make_post, make_project
+
+
+def header_tokens(response, name):
+    return {token.strip().lower() for token in cc_delim_re.split(response.get(name, '')) if token.strip()}
+
+
+class PublicHeaderTests(PortfolioTestCase):
+    @classmethod
+    def setUpTestData(cls):
+        category = Category.objects.create(name='Residential')
+        make_project('Loft', category=category, is_featured=True)
+        make_project('Studio')
+        make_post('Lighting', author=User.objects.create_user('editor'))
+        Service.objects.create(name='Design', description='Design')
+        TeamMember.objects.create(name='Asha', position='designer', image=image_file())
+
+    def fetch(self, url):
+        # A fresh client per request, so no cookie is ever sent
+        return Client().get(url, secure=True)
+
+    def test_public_pages_are_shareable(self):
+        urls = public_urls() + [reverse('portfolio:web_manifest')]
+        self.assertIn(reverse('portfolio:project_detail', args=['loft']), urls)
+        for url in urls:
+            for attempt in ('miss', 'hit'):
+                with self.subTest(url=url, attempt=attempt):
+                    response = self.fetch(url)
+                    self.assertEqual(response.status_code, 200)
+                    self.assertEqual(dict(response.cookies), {})
+                    self.assertNotIn('Set-Cookie', response)
+                    self.assertNotIn('cookie', header_tokens(response, 'Vary'))
+                    self.assertEqual(
+                        header_tokens(response, 'Cache-Control'),
+                        {'public', f'max-age={settings.PUBLIC_PAGE_MAX_AGE}'},
+                    )
+
+    def test_contact_page_is_private_with_a_scoped_csrf_cookie(self):
+        url = reverse('portfolio:contact')
+        response = self.fetch(url)
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.cookies[settings.CSRF_COOKIE_NAME]['path'], url)
+        self.assertEqual(set(response.cookies), {settings.CSRF_COOKIE_NAME})
+        self.assertIn('private', header_tokens(response, 'Cache-Control'))
+
+    def test_check_public_headers_command(self):
+        out = StringIO()
+        call_command('check_public_headers', stdout=out)
+        self.assertIn(f'{len(public_urls()) + 1} URLs send the expected caching headers', out.getvalue())
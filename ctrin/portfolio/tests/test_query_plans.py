@@ -0,0 +1,59 @@
+from django.test import override_settings
+
+from portfolio.queryplans import explain_problems, extra_querysets, page_queries, public_requests, seed
+
+from .utils import PortfolioTestCase
+
+# Enough rows for the planner to prefer an index whenever one can serve the query
+SCALE = 300
+
+
+@override_settings(CACHES={'default': {'BACKEND': 'django.core.cache.backends.dummy.DummyCache'}})
+class QueryPlanTests(PortfolioTestCase):
+    """Every public query must be served by an index, without a full scan or a temp sort"""
+
+    @classmethod
+    def setUpTestData(cls):
+        seed(SCALE)
+        cls.requests = public_requests()
+
+    def assertPagesUseIndexes(self, group):
+        for url in self.requests[group]:
+            status, selects = page_queries(self.client, url)
+            self.assertEqual(status, 200, url)
+            for sql in selects:
+                with self.subTest(url=url, sql=sql):
+                    self.assertEqual(explain_problems(sql, ()), [])
+
+    def test_home(self):
+        self.assertPagesUseIndexes('home')
+
+    def test_projects(self):
+        self.assertPagesUseIndexes('projects')
+
+    def test_project_detail(self):
+        self.assertPagesUseIndexes('project detail')
+
+    def test_services(self):
+        self.assertPagesUseIndexes('services')
+
+    def test_team(self):
+        self.assertPagesUseIndexes('team')
+
+    def test_blog(self):
+        self.assertPagesUseIndexes('blog')
+
+    def test_blog_detail(self):
+        self.assertPagesUseIndexes('blog detail')
+
+    def test_contact(self):
+        self.assertPagesUseIndexes('contact')
+
+    def test_api(self):
+        self.assertPagesUseIndexes('api')
+
+    def test_admin_and_scheduler_querysets(self):
+        for label, queryset in extra_querysets().items():
+            sql, params = queryset.query.sql_with_params()
+            with self.subTest(label):
+                self.assertEqual(explain_problems(sql, params), [])
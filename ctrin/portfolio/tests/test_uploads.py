@@ -0,0 +1,96 @@
+import os
+import time
+
+from django.conf import settings
+from django.contrib.auth.models import User
+from django.test import override_settings
+from django.urls import reverse
+
+from portfolio.models import ProjectImage
+from portfolio.ordering import ORDER_GAP
+from portfolio.uploads import ChunkedUpload, purge_expired_uploads
+
+from .utils import PortfolioTestCase, image_file, make_project
+
+
+@override_settings(CHUNKED_UPLOAD_CHUNK_SIZE=256, CHUNKED_UPLOAD_MAX_SIZE=64 * 1024)
+class ChunkedUploadViewTests(PortfolioTestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.user = User.objects.create_superuser('admin', 'admin@example.com', 'password')
+        cls.project = make_project('Loft')
+        ProjectImage.objects.create(project=cls.project, image=image_file(), order=ORDER_GAP)
+
+    def setUp(self):
+        super().setUp()
+        self.client.force_login(self.user)
+        self.data = image_file('gallery.jpg', size=(64, 48)).read()
+
+    def start(self, size=None):
+        url = reverse('admin:portfolio_project_upload_start', args=[self.project.pk])
+        return self.client.post(url, {'filename': 'gallery.jpg', 'size': size or len(self.data)},
+                                content_type='application/json')
+
+    def patch(self, url, offset, chunk):
+        return self.client.patch(url, chunk, content_type='application/offset+octet-stream',
+                                 headers={'Upload-Offset': str(offset)})
+
+    def test_wrong_offset_is_a_conflict_carrying_the_expected_offset(self):
+        url = self.start().json()['url']
+        response = self.patch(url, 100, self.data[:100])
+        self.assertEqual(response.status_code, 409)
+        self.assertEqual(response.json()['offset'], 0)
+        self.assertEqual(response['Upload-Offset'], '0')
+
+    def test_resume_and_finish(self):
+        url = self.start().json()['url']
+        self.assertEqual(self.patch(url, 0, self.data[:200]).json()['offset'], 200)
+
+        # After a dropped connection the client asks where to resume
+        offset = self.client.get(url).json()['offset']
+        self.assertEqual(offset, 200)
+        response = None
+        while offset < len(self.data):
+            chunk = self.data[offset:offset + settings.CHUNKED_UPLOAD_CHUNK_SIZE]
+            response = self.patch(url, offset, chunk)
+            offset += len(chunk)
+
+        self.assertEqual(response.status_code, 201)
+        image = ProjectImage.objects.get(pk=response.json()['image']['id'])
+        self.assertEqual(image.project, self.project)
+        self.assertEqual(image.order, 2 * ORDER_GAP)
+        self.assertEqual((image.image_width, image.image_height), (64, 48))
+        self.assertEqual(self.client.get(url).status_code, 404)
+
+    def test_oversize_upload_and_chunk_are_rejected(self):
+        self.assertEqual(self.start(size=settings.CHUNKED_UPLOAD_MAX_SIZE + 1).status_code, 413)
+        url = self.start().json()['url']
+        response = self.patch(url, 0, self.data[:settings.CHUNKED_UPLOAD_CHUNK_SIZE + 1])
+        self.assertEqual(response.status_code, 413)
+        self.assertEqual(response.json()['offset'], 0)
+
+    def test_invalid_image_is_rejected(self):
+        url = self.start(size=300).json()['url']
+        for offset in (0, 256):
+            response = self.patch(url, offset, b'x' * min(256, 300 - offset))
+        self.assertEqual(response.status_code, 422)
+        self.assertEqual(self.project.images.count(), 1)
+
+
+class UploadExpiryTests(PortfolioTestCase):
+    def setUp(self):
+        super().setUp()
+        self.user = User.objects.create_user('editor')
+        self.upload = ChunkedUpload.create(make_project('Loft'), self.user, 'a.jpg', 10)
+        self.expired = time.time() - settings.CHUNKED_UPLOAD_EXPIRY - 60
+
+    def test_recent_chunk_keeps_an_old_session(self):
+        os.utime(self.upload.path, (self.expired, self.expired))
+        self.assertEqual(purge_expired_uploads(), 0)
+        self.assertTrue(os.path.isdir(self.upload.path))
+
+    def test_idle_session_is_purged(self):
+        for path in (self.upload.data_path, self.upload.path):
+            os.utime(path, (self.expired, self.expired))
+        self.assertEqual(purge_expired_uploads(), 1)
+        self.assertFalse(os.path.exists(self.upload.path))
@@ -0,0 +1,66 @@
+import datetime
+import io
+import shutil
+import tempfile
+
+from django.conf import settings
+from django.core.cache import cache
+from django.core.files.uploadedfile import SimpleUploadedFile
+from django.test import TestCase, override_settings
+from PIL import Image
+
+from portfolio.analytics import not_found_counter, view_counter
+from portfolio.models import Project, BlogPost
+
+
+def image_file(name='image.jpg', size=(32, 24), color=(120, 80, 200)):
+    buffer = io.BytesIO()
+    Image.new('RGB', size, color).save(buffer, 'JPEG')
+    return SimpleUploadedFile(name, buffer.getvalue(), content_type='image/jpeg')
+
+
+def make_project(title, **kwargs):
+    kwargs.setdefault('description', f'{title} description')
+    kwargs.setdefault('project_date', datetime.date(2024, 1, 1))
+    kwargs.setdefault('featured_image', image_file())
+    return Project.objects.create(title=title, **kwargs)
+
+
+def make_post(title, **kwargs):
+    kwargs.setdefault('content', f'{title} content')
+    kwargs.setdefault('featured_image', image_file())
+    return BlogPost.objects.create(title=title, **kwargs)
+
+
+class PortfolioTestCase(TestCase):
+    """TestCase with throwaway file directories, unhashed static files, an empty cache and no analytics left buffered"""
+
+    @classmethod
+    def setUpClass(cls):
+        cls.file_root = tempfile.mkdtemp()
+        cls.file_settings = override_settings(
+            STORAGES=dict(settings.STORAGES, staticfiles={
+                'BACKEND': 'django.contrib.staticfiles.storage.StaticFilesStorage',
+            }),
+            MEDIA_ROOT=f'{cls.file_root}/media',
+            CHUNKED_UPLOAD_DIR=f'{cls.file_root}/uploads',
+            PROJECT_ARCHIVE_DIR=f'{cls.file_root}/archives',
+            CRITICAL_CSS_DIR=f'{cls.file_root}/critical_css',
+            CACHE_WARM_ON_SAVE=False,
+        )
+        cls.file_settings.enable()
+        super().setUpClass()
+
+    @classmethod
+    def tearDownClass(cls):
+        super().tearDownClass()
+        cls.file_settings.disable()
+        shutil.rmtree(cls.file_root, ignore_errors=True)
+
+    def setUp(self):
+        cache.clear()
+
+    def tearDown(self):
+        # Write buffered analytics inside the test transaction, not at exit
+        view_counter.flush()
+        not_found_counter.flush()
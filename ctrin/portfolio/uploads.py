@@ -0,0 +1,159 @@
+import json
+import os
+import shutil
+import time
+import uuid
+
+from django import forms
+from django.conf import settings
+from django.core.exceptions import ValidationError
+from django.core.files.uploadedfile import UploadedFile
+from django.db import transaction
+from django.utils.text import get_valid_filename
+
+from .models import ProjectImage
+from .ordering import next_order
+
+STREAM_BLOCK_SIZE = 64 * 1024
+
+
+class UploadError(Exception):
+    def __init__(self, message, status=400, offset=None):
+        super().__init__(message)
+        self.status = status
+        self.offset = offset
+
+
+class AssembledFile(UploadedFile):
+    """An upload already on disk; validation opens it by path instead of reading it into memory"""
+
+    def temporary_file_path(self):
+        return self.file.name
+
+
+def last_activity(path):
+    """When a session was created or last received a chunk
+
+    Appending to the partial file does not change the directory's mtime,
+    so the data file's own mtime counts too.
+    """
+    times = [os.path.getmtime(path)]
+    data_path = os.path.join(path, 'data')
+    if os.path.exists(data_path):
+        times.append(os.path.getmtime(data_path))
+    return max(times)
+
+
+def purge_expired_uploads(now=None):
+    """Delete upload sessions untouched for CHUNKED_UPLOAD_EXPIRY seconds; returns how many"""
+    root = settings.CHUNKED_UPLOAD_DIR
+    if not os.path.isdir(root):
+        return 0
+    cutoff = (now or time.time()) - settings.CHUNKED_UPLOAD_EXPIRY
+    purged = 0
+    for name in os.listdir(root):
+        path = os.path.join(root, name)
+        if last_activity(path) < cutoff:
+            shutil.rmtree(path, ignore_errors=True)
+            purged += 1
+    return purged
+
+
+class ChunkedUpload:
+    """A resumable upload of one gallery image, kept on disk until it is complete
+
+    Each session is a directory holding the partial file and a small JSON
+    description. Chunks must arrive at the current offset and are streamed
+    from the request straight to the partial file, so resuming after a
+    failure only needs the offset and memory use never depends on file size.
+    """
+
+    def __init__(self, upload_id, meta):
+        self.id = upload_id
+        self.meta = meta
+        self.path = os.path.join(settings.CHUNKED_UPLOAD_DIR, upload_id)
+        self.data_path = os.path.join(self.path, 'data')
+
+    @classmethod
+    def create(cls, project, user, filename, size):
+        if not filename:
+            raise UploadError('A file name is required')
+        if size <= 0 or size > settings.CHUNKED_UPLOAD_MAX_SIZE:
+            raise UploadError(f'Files must be between 1 byte and {settings.CHUNKED_UPLOAD_MAX_SIZE} bytes', 413)
+        purge_expired_uploads()
+        upload = cls(str(uuid.uuid4()), {
+            'filename': get_valid_filename(os.path.basename(filename)),
+            'size': size,
+            'project_id': project.pk,
+            'user_id': user.pk,
+        })
+        os.makedirs(upload.path)
+        open(upload.data_path, 'wb').close()
+        with open(os.path.join(upload.path, 'meta.json'), 'w') as f:
+            json.dump(upload.meta, f)
+        return upload
+
+    @classmethod
+    def load(cls, upload_id, project, user):
+        path = os.path.join(settings.CHUNKED_UPLOAD_DIR, upload_id, 'meta.json')
+        try:
+            with open(path) as f:
+                meta = json.load(f)
+        except (OSError, ValueError):
+            raise UploadError('Unknown or expired upload', 404)
+        if meta['project_id'] != project.pk or meta['user_id'] != user.pk:
+            raise UploadError('Unknown or expired upload', 404)
+        return cls(upload_id, meta)
+
+    @property
+    def offset(self):
+        return os.path.getsize(self.data_path)
+
+    @property
+    def is_complete(self):
+        return self.offset == self.meta['size']
+
+    def write_chunk(self, offset, stream, length):
+        """Append ``length`` bytes read from ``stream`` at ``offset``; returns the new offset"""
+        current = self.offset
+        if offset != current:
+            raise UploadError('Offset mismatch', 409, current)
+        if length <= 0 or length > settings.CHUNKED_UPLOAD_CHUNK_SIZE or current + length > self.meta['size']:
+            raise UploadError('Invalid chunk length', 413, current)
+
+        with open(self.data_path, 'r+b') as f:
+            f.seek(current)
+            remaining = length
+            while remaining:
+                block = stream.read(min(STREAM_BLOCK_SIZE, remaining))
+                if not block:
+                    break
+                f.write(block)
+                remaining -= len(block)
+            if remaining:
+                # The client went away mid-chunk; drop the partial chunk so it can be resent
+                f.truncate(current)
+                raise UploadError('Incomplete chunk', 400, current)
+        return current + length
+
+    def finish(self, project):
+        """Validate the assembled file and attach it to ``project`` as a new gallery image"""
+        if not self.is_complete:
+            raise UploadError('Upload is not complete', 409, self.offset)
+        with open(self.data_path, 'rb') as f:
+            uploaded = AssembledFile(f, name=self.meta['filename'], size=self.meta['size'])
+            try:
+                forms.ImageField().clean(uploaded)
+            except ValidationError as e:
+                self.discard()
+                raise UploadError(' '.join(e.messages), 422)
+            f.seek(0)
+            with transaction.atomic():
+                image = ProjectImage(project=project, order=next_order(project.images.all()))
+                image.image.save(self.meta['filename'], uploaded, save=False)
+                image.save()
+        self.discard()
+        return image
+
+    def discard(self):
+        shutil.rmtree(self.path, ignore_errors=True)
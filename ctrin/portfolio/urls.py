@@ -1,8 +1,12 @@
 from django.urls import path
 from .views import (
-    HomeView, ProjectListView, ProjectDetailView,
+    HomeView, ProjectListView, ProjectDetailView, ProjectDownloadView,
     ServiceListView, TeamView, BlogListView, BlogDetailView,
-    ContactView
+    ContactView, ServiceWorkerView, WebManifestView
+)
+from .api import (
+    ProjectListApi, ProjectDetailApi, ServiceListApi, TeamListApi,
+    BlogListApi, BlogDetailApi
 )
 
 app_name = 'portfolio'
@@ -11,9 +15,20 @@ urlpatterns = [
     path('', HomeView.as_view(), name='home'),
     path('projects/', ProjectListView.as_view(), name='projects'),
     path('projects/<slug:slug>/', ProjectDetailView.as_view(), name='project_detail'),
+    path('projects/<slug:slug>/download/', ProjectDownloadView.as_view(), name='project_download'),
     path('services/', ServiceListView.as_view(), name='services'),
     path('team/', TeamView.as_view(), name='team'),
     path('blog/', BlogListView.as_view(), name='blog'),
     path('blog/<slug:slug>/', BlogDetailView.as_view(), name='blog_detail'),
     path('contact/', ContactView.as_view(), name='contact'),
+    path('sw.js', ServiceWorkerView.as_view(), name='service_worker'),
+    path('manifest.webmanifest', WebManifestView.as_view(), name='web_manifest'),
+
+    # Read-only JSON API
+    path('api/projects/', ProjectListApi.as_view(), name='api_projects'),
+    path('api/projects/<slug:slug>/', ProjectDetailApi.as_view(), name='api_project_detail'),
+    path('api/services/', ServiceListApi.as_view(), name='api_services'),
+    path('api/team/', TeamListApi.as_view(), name='api_team'),
+    path('api/blog/', BlogListApi.as_view(), name='api_blog'),
+    path('api/blog/<slug:slug>/', BlogDetailApi.as_view(), name='api_blog_detail'),
 ]
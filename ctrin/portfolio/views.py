@@ -1,29 +1,88 @@
+import json
+
 from django.shortcuts import render, get_object_or_404, redirect
 from django.views import View
 from django.views.generic import ListView, DetailView
 from django.core.mail import send_mail
 from django.contrib import messages
 from django.conf import settings
+from django.core.cache import cache
+from django.db import DatabaseError
+from django.http import FileResponse, HttpResponse, JsonResponse, HttpResponseServerError, StreamingHttpResponse
+from django.template.loader import render_to_string
+from django.utils.cache import patch_cache_control
+from django.utils.decorators import method_decorator
+from django.utils.http import content_disposition_header
+from django.views.decorators.cache import never_cache
 from .models import (
     Project, Category, Service, TeamMember, Testimonial,
-    BlogPost, SiteSettings, ContactMessage
+    BlogPost, SiteSettings, ContactMessage, RelatedProject, RelatedBlogPost
 )
 from .forms import ContactForm
+from .cache import CachedPageMixin
+from .hints import PreloadImageMixin
+from .analytics import ViewCountMixin, record_not_found
+from .archives import prebuilt_archive, project_archive
+from .notfound import appends_slash
+from .serviceworker import service_worker_config, web_manifest
+from .ratelimit import (
+    client_ip, contact_email_limit, contact_ip_limit, is_duplicate, too_many_requests
+)
+
+
+CONTACT_SUCCESS_MESSAGE = "Thank you! Your message has been sent successfully. We'll get back to you soon."
+
+# Large blog columns that list pages never display
+BLOG_BODY_FIELDS = ('content', 'content_html')
+
+
+SITE_SETTINGS_CACHE_KEY = 'portfolio:site-settings'
+ERROR_PAGE_CACHE_KEY = 'portfolio:error-page:{}'
+
+# Last resort when even the error template cannot be rendered
+FALLBACK_ERROR_PAGE = (
+    '<!DOCTYPE html><html lang="en"><head><meta charset="UTF-8"><title>{title} | Ctrin Interiors</title></head>'
+    '<body style="font-family: sans-serif; text-align: center; padding: 4rem 1rem;">'
+    '<h1>{title}</h1><p><a href="/">Back to Home</a></p></body></html>'
+)
 
 
 def get_site_settings():
-    """Get or create site settings"""
-    settings_obj, _ = SiteSettings.objects.get_or_create(pk=1)
+    """Get or create site settings, cached; unsaved defaults when the database is down"""
+    settings_obj = cache.get(SITE_SETTINGS_CACHE_KEY)
+    if settings_obj is None:
+        try:
+            settings_obj, _ = SiteSettings.objects.get_or_create(pk=1)
+        except DatabaseError:
+            return SiteSettings(pk=1)
+        cache.set(SITE_SETTINGS_CACHE_KEY, settings_obj, None)
     return settings_obj
 
 
-class HomeView(View):
+def invalidate_site_settings():
+    cache.delete_many([SITE_SETTINGS_CACHE_KEY] + [ERROR_PAGE_CACHE_KEY.format(status) for status in (404, 500)])
+
+
+def render_error_page(status, template_name):
+    """Error page body rendered once without the request, so it never needs the database"""
+    key = ERROR_PAGE_CACHE_KEY.format(status)
+    content = cache.get(key)
+    if content is None:
+        content = render_to_string(template_name, {'site_settings': get_site_settings()})
+        cache.set(key, content, settings.PAGE_CACHE_TIMEOUT)
+    return HttpResponse(content, status=status)
+
+
+class HomeView(CachedPageMixin, View):
     """Home page with featured projects, services, testimonials, and recent blog posts"""
+    template_name = 'home.html'
+
     def get(self, request):
-        featured_projects = Project.objects.filter(is_featured=True)[:6]
+        featured_projects = Project.objects.published().filter(is_featured=True)[:6]
         featured_testimonials = Testimonial.objects.filter(is_featured=True)[:3]
         services = Service.objects.all()[:6]
-        recent_posts = BlogPost.objects.filter(is_published=True)[:3]
+        recent_posts = BlogPost.objects.published().defer(*BLOG_BODY_FIELDS)[:3]
+        popular_projects = Project.objects.published().filter(popularity__gt=0).order_by('-popularity')[:3]
         site_settings = get_site_settings()
         
         context = {
@@ -31,12 +90,13 @@ class HomeView(View):
             'featured_testimonials': featured_testimonials,
             'services': services,
             'recent_posts': recent_posts,
+            'popular_projects': popular_projects,
             'site_settings': site_settings,
         }
-        return render(request, 'home.html', context)
+        return render(request, self.template_name, context)
 
 
-class ProjectListView(ListView):
+class ProjectListView(CachedPageMixin, ListView):
     """Display all projects with filtering by category"""
     model = Project
     template_name = 'projects.html'
@@ -44,7 +104,7 @@ class ProjectListView(ListView):
     paginate_by = 12
     
     def get_queryset(self):
-        queryset = Project.objects.all()
+        queryset = Project.objects.published()
         category_slug = self.request.GET.get('category')
         if category_slug:
             queryset = queryset.filter(category__slug=category_slug)
@@ -52,30 +112,69 @@ class ProjectListView(ListView):
     
     def get_context_data(self, **kwargs):
         context = super().get_context_data(**kwargs)
-        context['categories'] = Category.objects.all()
+        context['categories'] = Category.objects.filter(project_count__gt=0)
         context['selected_category'] = self.request.GET.get('category', '')
         context['site_settings'] = get_site_settings()
         return context
 
 
-class ProjectDetailView(DetailView):
+class ProjectDetailView(ViewCountMixin, CachedPageMixin, PreloadImageMixin, DetailView):
     """Display single project with full details and gallery"""
     model = Project
+    view_kind = 'project'
     template_name = 'project_detail.html'
     slug_field = 'slug'
     context_object_name = 'project'
     
+    def get_queryset(self):
+        return Project.objects.published()
+    
     def get_context_data(self, **kwargs):
         context = super().get_context_data(**kwargs)
-        context['related_projects'] = Project.objects.filter(
-            category=self.object.category
-        ).exclude(id=self.object.id)[:3]
+        context['related_projects'] = [
+            link.target for link in RelatedProject.objects.filter(source=self.object).select_related('target')
+        ]
         context['site_settings'] = get_site_settings()
         return context
 
 
-class ServiceListView(View):
+class ProjectDownloadView(View):
+    """Download a project's featured image and gallery as one ZIP archive"""
+    def get(self, request, slug):
+        project = get_object_or_404(Project.objects.published().prefetch_related('images'), slug=slug)
+        filename = f"{project.slug}.zip"
+        path = prebuilt_archive(project)
+        if path:
+            return FileResponse(open(path, 'rb'), as_attachment=True, filename=filename,
+                                content_type='application/zip')
+        response = StreamingHttpResponse(project_archive(project), content_type='application/zip')
+        response['Content-Disposition'] = content_disposition_header(True, filename)
+        return response
+
+
+class ServiceWorkerView(View):
+    """The site's service worker, generated from the deployed static files and URL conf"""
+    def get(self, request):
+        config = json.dumps(service_worker_config(), separators=(',', ':'))
+        response = render(request, 'sw.js', {'config': config}, content_type='application/javascript')
+        # Browsers re-check the worker on every navigation; a new deploy changes its bytes
+        response['Cache-Control'] = 'no-cache'
+        response['Service-Worker-Allowed'] = '/'
+        return response
+
+
+class WebManifestView(View):
+    """Web app manifest built from the site settings"""
+    def get(self, request):
+        response = JsonResponse(web_manifest(get_site_settings()), content_type='application/manifest+json')
+        patch_cache_control(response, public=True, max_age=settings.PUBLIC_PAGE_MAX_AGE)
+        return response
+
+
+class ServiceListView(CachedPageMixin, View):
     """Display all services"""
+    template_name = 'services.html'
+
     def get(self, request):
         services = Service.objects.all()
         site_settings = get_site_settings()
@@ -84,11 +183,13 @@ class ServiceListView(View):
             'services': services,
             'site_settings': site_settings,
         }
-        return render(request, 'services.html', context)
+        return render(request, self.template_name, context)
 
 
-class TeamView(View):
+class TeamView(CachedPageMixin, View):
     """Display team members"""
+    template_name = 'team.html'
+
     def get(self, request):
         team_members = TeamMember.objects.all()
         site_settings = get_site_settings()
@@ -97,10 +198,10 @@ class TeamView(View):
             'team_members': team_members,
             'site_settings': site_settings,
         }
-        return render(request, 'team.html', context)
+        return render(request, self.template_name, context)
 
 
-class BlogListView(ListView):
+class BlogListView(CachedPageMixin, ListView):
     """Display all published blog posts with pagination"""
     model = BlogPost
     template_name = 'blog.html'
@@ -108,34 +209,46 @@ class BlogListView(ListView):
     paginate_by = 9
     
     def get_queryset(self):
-        return BlogPost.objects.filter(is_published=True)
+        return BlogPost.objects.published().defer(*BLOG_BODY_FIELDS)
     
     def get_context_data(self, **kwargs):
         context = super().get_context_data(**kwargs)
-        context['recent_posts'] = BlogPost.objects.filter(is_published=True)[:5]
+        context['recent_posts'] = BlogPost.objects.published().only('title', 'slug', 'created_at')[:5]
         context['site_settings'] = get_site_settings()
         return context
 
 
-class BlogDetailView(DetailView):
+class BlogDetailView(ViewCountMixin, CachedPageMixin, PreloadImageMixin, DetailView):
     """Display single blog post with related posts"""
     model = BlogPost
+    view_kind = 'blog'
     template_name = 'blog_detail.html'
     slug_field = 'slug'
     context_object_name = 'post'
     
     def get_queryset(self):
-        return BlogPost.objects.filter(is_published=True)
+        return BlogPost.objects.published()
     
     def get_context_data(self, **kwargs):
         context = super().get_context_data(**kwargs)
-        context['recent_posts'] = BlogPost.objects.filter(is_published=True)[:5]
+        context['related_posts'] = [
+            link.target for link in RelatedBlogPost.objects.filter(
+                source=self.object
+            ).select_related('target').defer(*(f'target__{field}' for field in BLOG_BODY_FIELDS))
+        ]
+        context['recent_posts'] = BlogPost.objects.published().only('title', 'slug', 'created_at')[:5]
+        context['popular_posts'] = BlogPost.objects.published().filter(
+            popularity__gt=0
+        ).order_by('-popularity').only('title', 'slug')[:5]
         context['site_settings'] = get_site_settings()
         return context
 
 
+@method_decorator(never_cache, name='dispatch')
 class ContactView(View):
     """Contact form page with contact information"""
+    template_name = 'contact.html'
+
     def get(self, request):
         form = ContactForm()
         site_settings = get_site_settings()
@@ -144,11 +257,28 @@ class ContactView(View):
             'form': form,
             'site_settings': site_settings,
         }
-        return render(request, 'contact.html', context)
+        return render(request, self.template_name, context)
     
     def post(self, request):
+        # Throttle before touching the database or rendering anything
+        retry_after = contact_ip_limit.hit(client_ip(request))
+        if retry_after:
+            return too_many_requests(retry_after)
+
         form = ContactForm(request.POST)
+        if form.is_honeypot_filled():
+            # Look like a success so bots don't adapt
+            return redirect('portfolio:contact')
+
         if form.is_valid():
+            data = form.cleaned_data
+            retry_after = contact_email_limit.hit(data['email'])
+            if retry_after:
+                return too_many_requests(retry_after)
+            if is_duplicate(data['email'], data['subject'], data['message']):
+                messages.success(request, CONTACT_SUCCESS_MESSAGE)
+                return redirect('portfolio:contact')
+
             contact_message = form.save()
             
             # Send email to admin
@@ -181,7 +311,7 @@ class ContactView(View):
             except Exception as e:
                 print(f"Email error: {e}")
             
-            messages.success(request, "Thank you! Your message has been sent successfully. We'll get back to you soon.")
+            messages.success(request, CONTACT_SUCCESS_MESSAGE)
             return redirect('portfolio:contact')
         
         site_settings = get_site_settings()
@@ -189,16 +319,19 @@ class ContactView(View):
             'form': form,
             'site_settings': site_settings,
         }
-        return render(request, 'contact.html', context)
+        return render(request, self.template_name, context)
 
 
 def page_not_found(request, exception=None):
     """404 error handler"""
-    site_settings = get_site_settings()
-    return render(request, '404.html', {'site_settings': site_settings}, status=404)
+    if not appends_slash(request.path_info):
+        record_not_found(request.path)
+    return render_error_page(404, '404.html')
 
 
 def server_error(request):
     """500 error handler"""
-    site_settings = get_site_settings()
-    return render(request, '500.html', {'site_settings': site_settings}, status=500)
+    try:
+        return render_error_page(500, '500.html')
+    except Exception:
+        return HttpResponseServerError(FALLBACK_ERROR_PAGE.format(title='Server Error'))
@@ -0,0 +1,185 @@
+import math
+import threading
+import time
+import urllib.error
+import urllib.request
+from concurrent.futures import ThreadPoolExecutor
+
+from django.conf import settings
+from django.test import Client
+from django.urls import reverse
+
+from .analytics import INTERNAL_USER_AGENT
+from .cache import invalidate_urls
+from .models import (
+    Project, ProjectImage, Category, Service, TeamMember, Testimonial,
+    BlogPost, SiteSettings
+)
+from .views import ProjectListView, BlogListView
+
+
+def _page_urls(base_url, count, per_page, extra=''):
+    """URLs of every page of a paginated list"""
+    pages = max(1, math.ceil(count / per_page))
+    urls = [f"{base_url}{'?' + extra if extra else ''}"]
+    for page in range(2, pages + 1):
+        urls.append(f"{base_url}?page={page}{'&' + extra if extra else ''}")
+    return urls
+
+
+def project_list_urls():
+    projects_url = reverse('portfolio:projects')
+    urls = _page_urls(projects_url, Project.objects.published().count(), ProjectListView.paginate_by)
+    for slug, count in Category.objects.filter(project_count__gt=0).values_list('slug', 'project_count'):
+        urls += _page_urls(projects_url, count, ProjectListView.paginate_by, f'category={slug}')
+    return urls
+
+
+def blog_list_urls():
+    count = BlogPost.objects.published().count()
+    return _page_urls(reverse('portfolio:blog'), count, BlogListView.paginate_by)
+
+
+def project_detail_urls(queryset=None):
+    queryset = Project.objects.published() if queryset is None else queryset.published()
+    return [reverse('portfolio:project_detail', kwargs={'slug': slug})
+            for slug in queryset.values_list('slug', flat=True)]
+
+
+def blog_detail_urls():
+    return [reverse('portfolio:blog_detail', kwargs={'slug': slug})
+            for slug in BlogPost.objects.published().values_list('slug', flat=True)]
+
+
+def public_urls():
+    """Every public, cacheable URL of the site"""
+    urls = [reverse('portfolio:home'), reverse('portfolio:services'), reverse('portfolio:team')]
+    urls += project_list_urls()
+    urls += project_detail_urls()
+    urls += blog_list_urls()
+    urls += blog_detail_urls()
+    return urls
+
+
+def urls_for_instance(instance):
+    """Public URLs whose rendered content depends on ``instance``"""
+    home = reverse('portfolio:home')
+
+    if isinstance(instance, ProjectImage):
+        try:
+            return [instance.project.get_absolute_url()]
+        except Project.DoesNotExist:
+            return []
+    if isinstance(instance, Project):
+        # Detail pages listing this project among their related projects
+        linking = Project.objects.filter(related_links__target=instance)
+        return [home, instance.get_absolute_url()] + project_list_urls() + project_detail_urls(linking)
+    if isinstance(instance, Category):
+        return project_list_urls() + project_detail_urls(instance.projects.all())
+    if isinstance(instance, BlogPost):
+        # Every detail page lists the recent posts in its sidebar
+        return [home, instance.get_absolute_url()] + blog_list_urls() + blog_detail_urls()
+    if isinstance(instance, Service):
+        return [home, reverse('portfolio:services')]
+    if isinstance(instance, TeamMember):
+        return [reverse('portfolio:team')]
+    if isinstance(instance, Testimonial):
+        return [home]
+    if isinstance(instance, SiteSettings):
+        return public_urls()
+    return []
+
+
+def _warm_host():
+    for host in settings.ALLOWED_HOSTS:
+        if host != '*' and not host.startswith('.'):
+            return host
+    return 'localhost'
+
+
+def internal_client(**defaults):
+    """Test client for the site's own fetches, which visitor analytics ignore"""
+    return Client(HTTP_HOST=_warm_host(), HTTP_USER_AGENT=INTERNAL_USER_AGENT, **defaults)
+
+
+_local = threading.local()
+
+
+def _fetch_in_process(url):
+    client = getattr(_local, 'client', None)
+    if client is None:
+        client = _local.client = internal_client(raise_request_exception=False)
+    return client.get(url, secure=not settings.DEBUG).status_code
+
+
+def _fetch_over_http(base_url, url):
+    try:
+        request = urllib.request.Request(base_url.rstrip('/') + url, headers={'User-Agent': INTERNAL_USER_AGENT})
+        with urllib.request.urlopen(request, timeout=30) as response:
+            response.read()
+            return response.status
+    except urllib.error.HTTPError as e:
+        return e.code
+
+
+def warm_urls(urls, concurrency=4, base_url=None):
+    """Fetch ``urls`` with bounded concurrency; return (url, status, seconds) tuples
+
+    ``concurrency=0`` fetches in the calling thread, on its database
+    connection, so pages can be rendered inside an open transaction.
+    """
+    def fetch(url):
+        start = time.perf_counter()
+        try:
+            status = _fetch_over_http(base_url, url) if base_url else _fetch_in_process(url)
+        except Exception as e:
+            status = f"error: {e}"
+        return url, status, time.perf_counter() - start
+
+    unique_urls = list(dict.fromkeys(urls))
+    if not concurrency and not base_url:
+        return [fetch(url) for url in unique_urls]
+    with ThreadPoolExecutor(max_workers=max(1, concurrency)) as executor:
+        return list(executor.map(fetch, unique_urls))
+
+
+class WarmingQueue:
+    """Warm queued URLs in at most one background thread per process
+
+    URLs queued while a batch is being warmed are merged, so a bulk admin
+    action or import costs one crawl of the pages it touched rather than a
+    thread per saved row. Pages left unwarmed when the worker exits are
+    simply rendered by their next visitor; ``warm_cache`` can fill them
+    from cron.
+    """
+
+    def __init__(self):
+        self._urls = {}
+        self._lock = threading.Lock()
+        self._thread = None
+
+    def schedule(self, urls):
+        with self._lock:
+            self._urls.update(dict.fromkeys(urls))
+            if self._thread is None:
+                self._thread = threading.Thread(target=self._run, daemon=True)
+                self._thread.start()
+
+    def _run(self):
+        while True:
+            with self._lock:
+                urls, self._urls = list(self._urls), {}
+                if not urls:
+                    self._thread = None
+                    return
+            warm_urls(urls)
+
+
+warming_queue = WarmingQueue()
+
+
+def refresh_urls(urls, warm=True):
+    """Drop cached copies of ``urls`` and queue them for re-warming in the background"""
+    invalidate_urls(urls)
+    if warm:
+        warming_queue.schedule(urls)